@@ -5,8 +5,11 @@ __all__ = [
     "BaseAgent",
     "ChatAgent",
     "CodeReviewAgent",
+    "AgentRuntime",
+    "AgentTask",
 ]
 
 from .base import BaseAgent
 from .chat import ChatAgent
 from .codereview import CodeReviewAgent
+from .runtime import AgentRuntime, AgentTask
@@ -1,11 +1,26 @@
+import asyncio
+from typing import Optional
+
+
 class BaseAgent:
     """
     Abstract base class for AI agents.
-    Each agent must implement the `run` method.
+    Each agent must implement the `run` method; `arun` is its async counterpart and by default
+    runs `run` on a worker thread so blocking agents can be scheduled alongside async ones.
+    An optional model `backend` (see `backends.ModelBackend`) may be shared between agents
+    so their requests can be micro-batched together.
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, backend=None):
         self.name = name
+        self.backend = backend
 
     def run(self, *args, **kwargs):
         raise NotImplementedError("Agents must implement the 'run' method.")
+
+    async def arun(self, *args, **kwargs):
+        return await asyncio.to_thread(self.run, *args, **kwargs)
+
+    def cache_key(self, *args, **kwargs) -> Optional[str]:
+        """A key identifying the result of `run(*args, **kwargs)`, or None if it must not be cached."""
+        return None
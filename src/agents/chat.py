@@ -1,4 +1,8 @@
 from .base import BaseAgent
+from typing import Optional
+import hashlib
+import json
+
 
 class ChatAgent(BaseAgent):
     """
@@ -6,4 +10,17 @@ class ChatAgent(BaseAgent):
     """
 
     def run(self, prompt: str) -> str:
+        if self.backend is not None:
+            return f"[ChatAgent:{self.name}] {self.backend.generate(prompt)}"
         return f"[ChatAgent:{self.name}] Response to: '{prompt}'"
+
+    async def arun(self, prompt: str) -> str:
+        if self.backend is not None:
+            # Awaiting the backend directly lets concurrent prompts share a micro-batch.
+            return f"[ChatAgent:{self.name}] {await self.backend.agenerate(prompt)}"
+        return self.run(prompt)
+
+    def cache_key(self, prompt: str) -> Optional[str]:
+        backend = getattr(self.backend, "identity", type(self.backend).__name__) if self.backend else None
+        payload = json.dumps(["chat", self.name, backend, prompt])
+        return hashlib.sha256(payload.encode()).hexdigest()
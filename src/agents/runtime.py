@@ -0,0 +1,263 @@
+from .base import BaseAgent
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+
+class AgentTask:
+    """One call to `agents[agent].arun(*args, **kwargs)`, optionally with its own timeout (seconds)."""
+
+    def __init__(self, agent: str, *args, timeout: Optional[float] = None, **kwargs):
+        self.agent = agent
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"AgentTask({self.agent}, {self.args!r})"
+
+
+class TaskResult:
+    """Outcome of an `AgentTask`: status is "ok", "cached", "error" or "timeout"."""
+
+    def __init__(self, task: AgentTask, status: str, output: Any = None, error: Optional[str] = None,
+                 elapsed_ms: float = 0.0):
+        self.task = task
+        self.agent = task.agent
+        self.status = status
+        self.output = output
+        self.error = error
+        self.elapsed_ms = elapsed_ms
+
+    def to_dict(self) -> Dict:
+        return {"agent": self.agent, "args": list(self.task.args), "status": self.status, "output": self.output,
+                "error": self.error, "elapsed_ms": self.elapsed_ms}
+
+
+class AgentStats:
+    def __init__(self):
+        self.tasks = 0
+        self.counts = {"ok": 0, "cached": 0, "error": 0, "timeout": 0}
+        self.busy_ms = 0.0
+
+    def to_dict(self, wall_s: float) -> Dict:
+        return {"tasks": self.tasks, **self.counts, "busy_ms": round(self.busy_ms, 3),
+                "tasks_per_s": round(self.tasks / wall_s, 2) if wall_s > 0 else 0.0,
+                "mean_ms": round(self.busy_ms / self.tasks, 3) if self.tasks else 0.0}
+
+
+# === Agent Runtime ===
+class AgentRuntime:
+    """
+    Runs agent tasks concurrently on one event loop. Each agent gets a semaphore bounding how
+    many of its tasks run at once, plus an optional timeout. Results of cacheable tasks go into
+    a cache shared by all agents (in memory, and on disk when a `DiskCache` is given), and
+    identical tasks that are already running are awaited rather than started twice.
+    """
+
+    def __init__(self, cache=None, memory_entries: int = 4096, default_concurrency: int = 4,
+                 default_timeout: Optional[float] = None):
+        self.agents: Dict[str, BaseAgent] = {}
+        self.limits: Dict[str, int] = {}
+        self.timeouts: Dict[str, Optional[float]] = {}
+        self.stats: Dict[str, AgentStats] = {}
+        self.cache = cache
+        self.default_concurrency = default_concurrency
+        self.default_timeout = default_timeout
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_entries = memory_entries
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}  # per `run_all`; semaphores bind to one loop
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def register(self, agent: BaseAgent, max_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None) -> None:
+        if agent.name in self.agents:
+            raise ValueError(f"Agent '{agent.name}' is already registered.")
+        self.agents[agent.name] = agent
+        self.limits[agent.name] = max_concurrency or self.default_concurrency
+        self.timeouts[agent.name] = timeout if timeout is not None else self.default_timeout
+        self.stats[agent.name] = AgentStats()
+
+    async def submit(self, task: AgentTask) -> TaskResult:
+        agent = self.agents.get(task.agent)
+        if agent is None:
+            return TaskResult(task, "error", error=f"Unknown agent '{task.agent}'")
+        start = time.perf_counter()
+        result = await self._execute(agent, task)
+        result.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        stats = self.stats[task.agent]
+        stats.tasks += 1
+        stats.counts[result.status] += 1
+        stats.busy_ms += result.elapsed_ms
+        return result
+
+    async def _execute(self, agent: BaseAgent, task: AgentTask) -> TaskResult:
+        key = agent.cache_key(*task.args, **task.kwargs)
+        if key is not None:
+            found, value = self._cache_get(key)
+            if found:
+                return TaskResult(task, "cached", value)
+            if key in self._inflight:
+                try:
+                    return TaskResult(task, "cached", await asyncio.shield(self._inflight[key]))
+                except Exception:
+                    pass  # the first attempt failed or timed out; run our own below
+            waiter = asyncio.get_running_loop().create_future()
+            self._inflight[key] = waiter
+
+        try:
+            async with self._semaphores[task.agent]:
+                timeout = task.timeout if task.timeout is not None else self.timeouts[task.agent]
+                output = await asyncio.wait_for(agent.arun(*task.args, **task.kwargs), timeout)
+        except asyncio.TimeoutError:
+            self._settle(key, error=TimeoutError())
+            return TaskResult(task, "timeout", error=f"timed out after {timeout}s")
+        except Exception as e:
+            self._settle(key, error=e)
+            return TaskResult(task, "error", error=f"{type(e).__name__}: {e}")
+        if key is not None:
+            self._cache_put(key, output)
+        self._settle(key, output=output)
+        return TaskResult(task, "ok", output)
+
+    def _settle(self, key: Optional[str], output: Any = None, error: Optional[BaseException] = None) -> None:
+        waiter = self._inflight.pop(key, None) if key is not None else None
+        if waiter is None or waiter.done():
+            return
+        if error is not None:
+            waiter.set_exception(error)
+            waiter.exception()  # mark retrieved so unawaited failures are not logged
+        else:
+            waiter.set_result(output)
+
+    def _cache_get(self, key: str):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return True, self._memory[key]
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._remember(key, entry["output"])
+                return True, entry["output"]
+        return False, None
+
+    def _cache_put(self, key: str, output: Any) -> None:
+        self._remember(key, output)
+        if self.cache is not None:
+            try:
+                self.cache.put(key, {"output": output})
+            except TypeError:
+                pass  # not JSON-serializable; keep it in memory only
+
+    def _remember(self, key: str, output: Any) -> None:
+        self._memory[key] = output
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    async def run_all(self, tasks: Iterable[AgentTask],
+                      follow_up: Optional[Callable[[TaskResult], Iterable[AgentTask]]] = None,
+                      max_in_flight: int = 256, max_depth: int = 4) -> List[TaskResult]:
+        """
+        Runs `tasks` (consumed lazily) with at most `max_in_flight` scheduled at once. `follow_up`
+        may turn each finished result into further tasks, e.g. summarising a review; follow-ups
+        are dropped once a chain is `max_depth` generations deep, or when they target the agent
+        that produced the result.
+        """
+        self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.limits.items()}
+        source = iter(tasks)
+        queued: "deque[Tuple[AgentTask, int]]" = deque()
+        pending: Dict["asyncio.Future[TaskResult]", int] = {}
+        results: List[TaskResult] = []
+        exhausted = False
+        while True:
+            while len(pending) < max_in_flight:
+                if queued:
+                    task, depth = queued.popleft()
+                elif not exhausted:
+                    upcoming = next(source, None)
+                    if upcoming is None:
+                        exhausted = True
+                        continue
+                    task, depth = upcoming, 0
+                else:
+                    break
+                pending[asyncio.ensure_future(self.submit(task))] = depth
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                result = future.result()
+                results.append(result)
+                if follow_up is None or depth >= max_depth:
+                    continue
+                queued.extend((task, depth + 1) for task in follow_up(result) or ()
+                              if task.agent != result.agent)
+        return results
+
+    def run(self, tasks: Iterable[AgentTask],
+            follow_up: Optional[Callable[[TaskResult], Iterable[AgentTask]]] = None) -> List[TaskResult]:
+        return asyncio.run(self.run_all(tasks, follow_up))
+
+    def report(self, wall_s: float) -> Dict[str, Dict]:
+        return {name: stats.to_dict(wall_s) for name, stats in self.stats.items()}
+
+
+# === Review + Summary Workload ===
+def review_workload(target: str, reviewer: str = "reviewer") -> Iterable[AgentTask]:
+    """One review task per Python file under `target` (or for `target` itself if it is a file)."""
+    from .codereview import iter_review_files
+
+    path = Path(target)
+    files = [str(path)] if path.is_file() else iter_review_files(path)
+    return (AgentTask(reviewer, file) for file in files)
+
+
+def summarize_findings(summarizer: str = "summarizer") -> Callable[[TaskResult], Iterable[AgentTask]]:
+    """Follow-up: every review that found issues is handed to the chat agent for a summary."""
+    def follow_up(result: TaskResult) -> Iterable[AgentTask]:
+        if result.agent == summarizer or result.status not in ("ok", "cached"):
+            return ()
+        issues = [line[2:] for line in str(result.output).splitlines() if line.startswith("- ")]
+        if not issues:
+            return ()
+        return (AgentTask(summarizer, f"Summarize {len(issues)} review issue(s) in {result.task.args[0]}: "
+                                      + "; ".join(issues[:5])),)
+    return follow_up
+
+
+# === CLI Entry ===
+def run_agents(target: str, review_concurrency: int = 4, chat_concurrency: int = 8,
+               timeout: Optional[float] = 30.0, use_cache: bool = True) -> Dict[str, Dict]:
+    from .chat import ChatAgent
+    from .codereview import CodeReviewAgent
+    from backends import shared_backend
+    from rich import print
+
+    cache = None
+    if use_cache:
+        from cache import DiskCache
+        cache = DiskCache("agents", max_entries=100_000)
+    runtime = AgentRuntime(cache=cache, default_timeout=timeout)
+    runtime.register(CodeReviewAgent(name="reviewer"), max_concurrency=review_concurrency)
+    runtime.register(ChatAgent(name="summarizer", backend=shared_backend()), max_concurrency=chat_concurrency)
+
+    print(f"[bold cyan]🤖 Agent runtime:[/bold cyan] reviewing {target} "
+          f"(reviewer ×{review_concurrency}, summarizer ×{chat_concurrency})")
+    start = time.perf_counter()
+    results = runtime.run(review_workload(target), follow_up=summarize_findings())
+    wall = time.perf_counter() - start
+
+    for result in results:
+        if result.status in ("error", "timeout"):
+            print(f"[red]✖ {result.agent} {result.task.args[0]}: {result.error}[/red]")
+    report = runtime.report(wall)
+    for name, stats in report.items():
+        print(f"[bold]{name}:[/bold] {stats['tasks']} tasks ({stats['ok']} run, {stats['cached']} cached, "
+              f"{stats['error']} failed, {stats['timeout']} timed out) | {stats['tasks_per_s']} tasks/s | "
+              f"mean {stats['mean_ms']} ms")
+    print(f"[green]✔ {len(results)} tasks in {wall:.2f}s[/green]")
+    return report
@@ -0,0 +1,184 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+
+# A single generation request: (prompt, seed).
+Request = Tuple[str, Optional[int]]
+
+CODE_VARIANTS = [
+    "from flask import Flask\n\napp = Flask(__name__)\n\n@app.route('/')\ndef home():\n    return 'Hello from Qwnt AI!'\n\nif __name__ == '__main__':\n    app.run(debug=True)",
+    "from fastapi import FastAPI\n\napp = FastAPI()\n\n@app.get('/')\ndef read_root():\n    return {\"message\": \"Welcome to Qwnt AI\"}\n",
+    "import streamlit as st\n\nst.title('Qwnt AI Generator')\nst.write('Welcome to your new app.')"
+]
+
+
+# === Model Backend Interface ===
+class ModelBackend:
+    """
+    Base class for pluggable model backends.
+    Backends must implement `generate_batch`; single and async calls are derived from it.
+    Implementations must not touch global RNG state so they can be called concurrently.
+    """
+
+    identity = "backend"
+
+    def generate_batch(self, requests: List[Request]) -> List[str]:
+        raise NotImplementedError("Backends must implement the 'generate_batch' method.")
+
+    def generate(self, prompt: str, seed: Optional[int] = None) -> str:
+        return self.generate_batch([(prompt, seed)])[0]
+
+    async def agenerate(self, prompt: str, seed: Optional[int] = None) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt, seed)
+
+    @staticmethod
+    def rng_for(seed: Optional[int]) -> random.Random:
+        """Per-call RNG; an unseeded request gets a time-seeded generator of its own."""
+        return random.Random(time.time() if seed is None else seed)
+
+
+class LocalModel(ModelBackend):
+    identity = "qwnt-local-v1"
+
+    def generate(self, prompt: str, seed: Optional[int] = None) -> str:
+        """Simulates generating code from an internal AI model."""
+        return self.rng_for(seed).choice(CODE_VARIANTS)
+
+    def generate_batch(self, requests: List[Request]) -> List[str]:
+        return [self.generate(prompt, seed) for prompt, seed in requests]
+
+
+class StubBackend(ModelBackend):
+    """
+    Offline stand-in for a remote model. Every call pays `call_overhead` seconds plus
+    `per_item` seconds per request, and at most `max_concurrency` calls are served at once,
+    which is what makes batching worthwhile.
+    """
+
+    identity = "qwnt-stub-v1"
+
+    def __init__(self, call_overhead: float = 0.005, per_item: float = 0.0001, max_concurrency: int = 1):
+        self.call_overhead = call_overhead
+        self.per_item = per_item
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_concurrency)
+
+    def generate_batch(self, requests: List[Request]) -> List[str]:
+        with self._lock:
+            self.calls += 1
+        with self._slots:
+            time.sleep(self.call_overhead + self.per_item * len(requests))
+        return [self.rng_for(seed).choice(CODE_VARIANTS) for _, seed in requests]
+
+
+# === Micro-Batching Layer ===
+class MicroBatcher(ModelBackend):
+    """
+    Drop-in backend that gathers concurrent `generate` calls arriving within `window_ms`
+    (up to `max_batch_size`) into one `generate_batch` call on the wrapped backend. Requests
+    that queue up while a batch is in flight always join the next one, so even a zero window
+    batches under load without delaying a lone request.
+    """
+
+    def __init__(self, backend: ModelBackend, window_ms: float = 2.0, max_batch_size: int = 32):
+        self.backend = backend
+        self.identity = backend.identity
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._queue: "queue.Queue[Tuple[Request, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._collect, name="qwnt-microbatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str, seed: Optional[int] = None) -> "Future[str]":
+        future: "Future[str]" = Future()
+        self._queue.put(((prompt, seed), future))
+        return future
+
+    def generate(self, prompt: str, seed: Optional[int] = None) -> str:
+        return self.submit(prompt, seed).result()
+
+    async def agenerate(self, prompt: str, seed: Optional[int] = None) -> str:
+        return await asyncio.wrap_future(self.submit(prompt, seed))
+
+    def generate_batch(self, requests: List[Request]) -> List[str]:
+        futures = [self.submit(prompt, seed) for prompt, seed in requests]
+        return [f.result() for f in futures]
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Request, Future]]) -> None:
+        # Requests whose caller gave up (e.g. a cancelled `agenerate`) are dropped here.
+        batch = [(request, future) for request, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batches += 1
+        try:
+            outputs = self.backend.generate_batch([request for request, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), output in zip(batch, outputs):
+            future.set_result(output)
+        for _, future in batch[len(outputs):]:
+            future.set_exception(RuntimeError(f"{self.identity} returned {len(outputs)} outputs "
+                                              f"for a batch of {len(batch)} requests"))
+
+
+@lru_cache(maxsize=1)
+def shared_backend() -> MicroBatcher:
+    """
+    The process-wide model behind codegen and the agents, so their concurrent requests share
+    batches. The local model has no per-call overhead, so it does not wait for a window.
+    """
+    return MicroBatcher(LocalModel(), window_ms=0)
+
+
+# A forked child inherits the batcher but not its collector thread, so it builds its own.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=shared_backend.cache_clear)
+
+
+# === Offline Batching Benchmark ===
+def drive(backend: ModelBackend, requests: int = 256, concurrency: int = 32) -> float:
+    """Sends `requests` generate calls from `concurrency` threads; returns requests per second."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        wait([pool.submit(backend.generate, f"prompt {i}", i) for i in range(requests)])
+    return requests / (time.perf_counter() - start)
+
+
+def benchmark_batching(requests: int = 256, concurrency: int = 32, window_ms: float = 2.0) -> Dict[str, float]:
+    """Compares direct vs. micro-batched throughput against the stub backend."""
+    direct = StubBackend()
+    batched_stub = StubBackend()
+    batcher = MicroBatcher(batched_stub, window_ms=window_ms, max_batch_size=concurrency)
+    direct_rps = drive(direct, requests, concurrency)
+    batched_rps = drive(batcher, requests, concurrency)
+    return {
+        "requests": requests,
+        "direct_rps": round(direct_rps, 1),
+        "batched_rps": round(batched_rps, 1),
+        "backend_calls_direct": direct.calls,
+        "backend_calls_batched": batched_stub.calls,
+        "speedup": round(batched_rps / direct_rps, 2),
+    }
@@ -0,0 +1,245 @@
+from contextlib import redirect_stdout
+from pathlib import Path
+from rich import print
+from typing import Callable, Dict, List, Optional
+import gc
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.25  # fail when a benchmark's mean is more than 25% slower than the baseline
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# === Synthetic Corpora ===
+JS_SAMPLE = [
+    "function handler(event) {\n",
+    "    const value = compute(event); // regular line\n",
+    "    console.log(value);\n",
+    "    return value;\n",
+    "}\n",
+]
+PY_SAMPLE = [
+    "def handler(event):\n",
+    "    value = compute(event)  # regular line\n",
+    "    print(value)\n",
+    "    message = '" + "x" * 110 + "'\n",
+    "    return value\n",
+]
+
+
+def _write_lines(path: Path, sample: List[str], lines: int) -> Path:
+    with path.open("w") as f:
+        f.writelines(sample[i % len(sample)] for i in range(lines))
+    return path
+
+
+def _write_records(path: Path, records: int) -> Path:
+    with path.open("w") as f:
+        for i in range(records):
+            record = {"id": i, "user": {"name": f"user{i % 97}", "email": None},
+                      "tags": ["alpha", "gamma"][: i % 3], "score": (i % 1000) / 10}
+            if i % 100 == 0:
+                record["score"] = "high"
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+# === Benchmarks ===
+# Each setup(workdir, scale) builds its corpus once and returns the operation that is timed.
+def _setup_sample(workdir: Path, scale: int) -> Callable[[], object]:
+    from backends import LocalModel
+    from codegen import QuantumSampler
+
+    sampler = QuantumSampler(LocalModel(), num_variants=3, seed=0)
+    prompts = [f"build a todo app #{i}" for i in range(20 * scale)]
+    return lambda: [sampler.sample(prompt) for prompt in prompts]
+
+
+def _setup_microbatch(workdir: Path, scale: int) -> Callable[[], object]:
+    from backends import MicroBatcher, StubBackend, drive
+
+    batcher = MicroBatcher(StubBackend(), max_batch_size=32)
+    return lambda: drive(batcher, requests=256 * scale, concurrency=32)
+
+
+def _setup_review_file(workdir: Path, scale: int) -> Callable[[], object]:
+    from agents.codereview import CodeReviewAgent
+
+    source = _write_lines(workdir / "module.py", PY_SAMPLE, 20_000 * scale)
+    agent = CodeReviewAgent(name="bench")
+    return lambda: agent.run(str(source))
+
+
+def _setup_translate_file(workdir: Path, scale: int) -> Callable[[], object]:
+    from translate import XLangTranslator
+
+    source = _write_lines(workdir / "bundle.js", JS_SAMPLE, 20_000 * scale)
+    translator = XLangTranslator("javascript", "python")
+    out = str(workdir / "translated")
+    return lambda: translator.translate_file(str(source), output_dir=out, quiet=True)
+
+
+def _setup_translate_stream(workdir: Path, scale: int) -> Callable[[], object]:
+    from translate import XLangTranslator
+
+    source = _write_lines(workdir / "bundle.js", JS_SAMPLE, 20_000 * scale)
+    translator = XLangTranslator("javascript", "python")
+    out = str(workdir / "streamed")
+    return lambda: translator.translate_file(str(source), output_dir=out, stream=True, quiet=True)
+
+
+def _setup_generate_ui(workdir: Path, scale: int) -> Callable[[], object]:
+    from uigen import generate_ui
+
+    themes = ["slate", "rose", "indigo", "emerald"] * scale
+    out = workdir / "ui"
+    return lambda: [generate_ui(theme, ["hero", "features", "pricing", "footer"], output_dir=str(out / str(i)))
+                    for i, theme in enumerate(themes)]
+
+
+def _setup_validate_schema(workdir: Path, scale: int) -> Callable[[], object]:
+    from validate import BENCH_SCHEMA, SchemaValidator
+
+    data = _write_records(workdir / "events.ndjson", 10_000 * scale)
+    schema = workdir / "schema.json"
+    schema.write_text(json.dumps(BENCH_SCHEMA))
+    return lambda: SchemaValidator(str(data), max_errors=1 << 30, quiet=True, schema=str(schema)).validate()
+
+
+class Benchmark:
+    """A named operation plus how to build its corpus; `kind` is "micro" or "macro"."""
+
+    def __init__(self, name: str, kind: str, setup: Callable[[Path, int], Callable[[], object]], description: str):
+        self.name = name
+        self.kind = kind
+        self.setup = setup
+        self.description = description
+
+
+BENCHMARKS: Dict[str, Benchmark] = {b.name: b for b in [
+    Benchmark("codegen.sample", "micro", _setup_sample, "QuantumSampler.sample over 20 prompts"),
+    Benchmark("backends.microbatch", "micro", _setup_microbatch, "256 concurrent requests through MicroBatcher"),
+    Benchmark("codereview.run", "micro", _setup_review_file, "CodeReviewAgent.run on a 20k-line file"),
+    Benchmark("translate.file", "macro", _setup_translate_file, "XLangTranslator.translate_file, 20k lines"),
+    Benchmark("translate.stream", "macro", _setup_translate_stream, "translate_file in streaming mode, 20k lines"),
+    Benchmark("uigen.generate_ui", "macro", _setup_generate_ui, "generate_ui for 4 themes"),
+    Benchmark("validate.schema", "macro", _setup_validate_schema, "SchemaValidator on 10k NDJSON records + schema"),
+]}
+
+
+def run_benchmark(bench: Benchmark, scale: int = 1, repeat: int = 5, warmup: int = 1) -> Dict:
+    """
+    Times `repeat` runs after `warmup` untimed ones, then one more run under tracemalloc for the
+    memory peak (kept out of the timed runs because tracing slows allocation down).
+    """
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as sink, redirect_stdout(sink):
+        operation = bench.setup(Path(tmp), scale)
+        for _ in range(warmup):
+            operation()
+        gc.collect()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        try:
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"kind": bench.kind, "repeat": repeat, "mean_ms": round(statistics.fmean(timings), 3),
+            "p95_ms": round(percentile(timings, 95), 3), "min_ms": round(min(timings), 3),
+            "stdev_ms": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+            "peak_kib": round(peak / 1024, 1)}
+
+
+def run_suite(names: Optional[List[str]] = None, scale: int = 1, repeat: int = 5) -> Dict:
+    unknown = sorted(set(names or []) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+    selected = [BENCHMARKS[name] for name in names] if names else list(BENCHMARKS.values())
+    results = {}
+    for bench in selected:
+        results[bench.name] = result = run_benchmark(bench, scale, repeat)
+        print(f"[cyan]⏱ {bench.name:<20}[/cyan] mean {result['mean_ms']:>9.2f} ms | p95 {result['p95_ms']:>9.2f} ms"
+              f" | peak {result['peak_kib']:>9.1f} KiB")
+    return {"version": RESULTS_VERSION, "created": time.time(), "python": platform.python_version(),
+            "scale": scale, "repeat": repeat, "benchmarks": results}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Benchmarks whose mean time grew by more than `threshold` (a fraction) over the baseline.
+    Only benchmarks present in both, at the same scale, are compared.
+    """
+    if baseline.get("scale") != results.get("scale"):
+        raise ValueError(f"Baseline was recorded at scale {baseline.get('scale')}, not {results.get('scale')}.")
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None or previous["mean_ms"] <= 0:
+            continue
+        change = current["mean_ms"] / previous["mean_ms"] - 1
+        current["change"] = round(change, 4)
+        if change > threshold:
+            regressions.append({"name": name, "baseline_ms": previous["mean_ms"], "mean_ms": current["mean_ms"],
+                                "change": round(change, 4)})
+    return regressions
+
+
+def _write_json(path: Path, payload: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+    partial.write_text(json.dumps(payload, indent=2))
+    os.replace(partial, path)
+
+
+# === CLI Entry ===
+def bench(names: Optional[List[str]] = None, scale: int = 1, repeat: int = 5,
+          output: str = "quill_reports/bench.json", baseline: Optional[str] = None,
+          save_baseline: bool = False, threshold: float = DEFAULT_THRESHOLD) -> bool:
+    """Runs the suite, writes the results to `output`, and returns False if anything regressed against `baseline`."""
+    if save_baseline and not baseline:
+        raise ValueError("--save-baseline needs --baseline PATH.")
+    print(f"[bold cyan]📊 Running {len(names or BENCHMARKS)} benchmark(s) at scale {scale}, "
+          f"{repeat} run(s) each[/bold cyan]")
+    results = run_suite(names, scale, repeat)
+
+    ok = True
+    baseline_path = Path(baseline) if baseline else None
+    if baseline_path is not None and not save_baseline:
+        if baseline_path.exists():
+            regressions = compare(results, json.loads(baseline_path.read_text()), threshold)
+            for r in regressions:
+                print(f"[red]✖ {r['name']} regressed {r['change']:+.0%}: "
+                      f"{r['baseline_ms']:.2f} ms → {r['mean_ms']:.2f} ms[/red]")
+            ok = not regressions
+            if ok:
+                print(f"[green]✔ No regressions beyond {threshold:.0%} against {baseline_path}[/green]")
+        else:
+            print(f"[yellow]⚠ No baseline at {baseline_path}; record one with --save-baseline.[/yellow]")
+
+    _write_json(Path(output), results)
+    print(f"[green]✔ Results written to:[/green] {output}")
+    if save_baseline and baseline_path is not None:
+        _write_json(baseline_path, results)
+        print(f"[green]✔ Baseline saved to:[/green] {baseline_path}")
+    return ok
@@ -0,0 +1,164 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_CACHE_DIR = os.environ.get("QUILL_CACHE_DIR", ".quill_cache")
+
+
+def file_digest(path: "os.PathLike[str] | str", block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents, read in blocks so large files never load whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# === Content-Addressed Disk Cache ===
+class DiskCache:
+    """
+    Persistent JSON cache stored as one file per key under `root/namespace`.
+    Entries are evicted least-recently-used first once either bound is exceeded.
+    With a `suffix` other than ".json", entries are opaque files (see `get_file`/`put_file`).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        root: Optional[str] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        suffix: str = ".json",
+    ):
+        self.path = Path(root or DEFAULT_CACHE_DIR) / namespace
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hashes an ordered tuple of JSON-serializable parts into a stable cache key."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                self.misses += 1
+                return None
+            entry = self.path_for(key)
+            try:
+                value = json.loads(entry.read_text())
+                os.utime(entry)
+            except (OSError, ValueError):
+                self._drop(key)
+                self.misses += 1
+                return None
+            index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value)
+        with self._lock:
+            index = self._load_index()
+            self.path.mkdir(parents=True, exist_ok=True)
+            entry = self.path_for(key)
+            tmp = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(data)
+            os.replace(tmp, entry)
+            self._total_bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            self._evict()
+
+    def path_for(self, key: str) -> Path:
+        """Where the entry for `key` lives (whether or not it exists yet)."""
+        return self.path / f"{key}{self.suffix}"
+
+    def get_file(self, key: str) -> Optional[Path]:
+        """Path of a cached file entry, marking it recently used; None on a miss."""
+        with self._lock:
+            index = self._load_index()
+            entry = self.path_for(key)
+            if key not in index or not entry.exists():
+                if key in index:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            os.utime(entry)
+            index.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put_file(self, key: str, source: Optional[Path] = None) -> Path:
+        """
+        Records a file entry, moving `source` into place first when given; otherwise the
+        file must already have been written to `path_for(key)`. Evicts as `put` does.
+        """
+        entry = self.path_for(key)
+        with self._lock:
+            index = self._load_index()
+            if source is not None:
+                self.path.mkdir(parents=True, exist_ok=True)
+                os.replace(source, entry)
+            size = entry.stat().st_size
+            self._total_bytes += size - index.pop(key, 0)
+            index[key] = size
+            self._evict()
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(index),
+                "bytes": self._total_bytes,
+            }
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Rebuilds the LRU order from file mtimes the first time the cache is touched."""
+        if self._index is None:
+            entries = []
+            if self.path.exists():
+                for item in os.scandir(self.path):
+                    if item.name.endswith(self.suffix):
+                        stat = item.stat()
+                        entries.append((stat.st_mtime, item.name[:-len(self.suffix)], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(size for _, _, size in entries)
+        return self._index
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        while index and (len(index) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest = next(iter(index))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        index = self._load_index()
+        self._total_bytes -= index.pop(key, 0)
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,23 @@
+import sys
+from server import forward
+
+# === Thin Client ===
+# Forwards `qwnt` arguments to a running `serve` daemon, falling back to in-process execution.
+# Usage: python src/client.py generate "A Flask app"
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    response = forward(argv)
+    if response is None:
+        from main import app
+        try:
+            app(args=argv, prog_name="qwnt")
+        except SystemExit as e:  # standalone mode always exits, with the command's status
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    sys.stdout.write(response["output"])
+    return response["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
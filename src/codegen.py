@@ -1,34 +1,121 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Dict, Iterator, Optional, List, Set, Tuple
 import hashlib
-import random
+import json
+import os
+import re
+import string
+import tempfile
+import threading
 import time
 from rich import print
+from backends import CODE_VARIANTS, LocalModel, ModelBackend, shared_backend  # noqa: F401 (LocalModel re-exported)
+from cache import DEFAULT_CACHE_DIR, DiskCache
+from telemetry import count, span
 
-# === Simulated Internal LLM Interface ===
-class LocalModel:
-    def generate(self, prompt: str, seed: Optional[int] = None) -> str:
-        """Simulates generating code from an internal AI model."""
-        random.seed(seed or time.time())
-        variants = [
-            "from flask import Flask\n\napp = Flask(__name__)\n\n@app.route('/')\ndef home():\n    return 'Hello from Qwnt AI!'\n\nif __name__ == '__main__':\n    app.run(debug=True)",
-            "from fastapi import FastAPI\n\napp = FastAPI()\n\n@app.get('/')\ndef read_root():\n    return {\"message\": \"Welcome to Qwnt AI\"}\n",
-            "import streamlit as st\n\nst.title('Qwnt AI Generator')\nst.write('Welcome to your new app.')"
-        ]
-        return random.choice(variants)
+
+class SampleResult:
+    """The variant chosen by `QuantumSampler` plus how it was obtained."""
+
+    def __init__(self, code: str, score: float, seed: Optional[int], variants_scored: int,
+                 elapsed_ms: float, stopped_early: bool = False, cached: bool = False):
+        self.code = code
+        self.score = score
+        self.seed = seed
+        self.variants_scored = variants_scored
+        self.elapsed_ms = elapsed_ms
+        self.stopped_early = stopped_early
+        self.cached = cached
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
 
 
 # === Quantum Sampler Logic ===
 class QuantumSampler:
-    def __init__(self, model: LocalModel, num_variants: int = 3):
+    def __init__(
+        self,
+        model: ModelBackend,
+        num_variants: int = 3,
+        seed: int = 0,
+        cache: Optional[DiskCache] = None,
+        max_workers: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        score_threshold: Optional[float] = None,
+    ):
         self.model = model
         self.num_variants = num_variants
+        self.seed = seed
+        self.cache = cache
+        self.max_workers = max_workers or num_variants
+        self.time_budget = time_budget
+        self.score_threshold = score_threshold
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def sample(self, prompt: str) -> str:
-        generations = [self.model.generate(prompt, seed=i) for i in range(self.num_variants)]
-        scored = [(self._score_variant(g), g) for g in generations]
-        scored.sort(reverse=True)
-        return scored[0][1]
+        return self.sample_detailed(prompt).code
+
+    def sample_detailed(self, prompt: str) -> SampleResult:
+        """
+        Generates variants concurrently and keeps a running best-of-N as they arrive.
+        Stops early once `score_threshold` is reached or `time_budget` (seconds) runs out.
+        """
+        start = time.perf_counter()
+        key = None
+        if self.cache is not None:
+            model_id = getattr(self.model, "identity", type(self.model).__name__)
+            key = DiskCache.make_key(prompt, self.seed, model_id, self.num_variants)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return SampleResult(cached["code"], cached["score"], cached.get("seed"), 0,
+                                    (time.perf_counter() - start) * 1000, cached=True)
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self.model.generate, prompt, self.seed + i): self.seed + i
+            for i in range(self.num_variants)
+        }
+        deadline = None if self.time_budget is None else start + self.time_budget
+        best: Optional[tuple] = None
+        scored = 0
+        stopped_early = False
+        pending = set(futures)
+
+        while pending:
+            timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                stopped_early = True
+                break
+            for future in done:
+                code = future.result()
+                candidate = (self._score_variant(code), code, futures[future])
+                scored += 1
+                # Same ordering as sorting (score, code) descending, without the sort.
+                if best is None or candidate[:2] > best[:2]:
+                    best = candidate
+            if self.score_threshold is not None and best is not None and best[0] >= self.score_threshold and pending:
+                stopped_early = True
+                break
+
+        for future in pending:
+            future.cancel()
+        if best is None:
+            raise TimeoutError(f"No variant finished within the {self.time_budget}s time budget")
+
+        score, code, seed = best
+        result = SampleResult(code, score, seed, scored, (time.perf_counter() - start) * 1000, stopped_early)
+        # Early-stopped picks depend on arrival order, so only full sweeps are cached.
+        if self.cache is not None and key is not None and not stopped_early:
+            self.cache.put(key, {"code": code, "score": score, "seed": seed})
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="qwnt-sampler")
+        return self._executor
 
     def _score_variant(self, code: str) -> float:
         """Fake quantum scoring: entropy = length variance + hash entropy."""
@@ -39,18 +126,436 @@ class QuantumSampler:
 
 
 # === Code Generation Entry ===
-def generate_code(prompt: str, output_dir: Optional[str] = None):
+# Engines are memoized so a long-running process (see server.py) keeps them warm between calls.
+@lru_cache(maxsize=8)
+def _shared_cache(root: str) -> DiskCache:
+    return DiskCache("codegen", root=root)
+
+
+def build_cache(use_cache: bool) -> Optional[DiskCache]:
+    return _shared_cache(str(Path(DEFAULT_CACHE_DIR).resolve())) if use_cache else None
+
+
+@lru_cache(maxsize=16)
+def shared_sampler(cache: Optional[DiskCache], time_budget: Optional[float],
+                   score_threshold: Optional[float]) -> QuantumSampler:
+    return QuantumSampler(shared_backend(), cache=cache, time_budget=time_budget, score_threshold=score_threshold)
+
+
+def generate_code(
+    prompt: str,
+    output_dir: Optional[str] = None,
+    use_cache: bool = True,
+    time_budget: Optional[float] = None,
+    score_threshold: Optional[float] = None,
+):
     print(f"[bold cyan]⚛️ CodeGen-AX initialized with quantum-enhanced sampling...[/bold cyan]")
     print(f"[bold green]🧠 Prompt:[/bold green] '{prompt}'\n")
 
-    model = LocalModel()
-    sampler = QuantumSampler(model)
-    code = sampler.sample(prompt)
+    sampler = shared_sampler(build_cache(use_cache), time_budget, score_threshold)
+    with span("codegen.sample", prompt_chars=len(prompt)) as timer:
+        try:
+            result = sampler.sample_detailed(prompt)
+        except TimeoutError as e:
+            print(f"[red]✖ {e}[/red]")
+            return
+        timer.set(cached=result.cached, variants=result.variants_scored, early_exit=result.stopped_early)
+    count("codegen_samples", cached=result.cached)
+    count("codegen_variants_scored", result.variants_scored)
+    code = result.code
+    print(f"[dim]Selected variant seed={result.seed} score={result.score:.4f} from {result.variants_scored} "
+          f"scored in {result.elapsed_ms:.1f} ms{' (early exit)' if result.stopped_early else ''}"
+          f"{' (cached)' if result.cached else ''}[/dim]")
+    if sampler.cache is not None:
+        cache_stats = sampler.cache.stats()
+        print(f"[dim]Cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)[/dim]")
 
     output_path = Path(output_dir or "quill_output")
     output_path.mkdir(parents=True, exist_ok=True)
     file_path = output_path / "main.py"
-    file_path.write_text(code)
+    with span("codegen.write", path=str(file_path)):
+        file_path.write_text(code)
+    count("codegen_bytes_written", len(code.encode()))
 
     print(f"[green]✔ Code written to:[/green] {file_path.resolve()}")
     print("[bold green]\n✅ Generation complete. Ready to run or extend.\n[/bold green]")
+
+
+# === Project Generation (multi-file scaffolds) ===
+SCAFFOLD_VERSION = 1
+SCAFFOLD_KINDS = ("fastapi", "flask", "streamlit")  # fastapi first: its imports never mention flask
+COMMON_FILES = {
+    "{package}/__init__.py": '"""{title} - generated by Qwnt AI."""\n\n__version__ = "0.1.0"\n',
+    "{package}/app.py": "{app_code}\n",
+    "{package}/config.py": (
+        "import os\n\n\n"
+        "class Settings:\n"
+        '    debug = os.environ.get("{env_prefix}_DEBUG", "0") == "1"\n'
+        '    host = os.environ.get("{env_prefix}_HOST", "127.0.0.1")\n'
+        '    port = int(os.environ.get("{env_prefix}_PORT", "{port}"))\n\n\n'
+        "settings = Settings()\n"
+    ),
+    "tests/__init__.py": "",
+    "README.md": (
+        "# {title}\n\nGenerated by Qwnt AI from the prompt:\n\n> {prompt}\n\n"
+        "## Run\n\n```bash\npip install -r requirements.txt\n{run}\n```\n\n## Test\n\n```bash\npytest\n```\n"
+    ),
+    "pyproject.toml": (
+        '[project]\nname = "{name}"\nversion = "0.1.0"\nrequires-python = ">=3.9"\n\n'
+        '[tool.pytest.ini_options]\ntestpaths = ["tests"]\n'
+    ),
+    ".env.example": "{env_prefix}_DEBUG=0\n{env_prefix}_HOST=127.0.0.1\n{env_prefix}_PORT={port}\n",
+    ".gitignore": "__pycache__/\n*.pyc\n.venv/\n.env\n",
+}
+SCAFFOLDS: Dict[str, Dict] = {
+    "flask": {
+        "values": {"run": "python -m {package}.app", "port": "5000"},
+        "files": {
+            "requirements.txt": "flask>=3.0\npytest>=8.0\n",
+            "tests/test_app.py": (
+                "from {package}.app import app\n\n\n"
+                "def test_home_responds():\n"
+                '    response = app.test_client().get("/")\n'
+                "    assert response.status_code == 200\n"
+            ),
+        },
+    },
+    "fastapi": {
+        "values": {"run": "uvicorn {package}.app:app --reload", "port": "8000"},
+        "files": {
+            "requirements.txt": "fastapi>=0.110\nuvicorn>=0.29\nhttpx>=0.27\npytest>=8.0\n",
+            "tests/test_app.py": (
+                "from fastapi.testclient import TestClient\n\n"
+                "from {package}.app import app\n\n\n"
+                "def test_root_responds():\n"
+                '    response = TestClient(app).get("/")\n'
+                "    assert response.status_code == 200\n"
+            ),
+        },
+    },
+    "streamlit": {
+        "values": {"run": "streamlit run {package}/app.py", "port": "8501"},
+        "files": {
+            "requirements.txt": "streamlit>=1.32\npytest>=8.0\n",
+            "tests/test_app.py": (
+                "from pathlib import Path\n\n\n"
+                "def test_app_compiles():\n"
+                '    source = Path(__file__).resolve().parents[1] / "{package}" / "app.py"\n'
+                '    compile(source.read_text(), str(source), "exec")\n'
+            ),
+        },
+    },
+}
+
+
+def scaffold_kind(code: str) -> Optional[str]:
+    """The framework a generated app module is written for, judged by its imports."""
+    for kind in SCAFFOLD_KINDS:
+        if f"import {kind}" in code or f"from {kind} import" in code:
+            return kind
+    return None
+
+
+def compile_template(source: str) -> List[List[Optional[str]]]:
+    """Splits a `{field}` template into [literal, field] pairs once, so rendering is a join."""
+    return [[literal, field] for literal, field, _, _ in string.Formatter().parse(source)]
+
+
+def render_template(segments: List[List[Optional[str]]], values: Dict[str, str]) -> str:
+    return "".join((literal or "") + (values[field] if field else "") for literal, field in segments)
+
+
+class ScaffoldIndex:
+    """
+    Compiled scaffolds, stored on disk under a digest of their sources and kept in memory once
+    loaded, so a scaffold is only parsed again when its templates change.
+    """
+
+    def __init__(self, cache: Optional[DiskCache] = None):
+        self.cache = cache
+        self._loaded: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.built = 0
+
+    def get(self, kind: str) -> Dict:
+        with self._lock:
+            if kind not in self._loaded:
+                self._loaded[kind] = self._load(kind)
+            return self._loaded[kind]
+
+    def _load(self, kind: str) -> Dict:
+        spec = SCAFFOLDS[kind]
+        key = DiskCache.make_key(SCAFFOLD_VERSION, kind, COMMON_FILES, spec)
+        compiled = self.cache.get(key) if self.cache is not None else None
+        if compiled is None:
+            self.built += 1
+            files = {**COMMON_FILES, **spec["files"]}
+            compiled = {
+                "values": {name: compile_template(value) for name, value in spec["values"].items()},
+                "files": [[compile_template(path), compile_template(body)] for path, body in sorted(files.items())],
+            }
+            if self.cache is not None:
+                self.cache.put(key, compiled)
+        return compiled
+
+
+@lru_cache(maxsize=8)
+def shared_scaffolds(root: Optional[str]) -> ScaffoldIndex:
+    return ScaffoldIndex(DiskCache("scaffolds", root=root) if root else None)
+
+
+def project_values(name: str, prompt: str) -> Dict[str, str]:
+    package = re.sub(r"\W+", "_", name).strip("_").lower() or "app"
+    if package[0].isdigit():
+        package = f"app_{package}"
+    return {"name": re.sub(r"[^A-Za-z0-9._-]+", "-", name).strip("-").lower() or package,
+            "package": package, "title": package.replace("_", " ").title(),
+            "prompt": " ".join(prompt.split()), "env_prefix": package.upper()}
+
+
+def _stage_file(path: Path, text: str) -> Tuple[Path, int]:
+    """Writes `text` next to `path` under a unique temporary name; the caller renames it into place."""
+    data = text.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    except BaseException:
+        os.unlink(temp)
+        raise
+    return Path(temp), len(data)
+
+
+def generate_project(
+    prompt: str,
+    name: str,
+    output_dir: Optional[str] = None,
+    kind: Optional[str] = None,
+    use_cache: bool = True,
+    workers: int = 8,
+    sampler: Optional[QuantumSampler] = None,
+    scaffolds: Optional[ScaffoldIndex] = None,
+) -> Dict:
+    """
+    Generates a project tree (app module, config, tests, requirements, packaging) for `prompt`.
+    The app module is sampled while the scaffold loads; every file is then rendered and staged
+    on a thread pool, and the staged files are renamed into place in one pass at the end. A
+    failure while sampling or staging leaves the previous tree untouched; each rename is atomic,
+    but a crash during the rename pass can leave a mix of old and new files. Files in the tree
+    that the scaffold does not generate (a .git or .venv, say) are never touched.
+    """
+    if kind is not None and kind not in SCAFFOLDS:
+        raise ValueError(f"Unknown project kind '{kind}'. Choose from: {', '.join(SCAFFOLDS)}")
+    print(f"[bold cyan]⚛️ CodeGen-AX project mode:[/bold cyan] '{name}' from '{prompt}'")
+    sampler = sampler or shared_sampler(build_cache(use_cache), None, None)
+    scaffolds = scaffolds or shared_scaffolds(str(Path(DEFAULT_CACHE_DIR).resolve()) if use_cache else None)
+    root = Path(output_dir or "quill_output") / name
+    values = project_values(name, prompt)
+    start = time.perf_counter()
+
+    with span("codegen.project", kind=kind or "auto") as timer, ThreadPoolExecutor(max_workers=workers) as pool:
+        sampled = pool.submit(sampler.sample_detailed, prompt)
+        preloaded = pool.submit(scaffolds.get, kind) if kind is not None else None
+        result = sampled.result()
+        sampled_kind = scaffold_kind(result.code)
+        kind = kind or sampled_kind or "flask"
+        scaffold = preloaded.result() if preloaded is not None else scaffolds.get(kind)
+        if sampled_kind == kind:
+            values["app_code"] = result.code.rstrip("\n")
+        else:
+            print(f"[yellow]⚠ Sampled variant targets {sampled_kind or 'no known framework'}; "
+                  f"using the {kind} scaffold's app module.[/yellow]")
+            values["app_code"] = next(code for code in CODE_VARIANTS if scaffold_kind(code) == kind).rstrip("\n")
+        values.update({field: render_template(segments, values) for field, segments in scaffold["values"].items()})
+
+        jobs = [(root / render_template(path, values), body) for path, body in scaffold["files"]]
+        staged = [pool.submit(_stage_file, path, render_template(body, values)) for path, body in jobs]
+        wait(staged)
+        error = next((future.exception() for future in staged if future.exception() is not None), None)
+        if error is not None:
+            for future in staged:
+                if future.exception() is None:
+                    os.unlink(future.result()[0])
+            raise error
+        written = [(path, future.result()) for (path, _), future in zip(jobs, staged)]
+        for moved, (path, (temp, _)) in enumerate(written):
+            try:
+                os.replace(temp, path)
+            except OSError:
+                for _, (left, _) in written[moved:]:
+                    Path(left).unlink(missing_ok=True)
+                raise
+        timer.set(files=len(written))
+
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(size for _, (_, size) in written)
+    count("codegen_bytes_written", total_bytes)
+    stats = {
+        "root": str(root),
+        "kind": kind,
+        "files": len(written),
+        "bytes": total_bytes,
+        "elapsed_s": round(elapsed, 4),
+        "files_per_s": round(len(written) / elapsed, 1) if elapsed > 0 else 0.0,
+        "sample_cached": result.cached,
+        "scaffolds_built": scaffolds.built,
+    }
+    for path, (_, size) in written:
+        print(f"[green]✔[/green] {path.relative_to(root).as_posix():<28} {size:>7,} bytes")
+    print(f"[bold green]📦 {stats['files']} files, {total_bytes:,} bytes written to {root.resolve()} "
+          f"in {elapsed * 1000:.1f} ms ({stats['files_per_s']} files/s)[/bold green]\n")
+    return stats
+
+
+# === Batch Generation (JSONL in, JSONL out) ===
+_worker_sampler: Optional[QuantumSampler] = None
+
+
+def _init_worker(num_variants: int, use_cache: bool, time_budget: Optional[float] = None,
+                 score_threshold: Optional[float] = None) -> None:
+    """Builds one model/sampler per worker process, reused for every prompt it handles."""
+    global _worker_sampler
+    _worker_sampler = QuantumSampler(shared_backend(), num_variants=num_variants, cache=build_cache(use_cache),
+                                     time_budget=time_budget, score_threshold=score_threshold)
+
+
+def _generate_one(job: Dict, sampler: Optional[QuantumSampler] = None) -> Dict:
+    active = sampler or _worker_sampler
+    start = time.perf_counter()
+    try:
+        if active is None:
+            raise RuntimeError("worker sampler not initialised")
+        result = active.sample_detailed(job["prompt"])
+        record = {"id": job["id"], "prompt": job["prompt"], "code": result.code,
+                  "score": result.score, "cached": result.cached}
+    except Exception as e:
+        record = {"id": job["id"], "prompt": job["prompt"], "error": str(e)}
+    record["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+
+def _read_prompts(batch_file: Path) -> Iterator[Dict]:
+    """
+    Lazily yields jobs from a JSONL file. Lines may be objects with a `prompt` key or bare strings;
+    a malformed line yields an `error` record instead, so one bad line does not stop the batch.
+    """
+    with batch_file.open("r") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                yield {"id": lineno, "error": f"line {lineno}: invalid JSON ({e})"}
+                continue
+            if isinstance(entry, str):
+                entry = {"prompt": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("prompt"), str):
+                yield {"id": lineno, "error": f"line {lineno}: expected a string or an object with a 'prompt'"}
+                continue
+            yield {"id": entry.get("id", lineno), "prompt": entry["prompt"]}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def generate_batch(
+    batch_file: str,
+    output_file: Optional[str] = None,
+    workers: int = 4,
+    use_processes: bool = False,
+    num_variants: int = 3,
+    use_cache: bool = True,
+    backend: Optional[ModelBackend] = None,
+    time_budget: Optional[float] = None,
+    score_threshold: Optional[float] = None,
+) -> Dict[str, float]:
+    """
+    Runs every prompt in `batch_file` through a shared sampler on a worker pool and
+    streams one JSON result per line to `output_file` as each prompt completes.
+    Every worker shares one micro-batched model; in thread mode a custom `backend` can replace it.
+    `time_budget` and `score_threshold` apply to each prompt, as in single-prompt mode.
+    """
+    source = Path(batch_file)
+    if not source.exists():
+        raise FileNotFoundError(f"Batch file '{source}' not found.")
+
+    out_path = Path(output_file or Path("quill_output") / "batch_results.jsonl")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    workers = max(1, workers)
+
+    print(f"[bold cyan]⚛️ CodeGen-AX batch mode:[/bold cyan] {source} → {out_path} "
+          f"({workers} {'processes' if use_processes else 'threads'})")
+
+    executor: Executor
+    task: Callable[[Dict], Dict]
+    sampler: Optional[QuantumSampler] = None
+    if use_processes:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(num_variants, use_cache, time_budget, score_threshold),
+        )
+        task = _generate_one
+    else:
+        sampler = QuantumSampler(backend or shared_backend(), num_variants=num_variants, cache=build_cache(use_cache),
+                                 time_budget=time_budget, score_threshold=score_threshold)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        task = partial(_generate_one, sampler=sampler)
+
+    latencies: List[float] = []
+    failures = 0
+    max_in_flight = workers * 4
+    start = time.perf_counter()
+
+    with executor, out_path.open("w") as out:
+        pending: Set[Future] = set()
+        jobs = _read_prompts(source)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                elif "error" in job:
+                    print(f"[yellow]⚠ Skipping {source}, {job['error']}[/yellow]")
+                    failures += 1
+                    out.write(json.dumps(job) + "\n")
+                else:
+                    pending.add(executor.submit(task, job))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                latencies.append(record["latency_ms"])
+                failures += "error" in record
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "prompts": len(latencies),
+        "failures": failures,
+        "elapsed_s": round(elapsed, 3),
+        "prompts_per_s": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+    }
+    if sampler is not None and sampler.cache is not None:
+        cache_stats = sampler.cache.stats()
+        stats["cache_hits"] = cache_stats["hits"]
+        stats["cache_misses"] = cache_stats["misses"]
+
+    print(f"[green]✔ {stats['prompts']} results streamed to:[/green] {out_path.resolve()}")
+    print(f"[bold green]📈 Throughput:[/bold green] {stats['prompts_per_s']} prompts/s | "
+          f"p50 {stats['p50_ms']} ms | p95 {stats['p95_ms']} ms | failures {failures}\n")
+    return stats
@@ -1,42 +1,220 @@
-import subprocess
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from rich import print
+from cache import DiskCache, file_digest
+from telemetry import count, span
+from toolrunner import ToolResult, shared_runner, tool_version
+
+FLAKE8_LINE = re.compile(r"^(?P<file>.+?):(?P<line>\d+):(?P<col>\d+): (?P<code>[A-Z]+\d+) (?P<message>.*)$")
+MYPY_LINE = re.compile(r"^(?P<file>.+?):(?P<line>\d+):(?:(?P<col>\d+):)? (?P<severity>error|note): (?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$")
+BLACK_LINE = re.compile(r"^would reformat (?P<file>.+)$")
+SKIP_DIRS = {"__pycache__", "venv", "node_modules", "build", "dist"}
+
+
+class Finding:
+    """One structured issue reported by a tool."""
+
+    def __init__(self, tool: str, file: str, line: int = 0, column: int = 0, code: str = "", message: str = ""):
+        self.tool = tool
+        self.file = file
+        self.line = line
+        self.column = column
+        self.code = code
+        self.message = message
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        location = f"{self.file}:{self.line}:{self.column}" if self.line else self.file
+        return " ".join(part for part in (f"{location}:", f"{self.tool}", self.code, self.message) if part)
+
+
+def _parse_flake8(stdout: str, stderr: str) -> List[Finding]:
+    findings = []
+    for line in stdout.splitlines():
+        m = FLAKE8_LINE.match(line)
+        if m:
+            findings.append(Finding("flake8", m["file"], int(m["line"]), int(m["col"]), m["code"], m["message"]))
+    return findings
+
+
+def _parse_black(stdout: str, stderr: str) -> List[Finding]:
+    findings = []
+    for line in stderr.splitlines():
+        m = BLACK_LINE.match(line)
+        if m:
+            findings.append(Finding("black", m["file"], message="would reformat"))
+    return findings
+
+
+def _parse_mypy(stdout: str, stderr: str) -> List[Finding]:
+    findings = []
+    for line in stdout.splitlines():
+        m = MYPY_LINE.match(line)
+        if m and m["severity"] == "error":
+            findings.append(Finding("mypy", m["file"], int(m["line"]), int(m["col"] or 0), m["code"] or "", m["message"]))
+    return findings
+
+
+# Tool name -> (command prefix, output parser, description)
+TOOLS = {
+    "flake8": (["flake8"], _parse_flake8, "🧪 Running static analysis..."),
+    "black": (["black", "--check"], _parse_black, "🎯 Checking code style..."),
+    "mypy": (["mypy", "--show-column-numbers", "--no-error-summary"], _parse_mypy, "🔎 Running type checks..."),
+}
+# Tools whose findings for a file depend only on that file and the tool's config files (looked up in
+# the file's directory, the working directory and their parents), mapped to those config names.
+# mypy's also depend on every module the file imports, so it always runs (it keeps its own cache).
+PER_FILE_TOOLS = {"flake8": (".flake8", "setup.cfg", "tox.ini"), "black": ("pyproject.toml",)}
+
+
+def changed_files(path: str) -> List[Path]:
+    """Python files under `path` that differ from HEAD or are untracked, according to git."""
+    commands = [
+        ["git", "diff", "--name-only", "--relative", "--diff-filter=ACMR", "HEAD", "--", path],
+        ["git", "ls-files", "--others", "--exclude-standard", "--", path],
+    ]
+    files: Set[Path] = set()
+    for command in commands:
+        result = shared_runner().run(command, timeout=60)
+        if result.returncode != 0:
+            raise RuntimeError(f"git failed: {result.stderr.strip()}")
+        files.update(Path(name) for name in result.stdout.splitlines() if name.endswith(".py"))
+    return sorted(f for f in files if f.exists())
+
 
 # === Debugger Engine (Simulates SYN-VAL/42) ===
 class CodeDebugger:
-    def __init__(self, path: str):
+    def __init__(self, path: str, files: Optional[List[Path]] = None, use_cache: bool = True,
+                 timeout: float = 300.0):
         self.path = Path(path)
+        self.timeout = timeout
+        self.files = files
+        self.cache = DiskCache("debugger", max_entries=100_000) if use_cache else None
+        self.findings: List[Finding] = []
+        self._configs: Dict[Tuple[str, Path], str] = {}
+
+    def run_all(self, max_workers: int = 3) -> List[Finding]:
+        """Runs every tool concurrently and collects their structured findings."""
+        files = self._target_files()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda tool: self._run_tool(tool, files), TOOLS))
+        self.findings = [finding for findings in results for finding in findings]
+        return self.findings
 
-    def run_linters(self) -> None:
-        print("[bold blue]🧪 Running static analysis...[/bold blue]")
-        self._run_command(["flake8", str(self.path)])
+    def run_linters(self) -> List[Finding]:
+        return self._run_tool("flake8", self._target_files())
 
-    def run_formatter_check(self) -> None:
-        print("[bold blue]🎯 Checking code style...[/bold blue]")
-        self._run_command(["black", "--check", str(self.path)])
+    def run_formatter_check(self) -> List[Finding]:
+        return self._run_tool("black", self._target_files())
 
-    def run_type_checks(self) -> None:
-        print("[bold blue]🔎 Running type checks...[/bold blue]")
-        self._run_command(["mypy", str(self.path)])
+    def run_type_checks(self) -> List[Finding]:
+        return self._run_tool("mypy", self._target_files())
 
     def summarize_findings(self) -> None:
-        print("\n[bold green]✅ Debugging complete. Review logs above for issues or inconsistencies.[/bold green]")
+        if not self.findings:
+            print("\n[bold green]✅ Debugging complete. No issues found.[/bold green]")
+            return
+        print(f"\n[yellow]⚠ {len(self.findings)} issue(s) found:[/yellow]")
+        for finding in sorted(self.findings, key=lambda f: (f.file, f.line, f.column, f.tool)):
+            print(f"  {finding!r}")
+        print("\n[bold green]✅ Debugging complete. Review findings above for issues or inconsistencies.[/bold green]")
 
-    def _run_command(self, command: List[str]) -> None:
-        try:
-            result = subprocess.run(command, capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"[green]✔ {command[0]} passed[/green]")
+    def _target_files(self) -> List[Path]:
+        if self.files is not None:
+            return self.files
+        if self.path.is_file():
+            return [self.path]
+        return sorted(
+            f for f in self.path.rglob("*.py")
+            if not any(part.startswith(".") or part in SKIP_DIRS for part in f.relative_to(self.path).parts)
+        )
+
+    def _run_tool(self, tool: str, files: List[Path]) -> List[Finding]:
+        command, parser, description = TOOLS[tool]
+        print(f"[bold blue]{description}[/bold blue]")
+
+        findings: List[Finding] = []
+        cache = self.cache if tool in PER_FILE_TOOLS else None
+        version = tool_version(command[0])  # an upgraded tool may report different findings
+        keys: Dict[Path, str] = {}
+        stale: List[Path] = []
+        for file in files:
+            key = ""
+            if cache is not None:
+                resolved = file.resolve()
+                key = DiskCache.make_key(tool, version, str(resolved), file_digest(file),
+                                         self._config_digest(tool, resolved.parent))
+            cached = cache.get(key) if cache is not None else None
+            if cached is None:
+                keys[file.resolve()] = key
+                stale.append(file)
             else:
-                print(f"[yellow]⚠ {command[0]} issues found:[/yellow]\n{result.stdout}")
+                findings.extend(Finding(**entry) for entry in cached)
+
+        skipped = len(files) - len(stale)
+        count("debugger_files", len(stale), tool=tool, state="checked")
+        count("debugger_files", skipped, tool=tool, state="cached")
+        if not stale:
+            print(f"[green]✔ {tool}: {skipped} file(s) unchanged, skipped[/green]")
+            return findings
+
+        result = self._run_command(command + [str(f) for f in stale])
+        if result is None:
+            return findings
+        fresh = parser(result.stdout, result.stderr)
+        findings.extend(fresh)
+
+        # Only cache complete clean/issues-found runs; crashes, timeouts and usage errors are re-run next time.
+        if cache is not None and result.returncode in (0, 1) and not result.truncated:
+            by_file: Dict[Path, List[Dict]] = {file: [] for file in keys}
+            for finding in fresh:
+                by_file.setdefault(Path(finding.file).resolve(), []).append(finding.to_dict())
+            for file, key in keys.items():
+                cache.put(key, by_file[file])
+
+        counts = f"({len(stale)} checked, {skipped} cached)"
+        if fresh:
+            print(f"[yellow]⚠ {tool}: {len(fresh)} issue(s) {counts}[/yellow]")
+        else:
+            print(f"[green]✔ {tool} passed {counts}[/green]")
+        return findings
+
+    def _config_digest(self, tool: str, directory: Path) -> str:
+        """Digest of every `tool` config file that may apply to files in `directory`."""
+        if (tool, directory) not in self._configs:
+            cwd = Path.cwd()
+            folders = dict.fromkeys([directory, *directory.parents, cwd, *cwd.parents])
+            found = [folder / name for folder in folders for name in PER_FILE_TOOLS[tool]]
+            self._configs[tool, directory] = DiskCache.make_key(
+                *((str(config), file_digest(config)) for config in found if config.is_file()))
+        return self._configs[tool, directory]
+
+    def _run_command(self, command: List[str]) -> Optional[ToolResult]:
+        try:
+            with span("debugger.command", tool=command[0], args=len(command) - 1) as timer:
+                result = shared_runner().run(command, timeout=self.timeout)
+                timer.set(returncode=result.returncode, timed_out=result.timed_out)
         except FileNotFoundError:
             print(f"[red]✖ Tool not found: {command[0]}. Please install it.[/red]")
+            return None
+        count("debugger_commands", tool=command[0], returncode=result.returncode)
+        if result.timed_out:
+            print(f"[red]✖ {command[0]} timed out after {self.timeout}s.[/red]")
+        elif result.truncated:
+            print(f"[yellow]⚠ {command[0]} produced more output than is kept; findings may be incomplete.[/yellow]")
+        return result
 
 # === CLI Entry Function ===
-def debug_code(path: str):
-    debugger = CodeDebugger(path)
-    debugger.run_linters()
-    debugger.run_formatter_check()
-    debugger.run_type_checks()
-    debugger.summarize_findings()
\ No newline at end of file
+def debug_code(path: str, changed_only: bool = False, use_cache: bool = True) -> List[Finding]:
+    files = None
+    if changed_only:
+        files = changed_files(path)
+        print(f"[blue]Checking {len(files)} changed file(s)[/blue]")
+    debugger = CodeDebugger(path, files=files, use_cache=use_cache)
+    debugger.run_all()
+    debugger.summarize_findings()
+    return debugger.findings
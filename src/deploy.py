@@ -1,38 +1,225 @@
 from pathlib import Path
 from rich import print
+from rich.markup import escape
+from typing import Dict, List, Optional
+from cache import DiskCache, file_digest
+from telemetry import count, span
+from toolrunner import shared_runner
+import gzip
+import json
+import os
 import shutil
-import subprocess
-import tempfile
+import time
+
+try:  # Optional: brotli precompression when the package is installed.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+STATE_DIR = Path(os.environ.get("QUILL_DEPLOY_DIR", ".quill_deploy"))
+DEPLOY_TIMEOUT = float(os.environ.get("QUILL_DEPLOY_TIMEOUT", "900"))
+DELTA_TARGETS = {"dir"}  # targets that accept a partial upload; hosting CLIs replace the whole site
+COMPRESSIBLE = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".svg", ".txt", ".xml", ".md", ".map", ".wasm"}
+
+
+# === Asset Precompression (content-addressed, done once per content hash) ===
+def precompress(path: Path, content_hash: str, cache_dir: Path) -> List[Path]:
+    """Returns cached .gz (and .br, when brotli is available) variants of `path`, creating them if needed."""
+    if path.suffix.lower() not in COMPRESSIBLE:
+        return []
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    variants = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", lambda data: brotli.compress(data, quality=11)))
+    outputs = []
+    data = None
+    for ext, compress in variants:
+        cached = cache_dir / f"{content_hash}{ext}"
+        if not cached.exists():
+            data = data if data is not None else path.read_bytes()
+            partial = cached.with_name(cached.name + ".part")
+            partial.write_bytes(compress(data))
+            os.replace(partial, cached)
+        outputs.append(cached)
+    return outputs
+
 
 # === Deployment Engine (Simulated for Firebase/Static Hosts) ===
 class DeployEngine:
-    def __init__(self, source_dir: str = "quill_output"):
+    def __init__(self, source_dir: str = "quill_output", state_dir: Optional[str] = None):
         self.source = Path(source_dir)
         if not self.source.exists():
             raise FileNotFoundError(f"Deployment source directory '{self.source}' not found.")
+        self.state_dir = Path(state_dir) if state_dir else STATE_DIR
 
-    def deploy(self, target: str = "local"):
+    def deploy(self, target: str = "local", dest: Optional[str] = None, full: bool = False) -> Optional[Dict]:
+        with span("deploy", target=target, full=full):
+            return self._deploy(target, dest, full)
+
+    def _deploy(self, target: str, dest: Optional[str], full: bool) -> Optional[Dict]:
         print(f"[bold cyan]🚀 Starting deployment to:[/bold cyan] {target}\n")
 
-        if target == "firebase":
-            self._deploy_to_firebase()
-        elif target == "vercel":
-            self._deploy_to_vercel()
-        elif target == "local":
+        if target == "local":
             self._preview_locally()
-        else:
+            return None
+        if target not in ("firebase", "vercel", "dir"):
             print(f"[red]✖ Unknown deployment target: {target}[/red]")
+            return None
+        destination = Path(dest) if dest else None
+        if target == "dir" and destination is None:
+            print("[red]✖ The 'dir' target needs a destination directory (--dest).[/red]")
+            return None
+
+        with span("deploy.stage", target=target):
+            plan = self.stage(target, full=full, dest=destination)
+        count("deploy_files", len(plan["changed"]), target=target, state="changed")
+        count("deploy_files", plan["unchanged"], target=target, state="unchanged")
+        count("deploy_bytes_uploaded", plan["bytes_uploaded"], target=target)
+        if not plan["changed"] and not plan["removed"]:
+            print("[green]✔ Nothing changed since the last deployment.[/green]")
+            self._print_report(plan)
+            return plan
+
+        with span("deploy.upload", target=target) as timer:
+            if target == "dir" and destination is not None:
+                ok = self._deploy_to_directory(plan, destination)
+            elif target == "firebase":
+                ok = self._deploy_to_firebase(plan["staging"])
+            else:
+                ok = self._deploy_to_vercel(plan["staging"])
+            timer.set(ok=ok)
+
+        if ok:
+            self._write_manifest(plan["state"], plan["manifest"], target, destination)
+        else:
+            print("[red]✖ Upload failed; manifest left unchanged so the next run retries these files.[/red]")
+        plan["uploaded"] = ok
+        self._print_report(plan)
+        return plan
+
+    def stage(self, target: str, full: bool = False, dest: Optional[Path] = None) -> Dict:
+        """
+        Hashes every source file and compares against the last manifest for this
+        (target, destination, source). The 'dir' target gets a staging directory holding only
+        the changed files plus their precompressed variants. Hosting CLIs replace the whole
+        site on every deploy, so firebase and vercel are handed the complete source tree,
+        hidden config such as firebase.json, .firebaserc and .vercel/ included, and the
+        manifest only decides whether a deploy is needed at all.
+        """
+        start = time.perf_counter()
+        delta = target in DELTA_TARGETS
+        state = self._state_path(target, dest)
+        previous = {} if full else self._read_manifest(state)
+        staging = state / "staging" if delta else self.source
+        if delta:
+            if staging.exists():
+                shutil.rmtree(staging)
+            staging.mkdir(parents=True)
+
+        manifest: Dict[str, Dict] = {}
+        changed: List[str] = []
+        bytes_uploaded = bytes_skipped = 0
+        for path in sorted(p for p in self.source.rglob("*") if p.is_file()):
+            rel = path.relative_to(self.source).as_posix()
+            parts = Path(rel).parts
+            if (delta and any(part.startswith(".") for part in parts)) or ".git" in parts:
+                continue
+            size = path.stat().st_size
+            digest = file_digest(path)
+            entry = {"sha256": digest, "size": size}
+            manifest[rel] = entry
+            if previous.get(rel, {}).get("sha256") == digest:
+                bytes_skipped += size
+                continue
+            changed.append(rel)
+            if not delta:
+                continue
+            staged = staging / rel
+            staged.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, staged)
+            bytes_uploaded += size
+            for variant in precompress(path, digest, self.state_dir / "compressed"):
+                shutil.copyfile(variant, staged.with_name(staged.name + variant.suffix))
+                bytes_uploaded += variant.stat().st_size
+
+        removed = sorted(set(previous) - set(manifest))
+        if not delta and (changed or removed):
+            bytes_uploaded, bytes_skipped = sum(entry["size"] for entry in manifest.values()), 0
+        return {
+            "target": target,
+            "state": state,
+            "staging": staging,
+            "manifest": manifest,
+            "changed": changed,
+            "removed": removed,
+            "unchanged": len(manifest) - len(changed),
+            "bytes_uploaded": bytes_uploaded,
+            "bytes_skipped": bytes_skipped,
+            "staging_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def _state_path(self, target: str, dest: Optional[Path]) -> Path:
+        """Per-deployment state: one manifest for each (target, destination, source) combination."""
+        key = DiskCache.make_key(target, str(dest.resolve()) if dest else None, str(self.source.resolve()))
+        return self.state_dir / target / key[:16]
 
-    def _deploy_to_firebase(self):
+    def _read_manifest(self, state: Path) -> Dict[str, Dict]:
+        try:
+            return json.loads((state / "manifest.json").read_text())["files"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _write_manifest(self, state: Path, files: Dict[str, Dict], target: str, dest: Optional[Path]) -> None:
+        state.mkdir(parents=True, exist_ok=True)
+        payload = {"target": target, "dest": str(dest.resolve()) if dest else None,
+                   "source": str(self.source.resolve()), "files": files}
+        partial = state / f"manifest.json.{os.getpid()}.part"
+        partial.write_text(json.dumps(payload, indent=2))
+        os.replace(partial, state / "manifest.json")
+
+    def _print_report(self, plan: Dict) -> None:
+        print(f"[bold]📦 Delta:[/bold] {len(plan['changed'])} changed, {plan['unchanged']} unchanged, "
+              f"{len(plan['removed'])} removed")
+        print(f"[bold]📤 Bytes:[/bold] {plan['bytes_uploaded']:,} uploaded (incl. precompressed), "
+              f"{plan['bytes_skipped']:,} skipped")
+        print(f"[bold]⏱ Staging:[/bold] {plan['staging_ms']:.1f} ms")
+
+    def _deploy_to_firebase(self, site: Path) -> bool:
         # Simulated Firebase deployment
         print("[blue]Preparing Firebase project...[/blue]")
-        subprocess.run(["firebase", "deploy", "--only", "hosting"], cwd=self.source)
-        print("[green]✔ Firebase deployment initiated.[/green]")
+        return self._run_cli(["firebase", "deploy", "--only", "hosting"], site,
+                             "[green]✔ Firebase deployment initiated.[/green]")
 
-    def _deploy_to_vercel(self):
+    def _deploy_to_vercel(self, site: Path) -> bool:
         print("[blue]Pushing project to Vercel...[/blue]")
-        subprocess.run(["vercel", "--prod"], cwd=self.source)
-        print("[green]✔ Deployed with Vercel. Check your dashboard.[/green]")
+        return self._run_cli(["vercel", "--prod"], site,
+                             "[green]✔ Deployed with Vercel. Check your dashboard.[/green]")
+
+    def _run_cli(self, command: List[str], staging: Path, success: str) -> bool:
+        try:
+            result = shared_runner().run(command, cwd=str(staging), timeout=DEPLOY_TIMEOUT,
+                                         on_line=lambda line: print(f"[dim]{command[0]} │[/dim] {escape(line)}"))
+        except FileNotFoundError:
+            print(f"[red]✖ Tool not found: {command[0]}. Please install it.[/red]")
+            return False
+        if result.timed_out:
+            print(f"[red]✖ {command[0]} timed out after {DEPLOY_TIMEOUT:.0f}s.[/red]")
+        elif result.ok:
+            print(success)
+        return result.ok
+
+    def _deploy_to_directory(self, plan: Dict, dest: Path) -> bool:
+        """Offline target: applies the staged delta to a local directory."""
+        print(f"[blue]Syncing changed assets into {dest}...[/blue]")
+        dest.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(plan["staging"], dest, dirs_exist_ok=True)
+        for rel in plan["removed"]:
+            for suffix in ("", ".gz", ".br"):
+                stale = dest / (rel + suffix)
+                if stale.exists():
+                    stale.unlink()
+        print(f"[green]✔ Directory deployment complete:[/green] {dest.resolve()}")
+        return True
 
     def _preview_locally(self):
         preview_path = self.source / "index.html"
@@ -43,6 +230,6 @@ class DeployEngine:
 
 
 # === CLI Entry ===
-def deploy(target: str = "local"):
-    engine = DeployEngine()
-    engine.deploy(target)
\ No newline at end of file
+def deploy(target: str = "local", dest: Optional[str] = None, full: bool = False, source_dir: str = "quill_output"):
+    engine = DeployEngine(source_dir)
+    return engine.deploy(target, dest=dest, full=full)
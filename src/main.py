@@ -1,70 +1,275 @@
 import typer
-from rich import print
-from codegen import generate_code
-from debugger import debug_code
-from uigen import generate_ui
-from translate import translate
-from validate import validate_file
-from mentor import mentor
-from visualizer import visualize
-from deploy import deploy as deploy_cmd
+from typing import List, Optional
+
+# Command modules (and rich) are imported inside each command so that startup,
+# including --help, only pays for typer. For the same reason help is rendered by click
+# (rich_markup_mode=None) rather than typer's rich formatter. See tests/test_cli_startup.py.
 
 # Initialize Typer app
-app = typer.Typer(help="Qwnt AI - The Quantum-Enhanced AI CLI Toolkit")
+app = typer.Typer(help="Qwnt AI - The Quantum-Enhanced AI CLI Toolkit", rich_markup_mode=None)
+
+
+def print(*objects) -> None:
+    from rich import print as rich_print
+    rich_print(*objects)
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    metrics: bool = typer.Option(False, "--metrics",
+                                 help="Record spans and counters; export Prometheus text and a Chrome trace."),
+    profile: bool = typer.Option(False, "--profile",
+                                 help="Like --metrics, plus tracemalloc allocations and a cProfile dump."),
+    metrics_dir: str = typer.Option("quill_reports", "--metrics-dir",
+                                    help="Where metrics.prom, trace.json and profile.pstats go."),
+):
+    if not (metrics or profile):
+        return
+    from telemetry import TELEMETRY, finish
+
+    if TELEMETRY.start(profile=profile):
+        ctx.call_on_close(lambda: finish(metrics_dir))
+
 
 @app.command()
-def generate(prompt: str = typer.Argument(..., help="Prompt describing the application or code to generate.")):
+def generate(
+    prompt: Optional[str] = typer.Argument(None, help="Prompt describing the application or code to generate."),
+    batch: Optional[str] = typer.Option(None, "--batch", help="JSONL file of prompts to generate in one run."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="JSONL file to stream batch results into."),
+    workers: int = typer.Option(4, "--workers", "-w", help="Number of batch workers."),
+    processes: bool = typer.Option(False, "--processes", help="Use a process pool instead of threads for batches."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the on-disk generation cache."),
+    time_budget: Optional[float] = typer.Option(None, "--time-budget", help="Stop sampling after this many seconds."),
+    score_threshold: Optional[float] = typer.Option(None, "--score-threshold",
+                                                    help="Stop at the first variant scoring this high."),
+    project: Optional[str] = typer.Option(None, "--project", help="Generate a full project tree with this name."),
+    kind: Optional[str] = typer.Option(
+        None, "--kind", help="Project scaffold: flask, fastapi or streamlit (default: from the sampled code)."),
+    output_dir: Optional[str] = typer.Option(None, "--output-dir",
+                                             help="Where --project trees are written (default: quill_output)."),
+):
     """Generate code from natural language prompts."""
+    from codegen import generate_batch, generate_code, generate_project
+
+    if batch:
+        print(f"[bold green]🔧 Generating code for batch:[/bold green] {batch}")
+        generate_batch(batch, output_file=output, workers=workers, use_processes=processes, use_cache=not no_cache,
+                       time_budget=time_budget, score_threshold=score_threshold)
+        return
+    if not prompt:
+        print("[red]✖ Provide a prompt or --batch file.[/red]")
+        raise typer.Exit(code=1)
+    if project:
+        try:
+            generate_project(prompt, project, output_dir=output_dir, kind=kind, use_cache=not no_cache)
+        except ValueError as e:
+            print(f"[red]✖ {e}[/red]")
+            raise typer.Exit(code=1)
+        return
     print(f"[bold green]🔧 Generating code for prompt:[/bold green] '{prompt}'")
-    generate_code(prompt)
+    generate_code(prompt, use_cache=not no_cache, time_budget=time_budget, score_threshold=score_threshold)
 
 
 @app.command()
-def debug(path: str = typer.Argument(..., help="Path to the Python code or project directory.")):
+def debug(
+    path: str = typer.Argument(..., help="Path to the Python code or project directory."),
+    changed_only: bool = typer.Option(False, "--changed-only", help="Only check files changed since HEAD (git diff)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-check files even if their content is unchanged."),
+):
     """Debug and lint code files."""
+    from debugger import debug_code
+
     print(f"[bold green]🛠️ Debugging code at:[/bold green] {path}")
-    debug_code(path)
+    debug_code(path, changed_only=changed_only, use_cache=not no_cache)
 
 
 @app.command()
-def uigen(theme: str = "light", components: str = "form"):
+def uigen(
+    theme: str = "light",
+    components: str = "form",
+    themes: Optional[str] = typer.Option(None, "--themes", help="Comma-separated themes for bulk matrix rendering."),
+    layouts: Optional[str] = typer.Option(
+        None, "--layouts", help="Semicolon-separated layouts for the matrix, e.g. 'hero,footer;hero,pricing,footer'."),
+    seed: Optional[int] = typer.Option(None, "--seed",
+                                       help="Seed for the component permutation (default: derived from the inputs)."),
+):
     """Generate UI components using templates."""
+    from uigen import generate_ui, generate_ui_matrix
+
+    if themes or layouts:
+        theme_list = [t.strip() for t in (themes or theme).split(",") if t.strip()]
+        layout_list = [layout.strip() for layout in (layouts or components).split(";") if layout.strip()]
+        layout_map = {f"layout{i + 1}": [c.strip() for c in layout.split(",")] for i, layout in enumerate(layout_list)}
+        generate_ui_matrix(theme_list, layout_map, seed=seed)
+        return
     print(f"[bold green]🎨 Generating UI with theme:[/bold green] {theme}, components: {components}")
-    generate_ui(theme, components)
+    generate_ui(theme, [c.strip() for c in components.split(",")], seed=seed)
 
 
 @app.command()
-def validate(file: str, ci: bool = False):
+def validate(
+    files: Optional[List[str]] = typer.Argument(None, help="Files, directories or globs to validate."),
+    ci: bool = False,
+    fail_fast: bool = typer.Option(False, "--fail-fast", help="Cancel remaining CI stages after the first failure."),
+    report: str = typer.Option("quill_reports/pipeline_report.json", "--report",
+                               help="Where to write CI stage timings (JSON)."),
+    max_errors: int = typer.Option(20, "--max-errors", help="Stop after reporting this many errors."),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w",
+                                          help="Parallel workers for many files (default: CPU count)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Revalidate files even if their content is unchanged."),
+    schema: Optional[str] = typer.Option(
+        None, "--schema",
+        help="JSON Schema file every JSON/YAML record must satisfy. With a schema, a .json file is loaded whole "
+             "whatever its size; use NDJSON or multi-document YAML for huge inputs."),
+):
     """Validate schema files or run full CI pipeline."""
-    validate_file(file, ci)
+    from validate import validate_file
+
+    if not files and not ci:
+        print("[red]✖ Give at least one file, directory or glob to validate (or --ci).[/red]")
+        raise typer.Exit(code=2)
+    ok = validate_file(files or [], ci, fail_fast=fail_fast, report=report, max_errors=max_errors,
+                       workers=workers, use_cache=not no_cache, schema=schema)
+    if ok is False:
+        raise typer.Exit(code=1)
 
 
 @app.command()
-def translate(from_lang: str, to_lang: str, filepath: str):
+def translate(
+    from_lang: str = typer.Argument(..., help="Source language, alias or extension, or 'auto' to detect per file."),
+    to_lang: str = typer.Argument(..., help="Target language, alias or extension."),
+    filepath: str = typer.Argument(..., help="Source file, directory or glob (quote globs, e.g. 'src/**/*.js')."),
+    stream: Optional[bool] = typer.Option(
+        None, "--stream/--no-stream",
+        help="Force chunked streaming translation on or off (default: automatic for large files)."),
+    output_dir: Optional[str] = typer.Option(None, "--output-dir", "-o",
+                                             help="Directory for translated files and the manifest."),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w",
+                                          help="Worker processes for directory/glob translation."),
+):
     """Translate code between programming languages."""
+    from translate import translate as translate_cmd
+
     print(f"[bold green]🔄 Translating {filepath} from {from_lang} to {to_lang}...[/bold green]")
-    translate(from_lang, to_lang, filepath)
+    translate_cmd(from_lang, to_lang, filepath, stream=stream, output_dir=output_dir, workers=workers)
 
 
 @app.command()
-def mentor(question: str):
+def mentor(
+    question: str,
+    lang: str = typer.Option("python", "--lang", help="python, javascript or rust."),
+    level: str = typer.Option("beginner", "--level", help="beginner, intermediate, advanced or expert."),
+):
     """Ask logic or debugging questions to the mentor AI."""
+    from mentor import mentor as mentor_cmd
+
     print(f"[bold green]❓ Asking mentor:[/bold green] {question}")
-    mentor(question)
+    mentor_cmd(question, lang, level)
 
 
 @app.command()
-def visualize(prompt: str):
+def visualize(
+    prompt: Optional[str] = typer.Argument(None, help="Prompt describing the image to render."),
+    style: Optional[str] = typer.Option(None, "--style", help="Render style (default: picked from the prompt)."),
+    size: str = typer.Option("512", "--size", help="Image size as N or WIDTHxHEIGHT."),
+    batch: Optional[str] = typer.Option(None, "--batch", help="JSONL or text file of prompts to render in one run."),
+    output_dir: str = typer.Option("quill_visuals", "--output-dir", "-o", help="Directory for rendered PNGs."),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w",
+                                          help="Render processes for --batch (default: CPU count)."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-render even if the image is cached."),
+):
     """Generate an image or diagram from prompt."""
-    print(f"[bold green]🖼️ Visualizing:[/bold green] {prompt}")
-    visualize(prompt)
+    from visualizer import visualize as visualize_cmd
+
+    if not prompt and not batch:
+        print("[red]✖ Provide a prompt or --batch file.[/red]")
+        raise typer.Exit(code=1)
+    print(f"[bold green]🖼️ Visualizing:[/bold green] {batch or prompt}")
+    try:
+        visualize_cmd(prompt, style=style, size=size, batch=batch, output_dir=output_dir, workers=workers,
+                      use_cache=not no_cache)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[red]✖ {e}[/red]")
+        raise typer.Exit(code=1)
 
 
 @app.command()
-def deploy(target: str = "local"):
+def deploy(
+    target: str = typer.Option("local", help="local (preview), firebase, vercel, or dir."),
+    dest: Optional[str] = typer.Option(None, "--dest", help="Destination directory for the 'dir' target."),
+    source: str = typer.Option("quill_output", "--source", help="Directory to deploy."),
+    full: bool = typer.Option(False, "--full", help="Ignore the deployment manifest and upload everything."),
+):
     """Deploy the current app to a target environment."""
+    from deploy import deploy as deploy_cmd
+
     print(f"[bold green]🚀 Deploying to:[/bold green] {target}")
-    deploy_cmd(target)
+    deploy_cmd(target, dest=dest, full=full, source_dir=source)
+
+
+@app.command()
+def serve(
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket to listen on (default: $QUILL_SOCKET or a per-user temp path)."),
+    port: Optional[int] = typer.Option(None, "--port", help="Listen on 127.0.0.1:PORT instead of a Unix socket."),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Commands executed at the same time."),
+    max_queue: int = typer.Option(64, "--max-queue", help="Queued commands before new ones are rejected."),
+):
+    """Run a resident server that keeps engines warm for `python src/client.py ...`."""
+    from server import QwntServer, server_address
+
+    server = QwntServer(server_address(socket_path, port), max_concurrency=concurrency, max_queue=max_queue)
+    server.start()
+    print(f"[bold green]🛰️ Qwnt server listening on:[/bold green] {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[yellow]Server stopped.[/yellow]")
+    finally:
+        server.shutdown()
+
+
+@app.command()
+def bench(
+    names: Optional[List[str]] = typer.Argument(None, help="Benchmarks to run (default: all)."),
+    scale: int = typer.Option(1, "--scale", help="Multiplier for the synthetic corpus sizes."),
+    repeat: int = typer.Option(5, "--repeat", "-n", help="Timed runs per benchmark."),
+    output: str = typer.Option("quill_reports/bench.json", "--output", "-o", help="Where to write the results (JSON)."),
+    baseline: Optional[str] = typer.Option(None, "--baseline", help="Results file to compare against."),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Store these results as the new --baseline."),
+    threshold: float = typer.Option(0.25, "--threshold", help="Allowed slowdown of a benchmark's mean, as a fraction."),
+):
+    """Benchmark every engine and fail on regressions against a baseline."""
+    from bench import bench as bench_cmd
+
+    try:
+        ok = bench_cmd(names, scale=scale, repeat=repeat, output=output, baseline=baseline,
+                       save_baseline=save_baseline, threshold=threshold)
+    except ValueError as e:
+        print(f"[red]✖ {e}[/red]")
+        raise typer.Exit(code=2)
+    if not ok:
+        raise typer.Exit(code=1)
+
+
+agents_app = typer.Typer(help="Run workloads across the agents concurrently.", rich_markup_mode=None)
+app.add_typer(agents_app, name="agents")
+
+
+@agents_app.command("run")
+def agents_run(
+    target: str = typer.Argument(".", help="File or directory whose Python files are reviewed."),
+    review_concurrency: int = typer.Option(4, "--review-concurrency", help="Reviews running at once."),
+    chat_concurrency: int = typer.Option(8, "--chat-concurrency", help="Summaries running at once."),
+    timeout: float = typer.Option(30.0, "--timeout", help="Seconds before a single agent task is abandoned."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore cached agent results."),
+):
+    """Review every file in a tree while the chat agent summarizes the findings."""
+    from agents.runtime import run_agents
+
+    run_agents(target, review_concurrency=review_concurrency, chat_concurrency=chat_concurrency,
+               timeout=timeout, use_cache=not no_cache)
 
 
 if __name__ == "__main__":
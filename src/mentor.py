@@ -1,33 +1,190 @@
+from functools import lru_cache
+from pathlib import Path
 from rich import print
-import random
+from typing import Dict, List, Optional, Tuple
+from cache import DEFAULT_CACHE_DIR
+import hashlib
+import json
+import math
+import os
+import re
 import textwrap
+import zlib
+
+# === Knowledge Base ===
+CURRICULUM: Dict[str, List[str]] = {
+    "python": [
+        "[1] Beginner: Learn variables, types, loops, and conditionals.",
+        "[2] Intermediate: Practice functions, modules, file I/O, and error handling.",
+        "[3] Advanced: Master decorators, generators, OOP, and context managers.",
+        "[4] Expert: Dive into concurrency (async/threading), memory profiling, metaclasses, and bytecode."
+    ],
+    "javascript": [
+        "[1] Beginner: Understand syntax, variables, functions, and basic DOM.",
+        "[2] Intermediate: Learn closures, ES6 features, promises, and fetch API.",
+        "[3] Advanced: Explore prototypes, async/await, module systems.",
+        "[4] Expert: Study event loop internals, performance tuning, and security patterns."
+    ],
+    "rust": [
+        "[1] Beginner: Learn let-bindings, primitive types, and ownership rules.",
+        "[2] Intermediate: Use structs, enums, pattern matching, and error handling.",
+        "[3] Advanced: Implement traits, lifetimes, and concurrency models.",
+        "[4] Expert: Explore unsafe Rust, macros, and compiler internals."
+    ]
+}
+
+EXAMPLES: Dict[Tuple[str, int], str] = {
+    ("python", 0): "Variables in Python are dynamically typed. For example: x = 42",
+    ("python", 1): "Functions are defined using 'def'. You can import modules using 'import os'",
+    ("python", 2): "Generators allow lazy iteration. Example: def gen(): yield 1",
+    ("python", 3): "Metaclasses are classes of classes. Used to customize class creation dynamically.",
+
+    ("javascript", 0): "Use 'let' or 'const' for variable declarations. Example: let count = 5;",
+    ("javascript", 1): "Closures capture surrounding scope. Example: function outer() { let x = 1; return function() { return x; }; }",
+    ("javascript", 2): "Async/await lets you write promise-based code like synchronous code.",
+    ("javascript", 3): "The event loop handles async tasks. Study microtask queue and task queue separation.",
+
+    ("rust", 0): "Rust variables are immutable by default. Use 'mut' to make them mutable.",
+    ("rust", 1): "Pattern matching with 'match' enables exhaustive condition handling.",
+    ("rust", 2): "Lifetimes are annotations that tell the compiler how long references are valid.",
+    ("rust", 3): "Unsafe Rust allows you to dereference raw pointers, useful for FFI or low-level ops."
+}
+
+LEVELS = {"beginner": 0, "intermediate": 1, "advanced": 2, "expert": 3}
+INDEX_VERSION = 1
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in into is it its like of on or the this to "
+    "use used using what when where which why with you your".split()
+)
+WORD = re.compile(r"[a-z0-9_#+]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words without stopwords, with a plural 's' stripped so "generators" finds "generator"."""
+    tokens = []
+    for word in WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def knowledge_documents() -> List[Dict]:
+    docs = [{"lang": lang, "level": level, "kind": "lesson", "text": text}
+            for lang, lessons in CURRICULUM.items() for level, text in enumerate(lessons)]
+    docs += [{"lang": lang, "level": level, "kind": "example", "text": text}
+             for (lang, level), text in EXAMPLES.items()]
+    return docs
+
+
+# === BM25 Inverted Index ===
+class KnowledgeIndex:
+    """
+    BM25 index over the curriculum and examples. Postings hold (doc id, BM25 term weight)
+    pairs computed at build time, so a query is a dictionary lookup and a sum per term.
+    """
+
+    def __init__(self, docs: List[Dict], postings: Dict[str, List[float]], digest: str = ""):
+        self.docs = docs
+        self.postings = postings
+        self.digest = digest
+
+    @classmethod
+    def build(cls, docs: List[Dict], k1: float = 1.5, b: float = 0.75) -> "KnowledgeIndex":
+        tokenized = [tokenize(doc["text"]) for doc in docs]
+        avgdl = sum(len(tokens) for tokens in tokenized) / max(len(tokenized), 1)
+        frequencies: Dict[str, Dict[int, int]] = {}
+        for doc_id, tokens in enumerate(tokenized):
+            for token in tokens:
+                frequencies.setdefault(token, {}).setdefault(doc_id, 0)
+                frequencies[token][doc_id] += 1
+
+        postings: Dict[str, List[float]] = {}
+        for term, per_doc in sorted(frequencies.items()):
+            idf = math.log(1 + (len(docs) - len(per_doc) + 0.5) / (len(per_doc) + 0.5))
+            flat: List[float] = []
+            for doc_id, tf in sorted(per_doc.items()):
+                norm = k1 * (1 - b + b * len(tokenized[doc_id]) / avgdl)
+                flat += [doc_id, round(idf * tf * (k1 + 1) / (tf + norm), 6)]
+            postings[term] = flat
+        return cls(docs, postings, knowledge_digest(docs))
+
+    def to_bytes(self) -> bytes:
+        payload = {"version": INDEX_VERSION, "digest": self.digest, "docs": self.docs, "postings": self.postings}
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KnowledgeIndex":
+        payload = json.loads(zlib.decompress(data))
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError("Stale knowledge index format")
+        return cls(payload["docs"], payload["postings"], payload["digest"])
+
+    def search(self, query: str, lang: Optional[str] = None, level: Optional[int] = None,
+               kind: Optional[str] = None, k: int = 3) -> List[Tuple[float, Dict]]:
+        """Top-k documents for `query`, restricted to `lang`/`kind` and nudged towards `level`."""
+        scores: Dict[int, float] = {}
+        for term in tokenize(query):
+            if term == lang:  # already a filter; as a term it would favour docs that merely name the language
+                continue
+            flat = self.postings.get(term)
+            if flat is None:
+                continue
+            for i in range(0, len(flat), 2):
+                doc_id = int(flat[i])
+                scores[doc_id] = scores.get(doc_id, 0.0) + flat[i + 1]
+
+        ranked = []
+        for doc_id, score in scores.items():
+            doc = self.docs[doc_id]
+            if (lang and doc["lang"] != lang) or (kind and doc["kind"] != kind):
+                continue
+            if level is not None:
+                score /= 1 + 0.25 * abs(doc["level"] - level)
+            ranked.append((score, doc_id))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [(round(score, 4), self.docs[doc_id]) for score, doc_id in ranked[:k]]
+
+
+def knowledge_digest(docs: List[Dict]) -> str:
+    payload = json.dumps([INDEX_VERSION, docs], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_index(cache_dir: Optional[str] = None) -> KnowledgeIndex:
+    """
+    Loads the serialized index for the current knowledge base, building and saving it
+    first if the knowledge base changed or no index file exists yet.
+    """
+    docs = knowledge_documents()
+    digest = knowledge_digest(docs)
+    path = Path(cache_dir or Path(DEFAULT_CACHE_DIR) / "mentor") / f"index-{digest[:16]}.bin"
+    try:
+        index = KnowledgeIndex.from_bytes(path.read_bytes())
+        if index.digest == digest:
+            return index
+    except (OSError, ValueError, zlib.error):
+        pass
+    index = KnowledgeIndex.build(docs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+    partial.write_bytes(index.to_bytes())
+    os.replace(partial, path)
+    for stale in path.parent.glob("index-*.bin"):  # indexes of earlier knowledge bases
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return index
+
 
 # === KN-Bridge / Mentor AI ===
 class MentorAI:
-    def __init__(self):
-        self.curriculum = self._build_curriculum()
-
-    def _build_curriculum(self):
-        return {
-            "python": [
-                "[1] Beginner: Learn variables, types, loops, and conditionals.",
-                "[2] Intermediate: Practice functions, modules, file I/O, and error handling.",
-                "[3] Advanced: Master decorators, generators, OOP, and context managers.",
-                "[4] Expert: Dive into concurrency (async/threading), memory profiling, metaclasses, and bytecode."
-            ],
-            "javascript": [
-                "[1] Beginner: Understand syntax, variables, functions, and basic DOM.",
-                "[2] Intermediate: Learn closures, ES6 features, promises, and fetch API.",
-                "[3] Advanced: Explore prototypes, async/await, module systems.",
-                "[4] Expert: Study event loop internals, performance tuning, and security patterns."
-            ],
-            "rust": [
-                "[1] Beginner: Learn let-bindings, primitive types, and ownership rules.",
-                "[2] Intermediate: Use structs, enums, pattern matching, and error handling.",
-                "[3] Advanced: Implement traits, lifetimes, and concurrency models.",
-                "[4] Expert: Explore unsafe Rust, macros, and compiler internals."
-            ]
-        }
+    def __init__(self, index: Optional[KnowledgeIndex] = None, cache_size: int = 256):
+        self.curriculum = CURRICULUM
+        self.index = index or load_index()
+        # Keyed on the normalized question, so rephrasings with the same keywords share an entry.
+        self._answer = lru_cache(maxsize=cache_size)(self._compose)
 
     def ask(self, question: str, lang: str = "python", level: str = "beginner") -> str:
         lang = lang.lower()
@@ -36,36 +193,31 @@ class MentorAI:
         print(f"[bold cyan]🧠 Mentor AI Activated[/bold cyan]\n")
         if lang not in self.curriculum:
             return f"Sorry, curriculum for [bold]{lang}[/bold] is not available yet."
+        return self._answer(" ".join(tokenize(question)), lang, LEVELS.get(level, 0))
 
-        roadmap = self.curriculum[lang]
-        level_index = {"beginner": 0, "intermediate": 1, "advanced": 2, "expert": 3}.get(level, 0)
-        lesson = roadmap[level_index]
+    def cache_info(self):
+        return self._answer.cache_info()
 
-        explanation = self._explain_concept(question, lang, level_index)
+    def _compose(self, terms: str, lang: str, level_index: int) -> str:
+        lesson = self.curriculum[lang][level_index]
+        explanation = self._explain_concept(terms, lang, level_index)
         return f"{lesson}\n\n{explanation}"
 
     def _explain_concept(self, concept: str, lang: str, level_index: int) -> str:
-        examples = {
-            ("python", 0): "Variables in Python are dynamically typed. For example: x = 42",
-            ("python", 1): "Functions are defined using 'def'. You can import modules using 'import os'",
-            ("python", 2): "Generators allow lazy iteration. Example: def gen(): yield 1",
-            ("python", 3): "Metaclasses are classes of classes. Used to customize class creation dynamically.",
+        hits = self.index.search(concept, lang=lang, level=level_index, kind="example", k=1)
+        if hits:
+            return hits[0][1]["text"]
+        return EXAMPLES.get((lang, level_index), f"Here's a general explanation for '{concept}' in {lang}.")
 
-            ("javascript", 0): "Use 'let' or 'const' for variable declarations. Example: let count = 5;",
-            ("javascript", 1): "Closures capture surrounding scope. Example: function outer() { let x = 1; return function() { return x; }; }",
-            ("javascript", 2): "Async/await lets you write promise-based code like synchronous code.",
-            ("javascript", 3): "The event loop handles async tasks. Study microtask queue and task queue separation.",
 
-            ("rust", 0): "Rust variables are immutable by default. Use 'mut' to make them mutable.",
-            ("rust", 1): "Pattern matching with 'match' enables exhaustive condition handling.",
-            ("rust", 2): "Lifetimes are annotations that tell the compiler how long references are valid.",
-            ("rust", 3): "Unsafe Rust allows you to dereference raw pointers, useful for FFI or low-level ops."
-        }
-        return examples.get((lang, level_index), f"Here's a general explanation for '{concept}' in {lang}.")
+# === CLI Entry ===
+@lru_cache(maxsize=1)
+def shared_mentor() -> MentorAI:
+    """One MentorAI per process, so a resident server loads the index and keeps its response cache."""
+    return MentorAI()
 
 
-# === CLI Entry ===
 def mentor(question: str, lang: str = "python", level: str = "beginner"):
-    mentor_bot = MentorAI()
+    mentor_bot = shared_mentor()
     response = mentor_bot.ask(question, lang, level)
     print(f"[bold green]📘 Response:[/bold green]\n{textwrap.indent(response, '  ')}\n")
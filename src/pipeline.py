@@ -1,37 +1,183 @@
+import json
+import signal
 import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from rich import print
+from rich.markup import escape
 from pathlib import Path
+from telemetry import count, span
+from toolrunner import ToolRunner, shared_runner
+from typing import Dict, List, Optional
 
-# === DX-Pipeline (Test + Lint + Type Check Runner) ===
-def run_pipeline():
-    print("[bold cyan]🔁 DX-Pipeline: Full validation cycle starting...[/bold cyan]\n")
+DEFAULT_REPORT = "quill_reports/pipeline_report.json"
 
-    results = {
-        "tests": _run_pytest(),
-        "types": _run_mypy(),
-        "lint": _run_flake8()
-    }
 
-    success = all(results.values())
-    print("\n[bold green]✅ Pipeline complete![/bold green]" if success else "\n[red]❌ One or more steps failed.[/red]")
+# === Pipeline Stages ===
+class Stage:
+    """A pipeline step: one command, the names of the stages it depends on, and a time limit in seconds."""
+
+    def __init__(self, name: str, command: List[str], description: str, deps: Optional[List[str]] = None,
+                 timeout: Optional[float] = 1800.0):
+        self.name = name
+        self.command = command
+        self.description = description
+        self.deps = deps or []
+        self.timeout = timeout
+
+
+DEFAULT_STAGES = [
+    Stage("tests", ["pytest", "tests/"], "🧪 Running unit tests with pytest..."),
+    Stage("types", ["mypy", "src/"], "🔎 Type-checking with mypy..."),
+    Stage("lint", ["flake8", "src/"], "🎯 Linting with flake8..."),
+]
+
+
+class StageResult:
+    def __init__(self, name: str, status: str, returncode: Optional[int] = None, wall_s: float = 0.0,
+                 cpu_user_s: float = 0.0, cpu_sys_s: float = 0.0):
+        self.name = name
+        self.status = status
+        self.returncode = returncode
+        self.wall_s = wall_s
+        self.cpu_user_s = cpu_user_s
+        self.cpu_sys_s = cpu_sys_s
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+# === DAG Scheduler ===
+class PipelineScheduler:
+    """
+    Runs stages as soon as their dependencies have passed, streaming each stage's
+    output live. With `fail_fast`, the first failure cancels everything still running.
+    """
 
+    def __init__(self, stages: List[Stage], fail_fast: bool = False, max_workers: Optional[int] = None,
+                 runner: Optional[ToolRunner] = None):
+        names = {stage.name for stage in stages}
+        for stage in stages:
+            missing = set(stage.deps) - names
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(sorted(missing))}")
+        self.stages = {stage.name: stage for stage in stages}
+        self.fail_fast = fail_fast
+        self.max_workers = max_workers or len(stages)
+        self.runner = runner or shared_runner()
+        self.results: Dict[str, StageResult] = {}
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
 
-def _run_pytest() -> bool:
-    print("[blue]🧪 Running unit tests with pytest...[/blue]")
-    result = subprocess.run(["pytest", "tests/"], capture_output=True, text=True)
-    print(result.stdout)
-    return result.returncode == 0
+    def run(self) -> Dict[str, StageResult]:
+        waiting = dict(self.stages)
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or running:
+                for name, stage in list(waiting.items()):
+                    dep_status = [self.results[d].status if d in self.results else None for d in stage.deps]
+                    if self._cancelled.is_set() or any(s not in (None, "passed") for s in dep_status):
+                        self.results[name] = StageResult(name, "cancelled" if self._cancelled.is_set() else "skipped")
+                        del waiting[name]
+                    elif all(s == "passed" for s in dep_status):
+                        running[pool.submit(self._run_stage, stage)] = name
+                        del waiting[name]
+                if not running:
+                    if waiting:
+                        raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(waiting))}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    self.results[result.name] = result
+                    del running[future]
+                    if result.status == "failed" and self.fail_fast:
+                        self._cancel_all()
+        return {name: self.results[name] for name in self.stages}
 
+    def _run_stage(self, stage: Stage) -> StageResult:
+        # Checked under the lock _cancel_all holds, so a stage either sees the cancellation
+        # here or has its process killed by _cancel_all / the register hook.
+        with self._lock:
+            if self._cancelled.is_set():
+                return StageResult(stage.name, "cancelled")
+        print(f"[blue]{stage.description}[/blue]")
+        with span("pipeline.stage", stage=stage.name) as timer:
+            result = self._execute_stage(stage)
+            timer.set(status=result.status, returncode=result.returncode)
+        count("pipeline_stages", stage=stage.name, status=result.status)
+        return result
 
-def _run_mypy() -> bool:
-    print("[blue]🔎 Type-checking with mypy...[/blue]")
-    result = subprocess.run(["mypy", "src/"], capture_output=True, text=True)
-    print(result.stdout)
-    return result.returncode == 0
+    def _execute_stage(self, stage: Stage) -> StageResult:
+        def register(proc: subprocess.Popen) -> None:
+            with self._lock:
+                self._procs[stage.name] = proc
+                if self._cancelled.is_set():  # cancelled while waiting for a free process slot
+                    ToolRunner.kill(proc, signal.SIGTERM)
 
+        start = time.perf_counter()
+        try:
+            result = self.runner.run(stage.command, timeout=stage.timeout, merge_stderr=True, on_start=register,
+                                     on_line=lambda line: print(f"[dim]{stage.name:>6} │[/dim] {escape(line)}"))
+        except FileNotFoundError:
+            print(f"[red]✖ Tool not found: {stage.command[0]}. Please install it.[/red]")
+            return StageResult(stage.name, "failed", wall_s=time.perf_counter() - start)
+        finally:
+            with self._lock:
+                self._procs.pop(stage.name, None)
 
-def _run_flake8() -> bool:
-    print("[blue]🎯 Linting with flake8...[/blue]")
-    result = subprocess.run(["flake8", "src/"], capture_output=True, text=True)
-    print(result.stdout or "[green]✔ No linting issues found.[/green]")
-    return result.returncode == 0
+        if self._cancelled.is_set() and result.returncode != 0:
+            status = "cancelled"
+        else:
+            status = "passed" if result.ok else "failed"
+        if result.timed_out:
+            print(f"[red]✖ {stage.name} timed out after {stage.timeout}s[/red]")
+        icon = {"passed": "[green]✔", "failed": "[red]✖", "cancelled": "[yellow]⏹"}[status]
+        print(f"{icon} {stage.name} {status} in {result.elapsed_s:.2f}s[/]")
+        return StageResult(stage.name, status, result.returncode, result.elapsed_s, result.cpu_user_s, result.cpu_sys_s)
+
+    def _cancel_all(self) -> None:
+        with self._lock:
+            self._cancelled.set()
+            for proc in self._procs.values():
+                ToolRunner.kill(proc, signal.SIGTERM)
+
+
+def write_report(results: Dict[str, StageResult], wall_s: float, report_path: str) -> Path:
+    path = Path(report_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "wall_s": round(wall_s, 4),
+        "success": all(r.status == "passed" for r in results.values()),
+        "stages": [r.to_dict() for r in results.values()],
+    }
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+# === DX-Pipeline (Test + Lint + Type Check Runner) ===
+def run_pipeline(
+    fail_fast: bool = False,
+    report_path: Optional[str] = DEFAULT_REPORT,
+    stages: Optional[List[Stage]] = None,
+) -> bool:
+    print("[bold cyan]🔁 DX-Pipeline: Full validation cycle starting...[/bold cyan]\n")
+
+    start = time.perf_counter()
+    with span("pipeline.run", fail_fast=fail_fast):
+        results = PipelineScheduler(stages or DEFAULT_STAGES, fail_fast=fail_fast).run()
+    wall = time.perf_counter() - start
+
+    print()
+    for r in results.values():
+        print(f"  {r.name:<8} {r.status:<10} wall {r.wall_s:>7.2f}s  cpu {r.cpu_user_s + r.cpu_sys_s:>7.2f}s")
+    if report_path:
+        print(f"[dim]Timing report written to {write_report(results, wall, report_path)}[/dim]")
+
+    success = all(r.status == "passed" for r in results.values())
+    print("\n[bold green]✅ Pipeline complete![/bold green]" if success else "\n[red]❌ One or more steps failed.[/red]")
+    return success
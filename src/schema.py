@@ -0,0 +1,431 @@
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import math
+import operator
+import os
+import re
+import warnings
+
+# A compiled check appends (json-pointer, message) pairs for every violation it finds.
+Errors = List[Tuple[str, str]]
+Check = Callable[[Any, Tuple, Errors], None]
+
+
+class SchemaError(ValueError):
+    """Raised when a schema is malformed or relies on keywords this validator does not implement."""
+
+
+# Keywords that constrain validity but are not implemented; silently ignoring them would let
+# invalid documents pass, so compiling a schema that uses one fails instead.
+UNSUPPORTED_KEYWORDS = frozenset({
+    "if", "then", "else", "contains", "minContains", "maxContains", "propertyNames",
+    "dependencies", "dependentRequired", "dependentSchemas", "additionalItems",
+    "unevaluatedProperties", "unevaluatedItems", "$dynamicRef", "$recursiveRef",
+})
+# Annotation-only by default in JSON Schema, so they are accepted with a warning.
+UNCHECKED_KEYWORDS = frozenset({"format"})
+
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "null": lambda v: v is None,
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+    or (isinstance(v, float) and v.is_integer()),
+}
+# Exact types that satisfy each JSON type without further checks (note bool is not an int here).
+EXACT_TYPES: Dict[str, Tuple[type, ...]] = {
+    "null": (type(None),), "boolean": (bool,), "object": (dict,), "array": (list,),
+    "string": (str,), "number": (int, float), "integer": (int,),
+}
+
+
+def pointer(path: Tuple) -> str:
+    """RFC 6901 JSON pointer for a tuple of keys/indices ("" is the document root)."""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def _accept(value, path, errors) -> None:
+    pass
+
+
+def _reject(value, path, errors) -> None:
+    errors.append((pointer(path), "no value is allowed here"))
+
+
+def _equal(a, b) -> bool:
+    # JSON equality: True is not 1, but 1 == 1.0.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    return a == b
+
+
+# === Schema Compiler ===
+class SchemaCompiler:
+    """
+    Compiles a JSON Schema (the draft-07 / 2020-12 validation keywords most configs use,
+    with local "#/..." $refs) into nested closures. Keyword lookups, regex compilation
+    and $ref resolution happen once here rather than for every validated record.
+    """
+
+    def __init__(self, root: Any):
+        self.root = root
+        self._refs: Dict[str, List[Check]] = {}
+
+    def compile(self, schema: Any) -> Check:
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return _reject
+        if not isinstance(schema, dict):
+            raise SchemaError(f"Invalid schema: expected an object or boolean, got {schema!r}")
+        unsupported = UNSUPPORTED_KEYWORDS.intersection(schema)
+        if unsupported:
+            raise SchemaError(f"Unsupported schema keyword(s): {', '.join(sorted(unsupported))}")
+        for keyword in UNCHECKED_KEYWORDS.intersection(schema):
+            warnings.warn(f"Schema keyword {keyword!r} is not checked", stacklevel=2)
+
+        checks: List[Check] = []
+        for keyword, build in KEYWORDS.items():
+            if keyword in schema:
+                checks.append(build(self, schema[keyword], schema))
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value, path, errors):
+            for check in checks:
+                check(value, path, errors)
+        return check_all
+
+    # --- Generic ---
+    def _ref(self, ref: str, schema: Dict) -> Check:
+        if not ref.startswith("#"):
+            raise SchemaError(f"Only local $refs are supported, got {ref!r}")
+        if ref not in self._refs:
+            # Register before compiling so recursive schemas resolve to the same cell.
+            cell: List[Check] = []
+            self._refs[ref] = cell
+            target = self.root
+            for part in filter(None, ref[1:].split("/")):
+                part = part.replace("~1", "/").replace("~0", "~")
+                try:
+                    target = target[int(part)] if isinstance(target, list) else target[part]
+                except (KeyError, IndexError, ValueError):
+                    raise SchemaError(f"Unresolvable $ref {ref!r}") from None
+            cell.append(self.compile(target))
+        cell = self._refs[ref]
+        return lambda value, path, errors: cell[0](value, path, errors)
+
+    def _type(self, expected, schema: Dict) -> Check:
+        names = [expected] if isinstance(expected, str) else list(expected)
+        unknown = [name for name in names if name not in TYPE_CHECKS]
+        if unknown:
+            raise SchemaError(f"Unknown type(s) in schema: {', '.join(unknown)}")
+        tests = [TYPE_CHECKS[name] for name in names]
+        exact = frozenset(t for name in names for t in EXACT_TYPES[name])
+        label = " or ".join(names)
+
+        def check(value, path, errors):
+            if type(value) in exact:  # fast path; the tests below catch 1.0 as "integer", subclasses, ...
+                return
+            for test in tests:
+                if test(value):
+                    return
+            errors.append((pointer(path), f"expected {label}, got {_describe(value)}"))
+        return check
+
+    def _enum(self, options, schema: Dict) -> Check:
+        # Strings and null compare by plain equality, so they can be looked up in a set.
+        hashable = frozenset(option for option in options if option is None or type(option) is str)
+
+        def check(value, path, errors):
+            if (value is None or type(value) is str) and value in hashable:
+                return
+            if not any(_equal(value, option) for option in options):
+                errors.append((pointer(path), f"{_short(value)} is not one of {_short(options)}"))
+        return check
+
+    def _const(self, expected, schema: Dict) -> Check:
+        def check(value, path, errors):
+            if not _equal(value, expected):
+                errors.append((pointer(path), f"expected {_short(expected)}"))
+        return check
+
+    # --- Combinators ---
+    def _all_of(self, subschemas, schema: Dict) -> Check:
+        checks = [self.compile(sub) for sub in subschemas]
+
+        def check(value, path, errors):
+            for sub in checks:
+                sub(value, path, errors)
+        return check
+
+    def _any_of(self, subschemas, schema: Dict) -> Check:
+        checks = [self.compile(sub) for sub in subschemas]
+
+        def check(value, path, errors):
+            for sub in checks:
+                if _passes(sub, value, path):
+                    return
+            errors.append((pointer(path), "does not match any schema in anyOf"))
+        return check
+
+    def _one_of(self, subschemas, schema: Dict) -> Check:
+        checks = [self.compile(sub) for sub in subschemas]
+
+        def check(value, path, errors):
+            matched = sum(1 for sub in checks if _passes(sub, value, path))
+            if matched != 1:
+                errors.append((pointer(path), f"matches {matched} schemas in oneOf, expected exactly 1"))
+        return check
+
+    def _not(self, subschema, schema: Dict) -> Check:
+        sub = self.compile(subschema)
+
+        def check(value, path, errors):
+            if _passes(sub, value, path):
+                errors.append((pointer(path), "must not match the 'not' schema"))
+        return check
+
+    # --- Objects ---
+    def _properties(self, properties: Dict, schema: Dict) -> Check:
+        compiled = [(name, self.compile(sub)) for name, sub in properties.items()]
+
+        def check(value, path, errors):
+            if isinstance(value, dict):
+                for name, sub in compiled:
+                    if name in value:
+                        sub(value[name], path + (name,), errors)
+        return check
+
+    def _pattern_properties(self, patterns: Dict, schema: Dict) -> Check:
+        compiled = [(re.compile(pattern), self.compile(sub)) for pattern, sub in patterns.items()]
+
+        def check(value, path, errors):
+            if isinstance(value, dict):
+                for name, item in value.items():
+                    for regex, sub in compiled:
+                        if regex.search(name):
+                            sub(item, path + (name,), errors)
+        return check
+
+    def _additional_properties(self, additional, schema: Dict) -> Check:
+        known = frozenset(schema.get("properties", {}))
+        patterns = [re.compile(p) for p in schema.get("patternProperties", {})]
+        sub = self.compile(additional)
+
+        def check(value, path, errors):
+            if isinstance(value, dict):
+                for name, item in value.items():
+                    if name in known or any(regex.search(name) for regex in patterns):
+                        continue
+                    if sub is _reject:
+                        errors.append((pointer(path), f"unexpected property {name!r}"))
+                    else:
+                        sub(item, path + (name,), errors)
+        return check
+
+    def _required(self, names: List[str], schema: Dict) -> Check:
+        def check(value, path, errors):
+            if isinstance(value, dict):
+                for name in names:
+                    if name not in value:
+                        errors.append((pointer(path), f"missing required property {name!r}"))
+        return check
+
+    # --- Arrays ---
+    def _items(self, items, schema: Dict) -> Check:
+        if isinstance(items, list):  # draft-07 tuple form
+            return self._prefix_items(items, schema)
+        sub = self.compile(items)
+        start = len(schema.get("prefixItems", []))
+
+        def check(value, path, errors):
+            if isinstance(value, list):
+                for index in range(start, len(value)):
+                    sub(value[index], path + (index,), errors)
+        return check
+
+    def _prefix_items(self, items: List, schema: Dict) -> Check:
+        compiled = [self.compile(sub) for sub in items]
+
+        def check(value, path, errors):
+            if isinstance(value, list):
+                for index, (item, sub) in enumerate(zip(value, compiled)):
+                    sub(item, path + (index,), errors)
+        return check
+
+    def _unique_items(self, unique: bool, schema: Dict) -> Check:
+        if not unique:
+            return _accept
+
+        def check(value, path, errors):
+            if isinstance(value, list):
+                seen: List = []
+                for item in value:
+                    if any(_equal(item, other) for other in seen):
+                        errors.append((pointer(path), f"duplicate item {_short(item)}"))
+                        return
+                    seen.append(item)
+        return check
+
+    # --- Strings ---
+    def _pattern(self, pattern: str, schema: Dict) -> Check:
+        regex = re.compile(pattern)
+
+        def check(value, path, errors):
+            if isinstance(value, str) and not regex.search(value):
+                errors.append((pointer(path), f"{_short(value)} does not match {pattern!r}"))
+        return check
+
+    # --- Numbers ---
+    def _multiple_of(self, factor, schema: Dict) -> Check:
+        def check(value, path, errors):
+            if TYPE_CHECKS["number"](value) and not _is_multiple(value, factor):
+                errors.append((pointer(path), f"{value} is not a multiple of {factor}"))
+        return check
+
+    @staticmethod
+    def _bound(keyword: str, applies_to: Tuple[type, ...], measure: Optional[Callable[[Any], Any]], unit: str = ""):
+        """
+        Builds min*/max*/exclusive* checks, which differ only in the value types they apply to,
+        what they measure (len() or the value itself) and how they compare.
+        """
+        compare, relation = {
+            "min": (operator.ge, "at least"),
+            "max": (operator.le, "at most"),
+            "exclusiveMin": (operator.gt, "greater than"),
+            "exclusiveMax": (operator.lt, "less than"),
+        }[next(prefix for prefix in ("exclusiveMin", "exclusiveMax", "min", "max") if keyword.startswith(prefix))]
+        types = frozenset(applies_to)
+        suffix = f" {unit}" if unit else ""
+
+        def build(compiler: "SchemaCompiler", limit, schema: Dict) -> Check:
+            if measure is None:
+                def check(value, path, errors):
+                    if type(value) in types and not compare(value, limit):
+                        errors.append((pointer(path), f"{keyword}: expected {relation} {limit}{suffix}, got {value}"))
+            else:
+                def check(value, path, errors):
+                    if type(value) in types and not compare(measure(value), limit):
+                        errors.append((pointer(path),
+                                       f"{keyword}: expected {relation} {limit}{suffix}, got {measure(value)}"))
+            return check
+        return build
+
+
+KEYWORDS: Dict[str, Callable[[SchemaCompiler, Any, Dict], Check]] = {
+    "$ref": SchemaCompiler._ref,
+    "type": SchemaCompiler._type,
+    "enum": SchemaCompiler._enum,
+    "const": SchemaCompiler._const,
+    "allOf": SchemaCompiler._all_of,
+    "anyOf": SchemaCompiler._any_of,
+    "oneOf": SchemaCompiler._one_of,
+    "not": SchemaCompiler._not,
+    "required": SchemaCompiler._required,
+    "properties": SchemaCompiler._properties,
+    "patternProperties": SchemaCompiler._pattern_properties,
+    "additionalProperties": SchemaCompiler._additional_properties,
+    "minProperties": SchemaCompiler._bound("minProperties", (dict,), len, "properties"),
+    "maxProperties": SchemaCompiler._bound("maxProperties", (dict,), len, "properties"),
+    "prefixItems": SchemaCompiler._prefix_items,
+    "items": SchemaCompiler._items,
+    "minItems": SchemaCompiler._bound("minItems", (list,), len, "items"),
+    "maxItems": SchemaCompiler._bound("maxItems", (list,), len, "items"),
+    "uniqueItems": SchemaCompiler._unique_items,
+    "minLength": SchemaCompiler._bound("minLength", (str,), len, "characters"),
+    "maxLength": SchemaCompiler._bound("maxLength", (str,), len, "characters"),
+    "pattern": SchemaCompiler._pattern,
+    "minimum": SchemaCompiler._bound("minimum", (int, float), None),
+    "maximum": SchemaCompiler._bound("maximum", (int, float), None),
+    "exclusiveMinimum": SchemaCompiler._bound("exclusiveMinimum", (int, float), None),
+    "exclusiveMaximum": SchemaCompiler._bound("exclusiveMaximum", (int, float), None),
+    "multipleOf": SchemaCompiler._multiple_of,
+}
+
+
+def _passes(check: Check, value, path) -> bool:
+    errors: Errors = []
+    check(value, path, errors)
+    return not errors
+
+
+def _is_multiple(value, factor) -> bool:
+    if type(value) is int and type(factor) is int:
+        return value % factor == 0
+    try:
+        quotient = value / factor
+        return math.isclose(quotient, round(quotient), rel_tol=0, abs_tol=1e-9)
+    except OverflowError:  # the quotient (1e308 / 0.01) or the value itself (10**400) is beyond float range
+        try:
+            return math.isclose(math.remainder(value, factor), 0, rel_tol=0, abs_tol=1e-9)
+        except OverflowError:
+            return Fraction(value) % Fraction(factor) == 0
+
+
+def _describe(value) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if TYPE_CHECKS[name](value):
+            return name
+    return type(value).__name__
+
+
+def _short(value, limit: int = 40) -> str:
+    text = json.dumps(value, default=str)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+# === Compiled Schema Cache ===
+class CompiledSchema:
+    """A schema compiled once; `errors(value)` lists (json-pointer, message) violations."""
+
+    def __init__(self, schema: Any, digest: str = ""):
+        self.schema = schema
+        self.digest = digest
+        self._check = SchemaCompiler(schema).compile(schema)
+
+    def errors(self, value: Any) -> Errors:
+        found: Errors = []
+        self._check(value, (), found)
+        return found
+
+    def is_valid(self, value: Any) -> bool:
+        return not self.errors(value)
+
+
+@lru_cache(maxsize=32)
+def _compiled(path: str, mtime_ns: int, size: int) -> CompiledSchema:
+    from cache import file_digest
+
+    text = Path(path).read_text()
+    schema = json.loads(text) if not path.endswith((".yaml", ".yml")) else _load_yaml(text)
+    return CompiledSchema(schema, file_digest(path))
+
+
+def _load_yaml(text: str) -> Any:
+    import yaml
+    return yaml.safe_load(text)
+
+
+def load_schema(path: str) -> CompiledSchema:
+    """
+    Loads and compiles a JSON (or YAML) schema file. Compiled schemas are memoized per
+    (path, mtime, size), so every file validated in a run, and every run served by a
+    resident `qwnt serve` process, reuses the same compiled closures until the file changes.
+    The closures cannot be written to disk, so separate CLI processes each compile once.
+    """
+    resolved = os.path.abspath(path)
+    stat = os.stat(resolved)
+    return _compiled(resolved, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,325 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+import hmac
+import io
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+DEFAULT_SOCKET = os.environ.get(
+    "QUILL_SOCKET", str(Path(tempfile.gettempdir()) / f"qwnt-{os.getuid() if hasattr(os, 'getuid') else 'user'}.sock")
+)
+
+
+TOKEN_FILE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "qwnt" / "server-token"
+
+
+def server_address(socket_path: Optional[str] = None, port: Optional[int] = None):
+    """A Unix socket path, or ("127.0.0.1", port) when a port is given or AF_UNIX is unavailable."""
+    port = port or (int(os.environ["QUILL_PORT"]) if os.environ.get("QUILL_PORT") else None)
+    if port or not hasattr(socket, "AF_UNIX"):
+        return ("127.0.0.1", port or 8765)
+    return socket_path or DEFAULT_SOCKET
+
+
+# === TCP Authentication ===
+def write_token(path: Optional[Path] = None) -> str:
+    """Creates a fresh shared secret readable only by the current user (0600)."""
+    path = path or TOKEN_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_hex(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.chmod(path, 0o600)
+    return token
+
+
+def read_token(path: Optional[Path] = None) -> Optional[str]:
+    try:
+        return (path or TOKEN_FILE).read_text().strip() or None
+    except OSError:
+        return None
+
+
+# === Per-Request Output Capture ===
+class _RequestSinks:
+    """
+    Maps threads to the output buffer of the request they work for. A thread serving a request
+    captures into its buffer; threads started while it runs (engine pools, tool output pumps)
+    inherit that buffer for as long as the request is still active, then fall back.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._active: Set[int] = set()
+        self._lock = threading.Lock()
+        self._original_start: Any = None
+
+    def capture(self, buffer: Optional[io.StringIO]) -> None:
+        previous = getattr(self._local, "buffer", None)
+        with self._lock:
+            if previous is not None:
+                self._active.discard(id(previous))
+            if buffer is not None:
+                self._active.add(id(buffer))
+        self._local.buffer = buffer
+
+    def current(self) -> Optional[io.StringIO]:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = getattr(threading.current_thread(), "_qwnt_sink", None)
+        return buffer if buffer is not None and id(buffer) in self._active else None
+
+    def install(self) -> None:
+        """Makes every thread remember the sink of the thread that started it."""
+        if self._original_start is not None:
+            return
+        original = self._original_start = threading.Thread.start
+        sinks = self
+
+        def start(thread: threading.Thread) -> None:
+            thread._qwnt_sink = sinks.current()  # type: ignore[attr-defined]
+            original(thread)
+
+        setattr(threading.Thread, "start", start)
+
+    def uninstall(self) -> None:
+        if self._original_start is not None:
+            setattr(threading.Thread, "start", self._original_start)
+            self._original_start = None
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Routes writes to the current request's buffer, else to the real stream."""
+
+    def __init__(self, fallback, sinks: _RequestSinks):
+        self._fallback = fallback
+        self._sinks = sinks
+
+    def write(self, text: str) -> int:
+        return (self._sinks.current() or self._fallback).write(text)
+
+    def flush(self) -> None:
+        (self._sinks.current() or self._fallback).flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _CwdGate:
+    """
+    The engines resolve relative paths against the process cwd, so requests from the same
+    directory may run together, while a request from another directory waits for them to drain.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._cwd: Optional[str] = None
+        self._active = 0
+
+    def enter(self, cwd: str) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._active == 0 or self._cwd == cwd)
+            if self._cwd != cwd:
+                os.chdir(cwd)
+                self._cwd = cwd
+            self._active += 1
+
+    def leave(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+
+# === Qwnt Daemon ===
+class QwntServer:
+    """
+    Long-running local server that keeps the CLI's engines resident and runs forwarded
+    Typer commands on a bounded pool of worker threads fed by a request queue.
+    """
+
+    def __init__(self, address=None, max_concurrency: int = 4, max_queue: int = 64):
+        self.address = address or server_address()
+        self.max_concurrency = max_concurrency
+        self.requests: "queue.Queue[Optional[Tuple[socket.socket, Dict, threading.Event]]]" = queue.Queue(
+            maxsize=max_queue
+        )
+        self.served = 0
+        self._gate = _CwdGate()
+        self._sinks = _RequestSinks()
+        self._streams: Optional[Tuple[Any, Any]] = None  # the real stdout/stderr while serving
+        self._start_method: Optional[str] = None
+        self._token: Optional[str] = None
+        self._server: Optional[socketserver.BaseServer] = None
+        self._workers: List[threading.Thread] = []
+        self._command: Any = None
+
+    def warm(self) -> None:
+        """Imports every command module and builds the reusable engines once."""
+        import typer.main
+        import main
+        import codegen
+        import mentor
+        import translate
+        import visualizer
+        import debugger  # noqa: F401
+        import deploy  # noqa: F401
+        import uigen  # noqa: F401
+        import validate  # noqa: F401
+
+        self._command = typer.main.get_command(main.app)
+        mentor.shared_mentor()
+        visualizer.shared_visualizer()
+        codegen.shared_sampler(codegen.build_cache(True), None, None)
+        translate.shared_translator("javascript", "python")
+
+    def start(self) -> None:
+        self.warm()
+        # Forking a multi-threaded daemon can deadlock the child on locks held by other
+        # threads, so process pools started by the engines use spawn instead.
+        self._start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method("spawn", force=True)
+        self._streams = (sys.stdout, sys.stderr)
+        sys.stdout = _ThreadLocalStream(sys.stdout, self._sinks)
+        sys.stderr = _ThreadLocalStream(sys.stderr, self._sinks)
+        self._sinks.install()
+
+        outer = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    _reply(self.connection, {"exit_code": 2, "output": "✖ Malformed request.\n"})
+                    return
+                if outer._token is not None and not hmac.compare_digest(str(request.get("token", "")), outer._token):
+                    _reply(self.connection, {"exit_code": 77, "output": "✖ Missing or invalid server token.\n"})
+                    return
+                done = threading.Event()
+                try:
+                    outer.requests.put_nowait((self.connection, request, done))
+                except queue.Full:
+                    _reply(self.connection, {"exit_code": 75, "output": "✖ Server busy, try again.\n"})
+                    return
+                # Keep the connection open until a worker has replied.
+                done.wait()
+
+        server_cls: Type[socketserver.TCPServer]
+        if isinstance(self.address, tuple):
+            # Anyone on the machine can reach a loopback port, so TCP requests must carry the
+            # token from TOKEN_FILE, which only this user can read.
+            self._token = write_token()
+            server_cls = socketserver.ThreadingTCPServer
+        else:
+            server_cls = socketserver.ThreadingUnixStreamServer
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+        server_cls.daemon_threads = True  # type: ignore[attr-defined]
+        server_cls.allow_reuse_address = True
+        self._server = server_cls(self.address, Handler)
+        if not isinstance(self.address, tuple):
+            os.chmod(self.address, 0o600)
+
+        for i in range(self.max_concurrency):
+            worker = threading.Thread(target=self._work, name=f"qwnt-server-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        assert self._server is not None
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            if not isinstance(self.address, tuple) and os.path.exists(self.address):
+                os.unlink(self.address)
+        for _ in self._workers:
+            self.requests.put(None)
+        self._workers = []
+        self._sinks.uninstall()
+        if self._streams is not None:
+            sys.stdout, sys.stderr = self._streams
+            self._streams = None
+            multiprocessing.set_start_method(self._start_method, force=True)
+
+    def _work(self) -> None:
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            connection, request, done = item
+            try:
+                _reply(connection, self.execute(request.get("argv", []), request.get("cwd") or os.getcwd()))
+            except OSError:
+                pass  # client went away
+            finally:
+                done.set()
+
+    def execute(self, argv: List[str], cwd: str) -> Dict:
+        buffer = io.StringIO()
+        self._sinks.capture(buffer)
+        start = time.perf_counter()
+        exit_code = 0
+        self._gate.enter(cwd)
+        try:
+            self._command.main(args=argv, prog_name="qwnt", standalone_mode=True)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            buffer.write(f"✖ {type(e).__name__}: {e}\n")
+            exit_code = 1
+        finally:
+            self._gate.leave()
+            self._sinks.capture(None)
+        self.served += 1
+        return {"exit_code": exit_code, "output": buffer.getvalue(),
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+
+def _reply(connection: socket.socket, response: Dict) -> None:
+    connection.sendall((json.dumps(response) + "\n").encode())
+
+
+# === Thin Client ===
+def forward(argv: List[str], address=None, timeout: Optional[float] = None) -> Optional[Dict]:
+    """
+    Sends one command to a running server; returns None if no server is listening. A timeout
+    after the command was sent is reported as exit code 124 rather than None, so callers do
+    not run the command a second time in-process.
+    """
+    address = address or server_address()
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    request: Dict[str, Any] = {"argv": argv, "cwd": os.getcwd()}
+    if isinstance(address, tuple):
+        request["token"] = read_token()
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+            return None
+        try:
+            sock.sendall((json.dumps(request) + "\n").encode())
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        except socket.timeout:
+            return {"exit_code": 124, "output": f"✖ No reply from the server within {timeout}s.\n"}
+    return json.loads(line) if line else None
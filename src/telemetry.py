@@ -0,0 +1,324 @@
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+import time
+
+# Kept free of rich/engine imports: every engine imports this module, and the CLI only
+# switches it on when --metrics or --profile is given.
+
+LabelSet = Tuple[Tuple[str, str], ...]
+METRIC_PREFIX = "qwnt"
+
+
+def _labels(labels: Dict[str, Any]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{METRIC_PREFIX}_{name}")
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region; attributes set while it is open end up in the Chrome trace."""
+
+    __slots__ = ("telemetry", "name", "attrs", "start", "memory")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.memory = 0
+
+    def __enter__(self) -> "Span":
+        if self.telemetry.track_memory:
+            import tracemalloc
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.perf_counter()
+        if self.telemetry.track_memory:
+            import tracemalloc
+            self.attrs["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - self.memory
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.telemetry._record_span(self, end)
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+# === Recorder ===
+class Telemetry:
+    """
+    Process-wide span and counter recorder. Disabled by default, in which case `span()` hands
+    back a shared no-op and `count()` returns immediately. Span durations are aggregated per
+    name for Prometheus; the individual spans (up to `max_events`) feed the Chrome trace.
+    """
+
+    def __init__(self, max_events: int = 200_000):
+        self.enabled = False
+        self.track_memory = False
+        self._lock = threading.Lock()
+        self._events: "deque[Dict]" = deque(maxlen=max_events)
+        self._durations: Dict[str, List[float]] = {}  # name -> [count, sum_s, max_s]
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._origin = time.perf_counter()
+        self._profiler: Any = None
+
+    def span(self, name: str, **attrs) -> Any:
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            total = self._counters[key] = self._counters.get(key, 0) + value
+            self._events.append({"name": name, "ph": "C", "ts": self._now_us(), "pid": os.getpid(),
+                                 "args": {",".join(f"{k}={v}" for k, v in key[1]) or name: total}})
+
+    def _record_span(self, span: Span, end: float) -> None:
+        elapsed = end - span.start
+        event = {"name": span.name, "cat": span.name.split(".", 1)[0], "ph": "X",
+                 "ts": round((span.start - self._origin) * 1e6, 3), "dur": round(elapsed * 1e6, 3),
+                 "pid": os.getpid(), "tid": threading.get_ident(), "args": span.attrs}
+        with self._lock:
+            stats = self._durations.setdefault(span.name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            self._events.append(event)
+
+    def _now_us(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1e6, 3)
+
+    def start(self, profile: bool = False) -> bool:
+        """
+        Starts recording; with `profile`, also tracemalloc (per-span allocations and the peak)
+        and cProfile for the calling thread. Returns False if recording was already on.
+        """
+        with self._lock:
+            if self.enabled:
+                return False
+            self.enabled = True
+        if profile:
+            import cProfile
+            import tracemalloc
+            tracemalloc.start()
+            self.track_memory = True
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return True
+
+    def stop(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.track_memory:
+            import tracemalloc
+            self._counters[("memory_peak_bytes", ())] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.track_memory = False
+        self.enabled = False
+
+    def drain(self) -> Dict[str, Any]:
+        """Takes everything recorded so far (leaving the recorder empty), to be `merge`d elsewhere."""
+        with self._lock:
+            drained = {"origin": self._origin, "events": list(self._events), "durations": self._durations,
+                       "counters": list(self._counters.items())}
+            self._events.clear()
+            self._durations = {}
+            self._counters = {}
+        return drained
+
+    def merge(self, drained: Dict[str, Any]) -> None:
+        """Adds spans and counters drained from another recorder, e.g. in a worker process."""
+        shift = (drained["origin"] - self._origin) * 1e6  # perf_counter is system-wide, origins are not
+        with self._lock:
+            for event in drained["events"]:
+                self._events.append(dict(event, ts=round(event["ts"] + shift, 3)))
+            for name, (calls, total, longest) in drained["durations"].items():
+                stats = self._durations.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += calls
+                stats[1] += total
+                stats[2] = max(stats[2], longest)
+            for key, value in drained["counters"]:
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def _after_fork_in_child(self) -> None:
+        """A forked worker starts empty: the parent still holds (and exports) what it recorded."""
+        self._lock = threading.Lock()
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.track_memory:
+            import tracemalloc
+            tracemalloc.stop()
+            self.track_memory = False
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._durations.clear()
+            self._counters.clear()
+            self._origin = time.perf_counter()
+            self._profiler = None
+
+    # === Exporters ===
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition: a summary per span name and one series per counter."""
+        with self._lock:
+            durations = sorted(self._durations.items())
+            counters = sorted(self._counters.items())
+        lines = [f"# HELP {METRIC_PREFIX}_span_seconds Time spent inside instrumented spans.",
+                 f"# TYPE {METRIC_PREFIX}_span_seconds summary"]
+        for name, (calls, total, _) in durations:
+            series = _format_labels((("span", name),))
+            lines += [f"{METRIC_PREFIX}_span_seconds_count{series} {calls}",
+                      f"{METRIC_PREFIX}_span_seconds_sum{series} {total:.6f}"]
+        lines += [f"# HELP {METRIC_PREFIX}_span_max_seconds Longest single span.",
+                  f"# TYPE {METRIC_PREFIX}_span_max_seconds gauge"]
+        lines += [f"{METRIC_PREFIX}_span_max_seconds{_format_labels((('span', name),))} {longest:.6f}"
+                  for name, (_, _, longest) in durations]
+
+        typed = set()
+        for (name, labels), value in counters:
+            gauge = name.endswith("_bytes") and name.startswith("memory")
+            metric = _metric_name(name) if gauge else _metric_name(f"{name}_total")
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} {'gauge' if gauge else 'counter'}")
+            lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_chrome_trace(self) -> Dict:
+        """Trace Event Format; open in chrome://tracing or Perfetto."""
+        with self._lock:
+            events = list(self._events)
+        threads = {(event["pid"], event["tid"]) for event in events if "tid" in event}
+        main = (os.getpid(), threading.main_thread().ident)
+        names = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                  "args": {"name": "main" if (pid, tid) == main else f"worker-{tid}"}}
+                 for pid, tid in sorted(threads)]
+        return {"traceEvents": names + events, "displayTimeUnit": "ms"}
+
+    def export(self, output_dir: str = "quill_reports") -> Dict[str, Path]:
+        """Writes metrics.prom and trace.json (and profile.pstats when profiling) into `output_dir`."""
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        written = {"prometheus": out / "metrics.prom", "trace": out / "trace.json"}
+        _write_atomic(written["prometheus"], self.to_prometheus())
+        _write_atomic(written["trace"], json.dumps(self.to_chrome_trace(), default=str))
+        if self._profiler is not None:
+            written["profile"] = out / "profile.pstats"
+            self._profiler.dump_stats(str(written["profile"]))
+        return written
+
+    def summary(self, limit: int = 10) -> List[Tuple[str, int, float, float]]:
+        """(span, calls, total s, max s) for the spans with the most total time."""
+        with self._lock:
+            rows = [(name, int(calls), total, longest) for name, (calls, total, longest) in self._durations.items()]
+        return sorted(rows, key=lambda row: -row[2])[:limit]
+
+
+# === Worker Processes ===
+class WorkerJob:
+    """
+    Wraps a process-pool job so spans and counters it records in the worker travel back with
+    its result: the job returns (result, drained metrics) and the parent passes that to
+    `collect`. Only spans and counters are gathered; --profile's tracemalloc and cProfile
+    data cover the parent process alone.
+    """
+
+    def __init__(self, fn: Callable[..., Any], enabled: bool):
+        self.fn = fn
+        self.enabled = enabled
+
+    def __call__(self, *args, **kwargs) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        if not self.enabled:
+            return self.fn(*args, **kwargs), None
+        TELEMETRY.start()  # no-op once on; pool workers are reused
+        return self.fn(*args, **kwargs), TELEMETRY.drain()
+
+
+def worker_job(fn: Callable[..., Any]) -> WorkerJob:
+    """`fn` (a module-level function) made to report its metrics when recording is on."""
+    return WorkerJob(fn, TELEMETRY.enabled)
+
+
+def collect(outcome: Tuple[Any, Optional[Dict[str, Any]]]) -> Any:
+    """Merges a `WorkerJob` outcome's metrics into this process and returns the job's result."""
+    result, drained = outcome
+    if drained is not None:
+        TELEMETRY.merge(drained)
+    return result
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+    partial.write_text(text)
+    os.replace(partial, path)
+
+
+TELEMETRY = Telemetry()
+span = TELEMETRY.span
+count = TELEMETRY.count
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=TELEMETRY._after_fork_in_child)
+
+
+# === CLI Entry ===
+def finish(output_dir: str = "quill_reports") -> None:
+    """Stops recording, writes the exports and prints where the time went."""
+    from rich import print
+    from rich.console import Console
+    from rich.markup import escape
+
+    TELEMETRY.stop()
+    written = TELEMETRY.export(output_dir)
+    rows = TELEMETRY.summary()
+    if rows:
+        print("\n[bold cyan]📈 Hot spans:[/bold cyan]")
+        for name, calls, total, longest in rows:
+            print(f"  {name:<28} {calls:>6}× total {total * 1000:>10.2f} ms  max {longest * 1000:>9.2f} ms")
+    if "profile" in written:
+        import io
+        import pstats
+        report = io.StringIO()
+        pstats.Stats(str(written["profile"]), stream=report).sort_stats("cumulative").print_stats(15)
+        Console(soft_wrap=True).print(f"[dim]{escape(report.getvalue().strip())}[/dim]")
+    for kind, path in written.items():
+        print(f"[green]✔ {kind} written to:[/green] {path}")
@@ -0,0 +1,284 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterator, List, Optional
+from contextlib import contextmanager
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_MAX_OUTPUT = 4 << 20  # bytes kept per stream; the rest is counted and dropped
+DEFAULT_TIMEOUT = 300.0
+READ_CHUNK = 64 * 1024  # longest piece of a line held in memory; `on_line` sees at most this much
+KILL_SIGNAL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+
+class ToolNotFoundError(FileNotFoundError):
+    """Raised when a command's executable is not on PATH."""
+
+
+class ToolResult:
+    """Outcome of one command. Output beyond the runner's cap is dropped and flagged in `truncated`."""
+
+    def __init__(self, command: List[str], returncode: int, stdout: str = "", stderr: str = "",
+                 elapsed_s: float = 0.0, cpu_user_s: float = 0.0, cpu_sys_s: float = 0.0,
+                 timed_out: bool = False, truncated: bool = False):
+        self.command = command
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.elapsed_s = elapsed_s
+        self.cpu_user_s = cpu_user_s
+        self.cpu_sys_s = cpu_sys_s
+        self.timed_out = timed_out
+        self.truncated = truncated
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+# === Tool Resolution ===
+@lru_cache(maxsize=256)
+def resolve_tool(name: str, path: Optional[str] = None) -> Optional[str]:
+    """Absolute path of `name` on PATH (or `path`), cached per process; None when missing."""
+    return shutil.which(name, path=path)
+
+
+@lru_cache(maxsize=256)
+def _probe_version(executable: str, mtime_ns: int) -> Optional[str]:
+    try:
+        result = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0].strip() if lines else None
+
+
+def tool_version(name: str) -> Optional[str]:
+    """First line of `name --version`, probed once per installed binary (path + mtime)."""
+    executable = resolve_tool(name, os.environ.get("PATH"))
+    if executable is None:
+        return None
+    try:
+        mtime_ns = os.stat(executable).st_mtime_ns
+    except OSError:
+        return None
+    return _probe_version(executable, mtime_ns)
+
+
+def clear_tool_cache() -> None:
+    resolve_tool.cache_clear()
+    _probe_version.cache_clear()
+
+
+# === Output Capture ===
+class _CappedBuffer:
+    """Collects a stream line by line, keeping at most `limit` bytes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: List[bytes] = []
+        self.size = 0
+        self.dropped = 0
+
+    def add(self, data: bytes) -> None:
+        room = self.limit - self.size
+        if room <= 0:
+            self.dropped += len(data)
+            return
+        if len(data) > room:
+            self.dropped += len(data) - room
+            data = data[:room]
+        self.parts.append(data)
+        self.size += len(data)
+
+    def text(self) -> str:
+        return b"".join(self.parts).decode("utf-8", errors="replace")
+
+
+def _pump(stream: IO[bytes], buffer: _CappedBuffer, on_line: Optional[Callable[[str], None]]) -> None:
+    """Reads at most READ_CHUNK bytes at a time, so a newline-free flood stays within the cap."""
+    with stream:
+        head = b""  # first chunk of a line that has not ended yet; the rest only goes to `buffer`
+        for chunk in iter(lambda: stream.readline(READ_CHUNK), b""):
+            buffer.add(chunk)
+            if on_line is None:
+                continue
+            if not chunk.endswith(b"\n"):
+                head = head or chunk
+                continue
+            on_line((head or chunk).decode("utf-8", errors="replace").rstrip("\r\n"))
+            head = b""
+        if on_line is not None and head:
+            on_line(head.decode("utf-8", errors="replace").rstrip("\r"))
+
+
+# === Tool Runner ===
+class ToolRunner:
+    """
+    Runs external tools with at most `max_processes` alive at once. Every command gets a
+    timeout (after which its whole process group is killed) and output capped at
+    `max_output_bytes` per stream, optionally streamed line by line through `on_line`.
+    """
+
+    def __init__(self, max_processes: Optional[int] = None, default_timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 max_output_bytes: int = DEFAULT_MAX_OUTPUT):
+        self.max_processes = max_processes or os.cpu_count() or 4
+        self.default_timeout = default_timeout
+        self.max_output_bytes = max_output_bytes
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def run(self, command: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None,
+            on_line: Optional[Callable[[str], None]] = None, merge_stderr: bool = False,
+            on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+            env: Optional[Dict[str, str]] = None) -> ToolResult:
+        """
+        Runs `command` to completion. Raises ToolNotFoundError if the executable is missing.
+        `on_start` receives the Popen right after launch (e.g. to register it for cancellation).
+        """
+        search_path = (env or os.environ).get("PATH")
+        executable = command[0] if os.sep in command[0] else resolve_tool(command[0], search_path)
+        if executable is None:
+            raise ToolNotFoundError(f"Tool not found: {command[0]}")
+        timeout = self.default_timeout if timeout is None else timeout
+
+        with self._slots:
+            start = time.perf_counter()
+            proc = subprocess.Popen([executable] + command[1:], cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+                                    start_new_session=os.name == "posix")
+            if on_start is not None:
+                on_start(proc)
+            out, err = _CappedBuffer(self.max_output_bytes), _CappedBuffer(self.max_output_bytes)
+            readers = [threading.Thread(target=_pump, args=(proc.stdout, out, on_line), daemon=True)]
+            if not merge_stderr:
+                readers.append(threading.Thread(target=_pump, args=(proc.stderr, err, on_line), daemon=True))
+            for reader in readers:
+                reader.start()
+
+            deadline = None if timeout is None else start + timeout
+            returncode, user, system, timed_out = self._wait(proc, readers, deadline)
+            for reader in readers:
+                reader.join()
+            elapsed = time.perf_counter() - start
+
+        return ToolResult(command, returncode, out.text(), err.text(), round(elapsed, 4), round(user, 4),
+                          round(system, 4), timed_out, truncated=bool(out.dropped or err.dropped))
+
+    def _wait(self, proc: subprocess.Popen, readers: List[threading.Thread], deadline: Optional[float]):
+        """Waits for output EOF and exit, killing the process group at `deadline`; returns rusage when available."""
+        for reader in readers:
+            reader.join(None if deadline is None else max(deadline - time.perf_counter(), 0))
+        timed_out = any(reader.is_alive() for reader in readers)
+        if not hasattr(os, "wait4"):
+            try:
+                if timed_out:
+                    raise subprocess.TimeoutExpired(proc.args, 0)
+                return proc.wait(None if deadline is None else max(deadline - time.perf_counter(), 0)), 0.0, 0.0, False
+            except subprocess.TimeoutExpired:
+                self.kill(proc)
+                return proc.wait(), 0.0, 0.0, True
+
+        delay = 0.0005
+        while True:
+            if timed_out:
+                self.kill(proc)
+                _, status, usage = os.wait4(proc.pid, 0)
+                break
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                timed_out = True
+                continue
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return proc.returncode, usage.ru_utime, usage.ru_stime, timed_out
+
+    @staticmethod
+    def kill(proc: subprocess.Popen, sig: int = KILL_SIGNAL) -> None:
+        """Signals the command and everything it spawned, unless it has already been reaped."""
+        if proc.returncode is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, sig)
+            else:
+                proc.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def submit(self, command: List[str], **kwargs) -> "Future[ToolResult]":
+        """Runs `command` on the runner's thread pool; the process cap still applies."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_processes, thread_name_prefix="tool")
+        return self._executor.submit(self.run, command, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def shared_runner() -> ToolRunner:
+    """One runner per process, so every engine shares the same process cap."""
+    return ToolRunner()
+
+
+# === Fake Tools (offline testing) ===
+class FakeTool:
+    """An executable stand-in that prints canned output, optionally sleeps, and exits with `returncode`."""
+
+    def __init__(self, stdout: str = "", stderr: str = "", returncode: int = 0, sleep: float = 0.0,
+                 version: str = "fake 1.0"):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = returncode
+        self.sleep = sleep
+        self.version = version
+
+    def script(self, calls_log: Path) -> str:
+        spec = json.dumps(vars(self))
+        return (f"#!{sys.executable}\n"
+                "import json, sys, time\n"
+                f"spec = json.loads({spec!r})\n"
+                f"with open({str(calls_log)!r}, 'a') as log:\n"
+                "    log.write(json.dumps(sys.argv[1:]) + '\\n')\n"
+                "if sys.argv[1:] == ['--version']:\n"
+                "    print(spec['version']); sys.exit(0)\n"
+                "time.sleep(spec['sleep'])\n"
+                "sys.stdout.write(spec['stdout']); sys.stderr.write(spec['stderr'])\n"
+                "sys.exit(spec['returncode'])\n")
+
+
+@contextmanager
+def fake_tools(directory: Path, tools: Dict[str, FakeTool]) -> Iterator[Path]:
+    """
+    Installs `tools` as executables in `directory`, puts it first on PATH and yields the
+    log file recording each call's arguments (one JSON list per line). Tool caches are
+    cleared on entry and exit so real tools are not shadowed afterwards.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    calls_log = directory / "calls.jsonl"
+    for name, tool in tools.items():
+        path = directory / name
+        path.write_text(tool.script(calls_log))
+        path.chmod(0o755)
+    previous = os.environ.get("PATH", "")
+    os.environ["PATH"] = f"{directory}{os.pathsep}{previous}"
+    clear_tool_cache()
+    try:
+        yield calls_log
+    finally:
+        os.environ["PATH"] = previous
+        clear_tool_cache()
@@ -1,8 +1,18 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 from rich import print
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
 import difflib
+import glob
+import itertools
+import json
 import os
+import re
+import time
+from cache import file_digest
+from telemetry import collect, count, span, worker_job
 
 # === Supported Language Mapping (Canonicalized) ===
 LANGUAGE_MAP = {
@@ -53,7 +63,7 @@ LANGUAGE_MAP = {
     "nim": "nim",
     "zig": "zig",
     "vala": "vala",
-    "nimrod": "nimrod",
+    "nimrod": "nim",
     "tcl": "tcl",
     "coffeescript": "coffeescript",
     "ocaml": "ocaml",
@@ -67,39 +77,368 @@ LANGUAGE_MAP = {
     "rexx": "rexx"
 }
 
+# === Language Index (alias -> canonical -> preferred extension) ===
+# Aliases and extensions not already covered by LANGUAGE_MAP keys.
+EXTRA_ALIASES = {
+    "python3": "python", "pyw": "python", "pyi": "python",
+    "node": "javascript", "mjs": "javascript", "cjs": "javascript",
+    "mts": "typescript", "cts": "typescript",
+    "h": "c", "c++": "cpp", "cc": "cpp", "cxx": "cpp", "hpp": "cpp", "hh": "cpp",
+    "c#": "csharp", "kts": "kotlin", "yml": "yaml", "htm": "html",
+    "ex": "elixir", "exs": "elixir", "hs": "haskell", "coffee": "coffeescript",
+    "ps1": "powershell", "pm": "perl", "ml": "ocaml", "bash": "bash", "zsh": "bash",
+    "hrl": "erlang", "f": "fortran", "f95": "fortran", "s": "assembly", "cmd": "batch",
+}
+
+# Canonical languages whose LANGUAGE_MAP key is a name rather than a file extension.
+# Each must resolve back to its language: "pl" already means Prolog, so Perl gets "pm".
+PREFERRED_EXTENSIONS = {
+    "elixir": "ex", "haskell": "hs", "coffeescript": "coffee", "powershell": "ps1",
+    "perl": "pm", "ocaml": "ml", "tcl": "tcl",
+}
+
+
+def _build_language_index() -> Tuple[Mapping[str, str], Mapping[str, str]]:
+    aliases: Dict[str, str] = {}
+    extensions: Dict[str, str] = {}
+    for short, canonical in LANGUAGE_MAP.items():
+        aliases.setdefault(short, canonical)
+        aliases.setdefault(canonical, canonical)
+        extensions.setdefault(canonical, PREFERRED_EXTENSIONS.get(canonical, short))
+    for alias, canonical in EXTRA_ALIASES.items():
+        aliases.setdefault(alias, canonical)
+    return MappingProxyType(aliases), MappingProxyType(extensions)
+
+
+# Built once at import; read-only afterwards.
+LANGUAGE_ALIASES, LANGUAGE_EXTENSIONS = _build_language_index()
+
+
+def resolve_language(name: str) -> str:
+    """Canonical language name for a short code, alias, extension or name (case-insensitive)."""
+    key = name.lower().lstrip(".")
+    return LANGUAGE_ALIASES.get(key, key)
+
+
+def extension_for(language: str) -> str:
+    """Preferred file extension (without the dot) for any alias of a language."""
+    canonical = resolve_language(language)
+    return LANGUAGE_EXTENSIONS.get(canonical, canonical)
+
+
+def language_for_path(path: Path) -> Optional[str]:
+    """Canonical language implied by a file's extension, if it is a known one."""
+    return LANGUAGE_ALIASES.get(path.suffix.lower().lstrip(".")) if path.suffix else None
+
+
+DETECT_SAMPLE_BYTES = 4096
+
+SHEBANGS = {"python": "python", "node": "javascript", "bash": "bash", "sh": "bash", "zsh": "bash",
+            "ruby": "ruby", "perl": "perl", "php": "php", "lua": "lua", "Rscript": "r"}
+
+CONTENT_SIGNATURES = {
+    "python": re.compile(r"^(?:def \w+\(.*\)(?: -> .+)?:|class \w+(?:\(.*\))?:|from [\w.]+ import |import \w+$|if __name__ == )", re.M),
+    "javascript": re.compile(r"(?:^function \w+\(|console\.log\(|require\(['\"]|=>\s*\{|^(?:const|let|var) \w+ = )", re.M),
+    "typescript": re.compile(r"(?:^interface \w+|: (?:string|number|boolean)\b|^export type )", re.M),
+    "golang": re.compile(r"(?:^package \w+$|^func (?:\(\w+ \*?\w+\) )?\w+\()", re.M),
+    "rust": re.compile(r"(?:^(?:pub )?fn \w+|let mut |^use \w+::|^impl\b)", re.M),
+    "java": re.compile(r"(?:^public (?:final )?class \w+|System\.out\.println|^import java\.)", re.M),
+    "cpp": re.compile(r"(?:#include <\w+>$|std::|^namespace \w+|^template ?<)", re.M),
+    "c": re.compile(r"(?:#include <\w+\.h>|^int main\(|printf\()", re.M),
+    "ruby": re.compile(r"(?:^require ['\"]|^\s*end$|^def \w+[^:]*$|puts )", re.M),
+    "php": re.compile(r"<\?php"),
+    "html": re.compile(r"<!DOCTYPE html|<html[\s>]", re.I),
+    "xml": re.compile(r"^<\?xml "),
+    "bash": re.compile(r"(?:^\s*fi$|^\s*done$|\$\{\w+\}|^echo )", re.M),
+}
+
+
+@lru_cache(maxsize=4096)
+def _detect_cached(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    with open(path, "rb") as f:
+        head = f.read(DETECT_SAMPLE_BYTES).decode("utf-8", errors="ignore")
+    if head.startswith("#!"):
+        interpreter = head.split("\n", 1)[0].split("/")[-1].split()
+        name = interpreter[-1] if interpreter and interpreter[0] == "env" else (interpreter or [""])[0]
+        for prefix, language in SHEBANGS.items():
+            if name.startswith(prefix):
+                return language
+    stripped = head.lstrip()
+    if stripped[:1] in "{[" and stripped:
+        return "json"
+    scores = {lang: len(pattern.findall(head)) for lang, pattern in CONTENT_SIGNATURES.items()}
+    best = max(scores, key=lambda lang: scores[lang])
+    return best if scores[best] else None
+
+
+def detect_language(path: Path) -> Optional[str]:
+    """
+    Language of a file from its extension, falling back to the first few KB of content.
+    Results are memoized per (path, mtime, size), so unchanged files are never rescanned.
+    """
+    by_extension = language_for_path(path)
+    if by_extension:
+        return by_extension
+    stat = path.stat()
+    return _detect_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+# Files larger than this are translated in streaming mode automatically.
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Upper bound on the characters held in one chunk (and read in one go from a single line).
+MAX_CHUNK_CHARS = 1 << 20
+
+# A non-indented line opening a definition starts a new top-level chunk.
+TOP_LEVEL_DEFINITION = re.compile(
+    r"^(?:export\s+|pub(?:\(\w+\))?\s+|public\s+|private\s+|static\s+|async\s+|default\s+)*"
+    r"(?:(?:def|class|function|fn|func|fun|struct|enum|impl|trait|interface|module|const|let|var|type)\b|@)"
+)
+
+
+def iter_chunks(lines: Iterable[str], max_chunk_lines: int = 2000,
+                max_chunk_chars: int = MAX_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Groups source lines into chunks split at top-level definition boundaries.
+    Chunks are also capped at `max_chunk_lines` lines and `max_chunk_chars` characters, and a
+    single line longer than that is split, so no one chunk has to hold a huge block or line.
+    """
+    chunk: list = []
+    size = 0
+    for line in lines:
+        # Only a piece that starts a physical line can start a definition.
+        at_line_start = not chunk or chunk[-1].endswith("\n")
+        # Decorators stay attached to the definition that follows them.
+        boundary = chunk and at_line_start and TOP_LEVEL_DEFINITION.match(line) and not chunk[-1].startswith("@")
+        if boundary or len(chunk) >= max_chunk_lines or (chunk and size + len(line) > max_chunk_chars):
+            yield "".join(chunk)
+            chunk, size = [], 0
+        while len(line) > max_chunk_chars:
+            yield line[:max_chunk_chars]
+            line = line[max_chunk_chars:]
+        chunk.append(line)
+        size += len(line)
+    if chunk:
+        yield "".join(chunk)
+
+
 # === Translator Engine ===
 class XLangTranslator:
     def __init__(self, source_lang: str, target_lang: str):
-        self.source = LANGUAGE_MAP.get(source_lang, source_lang)
-        self.target = LANGUAGE_MAP.get(target_lang, target_lang)
+        self.source = resolve_language(source_lang)
+        self.target = resolve_language(target_lang)
 
-    def translate_file(self, input_path: str, output_dir: Optional[str] = None):
+    def translate_file(self, input_path: str, output_dir: Optional[str] = None, stream: Optional[bool] = None,
+                       quiet: bool = False):
         source_file = Path(input_path)
         if not source_file.exists():
             print(f"[red]✖ Source file not found: {input_path}[/red]")
             return
 
-        code = source_file.read_text()
-        translated_code = self._simulate_translation(code)
+        outfile = self.output_path(source_file, output_dir)
+        outfile.parent.mkdir(parents=True, exist_ok=True)
 
-        output_path = Path(output_dir or "quill_translations")
-        output_path.mkdir(parents=True, exist_ok=True)
-        outfile = output_path / f"translated_{source_file.stem}.{self.target}"
-        outfile.write_text(translated_code)
+        size = source_file.stat().st_size
+        if stream is None:
+            stream = size > STREAM_THRESHOLD_BYTES
+        with span("translate.file", path=input_path, bytes=size, mode="stream" if stream else "buffered"):
+            if stream:
+                self._translate_streaming(source_file, outfile)
+            else:
+                code = source_file.read_text()
+                translated_code = self._simulate_translation(code)
+                outfile.write_text(translated_code)
+        count("translate_files", source=self.source, target=self.target)
+        count("translate_bytes_read", size)
 
-        print(f"[green]✔ Translated file saved:[/green] {outfile.resolve()}")
-        print("[bold green]\n✅ Translation complete. You can now review or deploy the output.[/bold green]")
+        if not quiet:
+            print(f"[green]✔ Translated file saved:[/green] {outfile.resolve()}")
+            print("[bold green]\n✅ Translation complete. You can now review or deploy the output.[/bold green]")
+        return outfile
 
-    def _simulate_translation(self, code: str) -> str:
+    def output_path(self, source_file: Path, output_dir: Optional[str] = None) -> Path:
+        return Path(output_dir or "quill_translations") / f"translated_{source_file.stem}.{extension_for(self.target)}"
+
+    def translate_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Translates chunk by chunk, yielding output as soon as each chunk is done."""
+        yield self._banner()
+        for chunk in chunks:
+            yield self._translate_chunk(chunk)
+
+    def _translate_streaming(self, source_file: Path, outfile: Path) -> None:
+        """Reads, translates and writes incrementally so peak memory is one chunk, not one file."""
+        partial = outfile.with_name(f"{outfile.name}.{os.getpid()}.part")
+        try:
+            with source_file.open("r") as src, partial.open("w") as out:
+                # readline's limit keeps a minified one-line file from being read in one piece.
+                lines = iter(lambda: src.readline(MAX_CHUNK_CHARS), "")
+                for piece in self.translate_stream(iter_chunks(lines)):
+                    out.write(piece)
+            os.replace(partial, outfile)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+    def _banner(self) -> str:
+        return f"// Translation from {self.source} to {self.target} using Qwnt AI Engine\n"
+
+    def _translate_chunk(self, chunk: str) -> str:
         """
         Placeholder logic for now. Can be replaced with ML inference or rules engine.
         """
-        banner = f"// Translation from {self.source} to {self.target} using Qwnt AI Engine\n"
-        return banner + code
+        return chunk
+
+    def _simulate_translation(self, code: str) -> str:
+        return self._banner() + self._translate_chunk(code)
+
+
+# === Bulk Translation (directories / globs) ===
+MANIFEST_NAME = ".translation_manifest.json"
+AUTO_DETECT = "auto"
+# Detectable, but data or markup rather than code, so "auto" never picks them up.
+NON_CODE_LANGUAGES = frozenset({"json", "xml", "yaml", "toml", "ini", "markdown", "html", "css", "latex"})
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "build", "dist"}
+
+
+def iter_sources(target: str, source_lang: str, target_lang: Optional[str] = None) -> Tuple[Path, Iterator[Path]]:
+    """
+    Resolves a file, directory or glob into (base directory, lazy iterator of source files).
+    Directories are walked for files whose extension maps to `source_lang`; with "auto",
+    for any source-code file in a detectable language other than `target_lang`.
+    """
+    def wanted(candidate: Path) -> bool:
+        if source_lang != AUTO_DETECT:
+            return language_for_path(candidate) == source_lang
+        detected = detect_language(candidate)
+        return detected not in (None, target_lang) and detected not in NON_CODE_LANGUAGES
+
+    path = Path(target)
+    if path.is_file():
+        return path.parent, iter([path])
+    if path.is_dir():
+        def walk() -> Iterator[Path]:
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS)
+                for name in sorted(files):
+                    candidate = Path(root) / name
+                    if wanted(candidate):
+                        yield candidate
+        return path, walk()
+    literal_parts = itertools.takewhile(lambda part: not any(c in part for c in "*?["), path.parts)
+    matches = (Path(p) for p in sorted(glob.iglob(target, recursive=True)) if Path(p).is_file())
+    return Path(*literal_parts), (p for p in matches if source_lang != AUTO_DETECT or wanted(p))
+
+
+def load_manifest(manifest_path: Path, source: str, target: str) -> Dict[str, Dict]:
+    """Previous run's per-file entries, or nothing if the manifest is missing or for another language pair."""
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("source") != source or manifest.get("target") != target:
+        return {}
+    return manifest.get("files", {})
+
+
+def _translate_job(source_lang: str, target_lang: str, source: str, output_dir: str,
+                   previous: Optional[Dict], stream: Optional[bool]) -> Dict:
+    """Worker: hashes one file and translates it unless the manifest says it is unchanged."""
+    start = time.perf_counter()
+    record: Dict = {"source": source}
+    try:
+        record["hash"] = file_digest(source)
+        if previous and previous.get("hash") == record["hash"] and Path(previous.get("output", "")).exists():
+            return dict(previous, source=source, status="skipped")
+        if source_lang == AUTO_DETECT:
+            detected = detect_language(Path(source))
+            if detected is None:
+                raise ValueError("could not detect source language")
+            source_lang = detected
+        engine = XLangTranslator(source_lang, target_lang)
+        outfile = engine.translate_file(source, output_dir=output_dir, stream=stream, quiet=True)
+        record.update(output=str(outfile), status="translated")
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+
+def translate_many(from_lang: str, to_lang: str, target: str, output_dir: Optional[str] = None,
+                   workers: Optional[int] = None, stream: Optional[bool] = None) -> Dict[str, int]:
+    """
+    Translates every matching file under a directory or glob on a process pool, skipping files
+    whose content hash matches the previous run's manifest, then rewrites the manifest.
+    """
+    engine = XLangTranslator(from_lang, to_lang)
+    out_root = Path(output_dir or "quill_translations")
+    out_root.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_root / MANIFEST_NAME
+    previous = load_manifest(manifest_path, engine.source, engine.target)
+
+    base, sources = iter_sources(target, engine.source, engine.target)
+    entries: Dict[str, Dict] = {}
+    claimed: Dict[Path, str] = {}  # output file -> the source that produces it
+    counts = {"translated": 0, "skipped": 0, "error": 0}
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    job = worker_job(_translate_job)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 4:
+                source = next(sources, None)
+                if source is None:
+                    exhausted = True
+                    break
+                rel_parent = source.parent.relative_to(base) if source.parent.is_relative_to(base) else Path()
+                key = str(source)
+                outfile = engine.output_path(source, str(out_root / rel_parent))
+                if outfile in claimed:
+                    # e.g. a.js and a.ts in one directory: refuse rather than overwrite.
+                    counts["error"] += 1
+                    print(f"[red]✖ {key}: output {outfile} is already produced by {claimed[outfile]}[/red]")
+                    continue
+                claimed[outfile] = key
+                pending.add(pool.submit(job, from_lang, to_lang, key, str(out_root / rel_parent),
+                                        previous.get(key), stream))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = collect(future.result())
+                counts[record.pop("status")] += 1
+                if "error" in record:
+                    print(f"[red]✖ {record['source']}: {record['error']}[/red]")
+                    continue
+                entries[record.pop("source")] = record
+
+    manifest_path.write_text(json.dumps(
+        {"source": engine.source, "target": engine.target, "files": dict(sorted(entries.items()))}, indent=2
+    ))
+    elapsed = time.perf_counter() - start
+    print(f"[green]✔ {counts['translated']} translated, {counts['skipped']} unchanged, "
+          f"{counts['error']} failed in {elapsed:.2f}s[/green]")
+    print(f"[dim]Manifest: {manifest_path.resolve()}[/dim]")
+    return counts
 
 
 # === CLI Entry ===
-def translate(from_lang: str, to_lang: str, filepath: str):
+@lru_cache(maxsize=64)
+def shared_translator(source_lang: str, target_lang: str) -> XLangTranslator:
+    return XLangTranslator(source_lang, target_lang)
+
+
+def translate(from_lang: str, to_lang: str, filepath: str, stream: Optional[bool] = None,
+              output_dir: Optional[str] = None, workers: Optional[int] = None):
     print(f"[bold cyan]🔄 XLang-TX Translating from {from_lang} to {to_lang}...[/bold cyan]")
-    engine = XLangTranslator(from_lang.lower(), to_lang.lower())
-    engine.translate_file(filepath)
\ No newline at end of file
+    if Path(filepath).is_file():
+        if from_lang.lower() == AUTO_DETECT:
+            from_lang = detect_language(Path(filepath)) or from_lang
+            print(f"[blue]Detected source language:[/blue] {from_lang}")
+        engine = shared_translator(from_lang.lower(), to_lang.lower())
+        engine.translate_file(filepath, output_dir=output_dir, stream=stream)
+    else:
+        translate_many(from_lang.lower(), to_lang.lower(), filepath, output_dir=output_dir,
+                       workers=workers, stream=stream)
\ No newline at end of file
@@ -1,12 +1,20 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, IO, List, Optional
 from rich import print
+from cache import file_digest
+import hashlib
+import os
 import random
 import datetime
+import re
+import threading
+import time
 
 # === Component Library ===
-UI_COMPONENTS = {
-    "hero": lambda theme: f"""
+# Sources use {theme} / {year} placeholders and are compiled once at import (see CompiledTemplate).
+COMPONENT_SOURCES = {
+    "hero": """
 <section class='bg-{theme}-900 text-white p-12'>
   <div class='max-w-7xl mx-auto'>
     <h1 class='text-5xl font-bold mb-4'>Welcome to Qwnt AI</h1>
@@ -16,7 +24,7 @@ UI_COMPONENTS = {
 </section>
 """,
 
-    "features": lambda theme: f"""
+    "features": """
 <section class='bg-{theme}-50 text-gray-800 py-12'>
   <div class='max-w-6xl mx-auto px-6'>
     <h2 class='text-3xl font-semibold mb-8'>Platform Capabilities</h2>
@@ -38,7 +46,7 @@ UI_COMPONENTS = {
 </section>
 """,
 
-    "pricing": lambda theme: f"""
+    "pricing": """
 <section class='bg-{theme}-100 text-gray-900 py-16'>
   <div class='max-w-4xl mx-auto px-4'>
     <h2 class='text-3xl font-bold mb-6'>Pricing Plans</h2>
@@ -63,10 +71,10 @@ UI_COMPONENTS = {
 </section>
 """,
 
-    "footer": lambda theme: f"""
+    "footer": """
 <footer class='bg-{theme}-800 text-white py-6'>
   <div class='max-w-7xl mx-auto px-6 flex justify-between'>
-    <p>&copy; {datetime.datetime.now().year} Qwnt AI. All rights reserved.</p>
+    <p>&copy; {year} Qwnt AI. All rights reserved.</p>
     <div class='space-x-4'>
       <a href='#' class='hover:underline'>Docs</a>
       <a href='#' class='hover:underline'>API</a>
@@ -77,18 +85,7 @@ UI_COMPONENTS = {
 """
 }
 
-# === UI Generator ===
-def generate_ui(theme: str = "slate", components: List[str] = ["hero", "features", "pricing", "footer"], output_dir: str = "quill_ui"):
-    print(f"[bold magenta]🎨 Generating multi-section website with theme:[/bold magenta] {theme}")
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-
-    selected_components = [comp for comp in components if comp in UI_COMPONENTS]
-    random.shuffle(selected_components)  # Simulate creative permutation
-
-    html_blocks = [UI_COMPONENTS[comp](theme) for comp in selected_components]
-
-    html_doc = f"""
+PAGE_HEAD = """
 <!DOCTYPE html>
 <html lang=\"en\">
 <head>
@@ -98,13 +95,158 @@ def generate_ui(theme: str = "slate", components: List[str] = ["hero", "features
   <script src=\"https://cdn.tailwindcss.com\"></script>
 </head>
 <body class='antialiased'>
-{''.join(html_blocks)}
+"""
+
+PAGE_TAIL = """
 </body>
 </html>
 """
 
+
+class CompiledTemplate:
+    """
+    A component source pre-split into literal segments and placeholder names, so rendering
+    is a single join instead of re-parsing an f-string every call.
+    """
+
+    PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+    def __init__(self, source: str):
+        pieces = self.PLACEHOLDER.split(source)
+        self.literals = pieces[0::2]
+        self.fields = pieces[1::2]
+
+    def render(self, **values: str) -> str:
+        out = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            out.append(values[field])
+            out.append(literal)
+        return "".join(out)
+
+
+TEMPLATES: Dict[str, CompiledTemplate] = {name: CompiledTemplate(src) for name, src in COMPONENT_SOURCES.items()}
+
+
+@lru_cache(maxsize=1024)
+def render_component(name: str, theme: str, year: int) -> str:
+    """Rendered fragment for one (component, theme), memoized across pages and calls."""
+    return TEMPLATES[name].render(theme=theme, year=str(year))
+
+
+def _current_year() -> int:
+    return datetime.date.today().year
+
+
+# Kept for callers that render a single component directly: UI_COMPONENTS[name](theme).
+UI_COMPONENTS = {
+    name: (lambda theme, _name=name: render_component(_name, theme, _current_year())) for name in TEMPLATES
+}
+
+
+def write_page(out, theme: str, components: List[str], year: int) -> int:
+    """Streams a page to `out` (anything with `write`) fragment by fragment; returns characters written."""
+    written = out.write(PAGE_HEAD)
+    for comp in components:
+        written += out.write(render_component(comp, theme, year))
+    written += out.write(PAGE_TAIL)
+    return written
+
+
+class _HashingWriter:
+    """Text sink that writes through to a file while hashing exactly the bytes written."""
+
+    def __init__(self, out: IO[str]):
+        self.out = out
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        self.digest.update(text.encode("utf-8"))
+        return self.out.write(text)
+
+
+def _write_page_file(file_path: Path, theme: str, components: List[str], year: int) -> Dict:
+    """
+    Streams the page to a temporary file and only replaces `file_path` when its content
+    hash changed, so unchanged pages keep their mtime (and downstream caches stay warm).
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # One temporary name per writer, so concurrent generations into the same directory never share it.
+    partial = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        with partial.open("w", encoding="utf-8", newline="") as out:
+            writer = _HashingWriter(out)
+            size = write_page(writer, theme, components, year)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    content_hash = writer.digest.hexdigest()
+    if file_path.exists() and file_digest(file_path) == content_hash:
+        partial.unlink()
+        written = False
+    else:
+        os.replace(partial, file_path)
+        written = True
+    return {"path": str(file_path), "sha256": content_hash, "chars": size, "written": written}
+
+
+def layout_seed(theme: str, components: List[str]) -> int:
+    """Default permutation seed derived from the inputs, so identical requests give identical pages."""
+    key = f"{theme}|{','.join(components)}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+def _permute(components: List[str], theme: str, seed: Optional[int]) -> List[str]:
+    selected = [comp for comp in components if comp in TEMPLATES]
+    rng = random.Random(layout_seed(theme, selected) if seed is None else seed)
+    rng.shuffle(selected)  # Simulate creative permutation, reproducibly
+    return selected
+
+
+# === UI Generator ===
+def generate_ui(theme: str = "slate", components: List[str] = ["hero", "features", "pricing", "footer"],
+                output_dir: str = "quill_ui", seed: Optional[int] = None) -> Dict:
+    print(f"[bold magenta]🎨 Generating multi-section website with theme:[/bold magenta] {theme}")
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    selected_components = _permute(components, theme, seed)
+
     file_path = output_path / "index.html"
-    file_path.write_text(html_doc)
+    page = _write_page_file(file_path, theme, selected_components, _current_year())
+
+    if page["written"]:
+        print(f"[green]✔ Full website generated at:[/green] {file_path.resolve()}")
+    else:
+        print(f"[green]✔ Unchanged, left untouched:[/green] {file_path.resolve()}")
+    print(f"[dim]sha256: {page['sha256']}[/dim]")
+    print("[bold green]\n✅ Done. Ready to serve as a landing page or app frontend.[/bold green]")
+    return page
+
+
+def generate_ui_matrix(themes: List[str], layouts: Dict[str, List[str]], output_dir: str = "quill_ui",
+                       seed: Optional[int] = None) -> List[Dict]:
+    """
+    Renders every theme x layout combination in one call, into `output_dir/<theme>/<layout>/index.html`.
+    Fragments are shared through the render cache, so each (component, theme) is rendered once.
+    """
+    print(f"[bold magenta]🎨 Rendering {len(themes)} theme(s) x {len(layouts)} layout(s)...[/bold magenta]")
+    year = _current_year()
+    pages = []
+    start = time.perf_counter()
+    for theme in themes:
+        for layout_name, components in layouts.items():
+            page_start = time.perf_counter()
+            selected = _permute(components, theme, seed)
+            file_path = Path(output_dir) / theme / layout_name / "index.html"
+            page = _write_page_file(file_path, theme, selected, year)
+            elapsed_ms = (time.perf_counter() - page_start) * 1000
+            page.update(theme=theme, layout=layout_name, ms=round(elapsed_ms, 3))
+            pages.append(page)
+            status = "written" if page["written"] else "unchanged"
+            print(f"  [green]✔[/green] {theme}/{layout_name} ({page['chars']} chars, {status}, "
+                  f"{page['sha256'][:12]}) in {elapsed_ms:.2f} ms")
 
-    print(f"[green]✔ Full website generated at:[/green] {file_path.resolve()}")
-    print("[bold green]\n✅ Done. Ready to serve as a landing page or app frontend.[/bold green]")
\ No newline at end of file
+    total = time.perf_counter() - start
+    print(f"[bold green]\n✅ {len(pages)} page(s) in {total * 1000:.1f} ms "
+          f"(render cache: {render_component.cache_info().hits} hits)[/bold green]")
+    return pages
@@ -1,67 +1,584 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
 from rich import print
-from pipeline import run_pipeline
+from cache import DiskCache, file_digest
+from schema import CompiledSchema, load_schema
+from pipeline import DEFAULT_REPORT, run_pipeline
+from telemetry import collect, span, worker_job
+from toolrunner import shared_runner
+import glob
 import json
+import os
+import re
 import yaml
-import subprocess
+import tempfile
+import time
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# JSON files above this size are checked by the streaming tokenizer instead of being loaded whole.
+STREAM_THRESHOLD_BYTES = int(os.environ.get("QUILL_VALIDATE_STREAM_BYTES", 32 * 1024 * 1024))
+
+
+class ValidationIssue:
+    """A syntax problem at a 1-based line/column, or a schema violation at a JSON pointer `path`."""
+
+    def __init__(self, line: int, column: int, message: str, path: Optional[str] = None):
+        self.line = line
+        self.column = column
+        self.message = message
+        self.path = path
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        where = f" at {self.path or '/'}" if self.path is not None else ""
+        return f"line {self.line}, column {self.column}{where}: {self.message}"
+
+
+def schema_issues(schema: Optional[CompiledSchema], value, line: int) -> List[ValidationIssue]:
+    if schema is None:
+        return []
+    return [ValidationIssue(line, 1, message, path) for path, message in schema.errors(value)]
+
+
+# === Streaming JSON Syntax Checker ===
+# Leading whitespace is folded into each token so it never costs a loop iteration. The string
+# pattern is "unrolled" (every repetition starts at a backslash), so it cannot backtrack badly.
+JSON_TOKEN = re.compile(r"""
+    [ \t\r\n]*
+    (?:
+        (?P<string>"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*")
+      | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+      | (?P<literal>true|false|null)
+      | (?P<punct>[{}\[\]:,])
+    )
+""", re.X)
+# Text that could still become a valid token once more input arrives.
+PARTIAL_TOKEN = re.compile(r"""
+    [ \t\r\n]*
+    (?:
+        "[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*(?:\\(?:u[0-9a-fA-F]{0,3})?)?
+      | -?[0-9]*(?:\.[0-9]*)?(?:[eE][+-]?[0-9]*)?
+      | t(?:r(?:u)?)? | f(?:a(?:l(?:s)?)?)? | n(?:u(?:l)?)?
+    )
+""", re.X)
+
+# Parser states
+VALUE, VALUE_OR_END, KEY, KEY_OR_END, COLON, COMMA_OR_END, DONE = range(7)
+# Containers opened at most this deep are first handed whole to the C decoder.
+FAST_PATH_DEPTH = 64
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"{name} is not valid JSON")
+
+
+# NaN/Infinity are rejected so the fast path accepts exactly what the tokenizer accepts.
+_JSON_SCANNER = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+class JsonStreamChecker:
+    """
+    Validates JSON syntax from a text stream in fixed-size chunks. Memory is one chunk plus
+    the current token plus one entry per open container, regardless of document size; a
+    token longer than `max_token` characters is reported instead of buffered. Containers
+    that fit in the buffer are checked by the C decoder in one call; anything it rejects
+    (invalid, or cut off at the buffer end) is walked token by token for an exact position.
+    """
+
+    def __init__(self, chunk_size: int = 1 << 16, max_token: int = 1 << 26):
+        self.chunk_size = chunk_size
+        self.max_token = max_token
+
+    def check(self, stream: IO[str]) -> Optional[ValidationIssue]:
+        buffer = ""
+        pos = 0
+        base = 0  # absolute position of buffer[0]
+        line, line_start = 1, 0
+        stack: List[str] = []
+        state = VALUE
+        eof = False
+
+        def refill(size: int) -> None:
+            nonlocal buffer, pos, base, eof
+            chunk = stream.read(size)
+            base += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+
+        while True:
+            # Keep at least one chunk of lookahead so tokens rarely straddle the buffer end.
+            if not eof and len(buffer) - pos < self.chunk_size:
+                refill(self.chunk_size)
+
+            match = JSON_TOKEN.match(buffer, pos)
+            # A number at the buffer end may continue in the next chunk ("12" + "3", "1." + "5").
+            if match is None or (not eof and match.lastgroup == "number" and match.end() >= len(buffer) - 2
+                                 and PARTIAL_TOKEN.fullmatch(buffer, pos)):
+                rest = len(buffer) - pos
+                if not eof and PARTIAL_TOKEN.fullmatch(buffer, pos):
+                    if rest >= self.max_token:
+                        return ValidationIssue(line, base + pos - line_start + 1,
+                                               f"Token longer than {self.max_token} characters")
+                    refill(max(self.chunk_size, rest))  # doubles the buffer, so a long token costs linear time
+                    continue
+                blank = rest - len(buffer[pos:].lstrip(" \t\r\n"))
+                newlines = buffer.count("\n", pos, pos + blank)
+                if newlines:
+                    line += newlines
+                    line_start = base + buffer.rindex("\n", pos, pos + blank) + 1
+                pos += blank
+                if pos >= len(buffer):
+                    break
+                return ValidationIssue(line, base + pos - line_start + 1,
+                                       f"Invalid token starting with {buffer[pos:pos + 12]!r}")
+
+            kind = match.lastgroup
+            begin = match.start(match.lastindex or 0)
+            newlines = buffer.count("\n", pos, begin) if begin > pos else 0
+            if newlines:
+                line += newlines
+                line_start = base + buffer.rindex("\n", pos, begin) + 1
+            column = base + begin - line_start + 1
+            pos = match.end()
+            first = buffer[begin]
+
+            if state == DONE:
+                return ValidationIssue(line, column, f"Extra data after document: {buffer[begin:begin + 12]!r}")
+            if kind == "punct" and first in ":,]}":
+                if first == ":" and state == COLON:
+                    state = VALUE
+                elif first == "," and state == COMMA_OR_END:
+                    state = VALUE if stack[-1] == "[" else KEY
+                elif first == "]" and state in (VALUE_OR_END, COMMA_OR_END) and stack and stack[-1] == "[":
+                    stack.pop()
+                    state = COMMA_OR_END if stack else DONE
+                elif first == "}" and state in (KEY_OR_END, COMMA_OR_END) and stack and stack[-1] == "{":
+                    stack.pop()
+                    state = COMMA_OR_END if stack else DONE
+                else:
+                    return ValidationIssue(line, column, f"Unexpected '{first}'")
+            elif state in (KEY, KEY_OR_END):
+                if kind != "string":
+                    return ValidationIssue(line, column, "Expected a string property name")
+                state = COLON
+            elif state in (VALUE, VALUE_OR_END):
+                if kind == "punct" and len(stack) < FAST_PATH_DEPTH:
+                    try:
+                        end = _JSON_SCANNER.raw_decode(buffer, begin)[1]
+                    except (ValueError, RecursionError):
+                        pass
+                    else:
+                        newlines = buffer.count("\n", begin, end)
+                        if newlines:
+                            line += newlines
+                            line_start = base + buffer.rindex("\n", begin, end) + 1
+                        pos = end
+                        state = COMMA_OR_END if stack else DONE
+                        continue
+                if kind == "punct":
+                    stack.append(first)
+                    state = KEY_OR_END if first == "{" else VALUE_OR_END
+                else:
+                    state = COMMA_OR_END if stack else DONE
+            else:
+                expected = "':'" if state == COLON else "',' or a closing bracket"
+                return ValidationIssue(line, column, f"Expected {expected}, found {buffer[begin:begin + 12]!r}")
+
+        if state != DONE:
+            return ValidationIssue(line, base + pos - line_start + 1, "Unexpected end of input")
+        return None
+
+
+def iter_ndjson_issues(stream: IO[str], schema: Optional[CompiledSchema] = None) -> Iterator[ValidationIssue]:
+    """
+    One JSON value per line; each line is parsed (and checked against `schema`) on its own,
+    so memory is bounded by the longest line.
+    """
+    for lineno, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield ValidationIssue(lineno, e.colno, e.msg)
+            continue
+        if schema is not None:
+            yield from schema_issues(schema, record, lineno)
+
+
+class _YamlDocument:
+    """
+    File-like view of one document in a multi-document YAML stream. `read` hands out a line
+    at a time and returns "" at the '---' marker that starts the next document, so the parser
+    reads straight from the file and never sees (or buffers) more than the current document.
+    """
+
+    def __init__(self, lines: Iterator[Tuple[int, str]], first: Tuple[int, str]):
+        self.lines = lines
+        self.start = first[0]
+        self.pending: Optional[Tuple[int, str]] = first  # the next line, not handed out yet
+        self.has_content = False
+        self.ended = False
+
+    def read(self, size: int = -1) -> str:
+        if self.ended or self.pending is None:
+            return ""
+        text = self.pending[1]
+        if self.has_content and text.startswith("---") and text[3:4] in ("", " ", "\t", "\n", "\r"):
+            self.ended = True
+            return ""
+        self.pending = next(self.lines, None)
+        stripped = text.strip()
+        if stripped and not stripped.startswith(("#", "%", "---")):
+            self.has_content = True
+        return text
+
+
+def iter_yaml_documents(stream: IO[str]) -> Iterator[Tuple[int, _YamlDocument]]:
+    """
+    Splits a multi-document YAML stream at '---' markers, yielding (first line, document) where
+    each document is a readable stream; it must be consumed before the next one is requested.
+    """
+    lines = enumerate(stream, start=1)
+    pending = next(lines, None)
+    while pending is not None:
+        document = _YamlDocument(lines, pending)
+        yield document.start, document
+        while document.read():  # skip whatever the parser left unread, e.g. after a syntax error
+            pass
+        pending = document.pending
+
+
+def iter_yaml_issues(stream: IO[str], schema: Optional[CompiledSchema] = None) -> Iterator[ValidationIssue]:
+    """
+    Checks each document with the event parser as it streams in, so no Python objects are
+    built, unless a schema is given, in which case each document is loaded and validated on
+    its own. Documents are parsed separately so an error in one does not hide the others.
+    """
+    for start, document in iter_yaml_documents(stream):
+        try:
+            if schema is None:
+                for _ in yaml.parse(document, Loader=YAML_LOADER):
+                    pass
+            else:
+                for value in yaml.load_all(document, Loader=YAML_LOADER):
+                    yield from schema_issues(schema, value, start)
+        except yaml.MarkedYAMLError as e:
+            mark = e.problem_mark or e.context_mark
+            line = start + (mark.line if mark else 0)
+            column = (mark.column + 1) if mark else 1
+            yield ValidationIssue(line, column, str(e.problem or e.context))
+        except yaml.YAMLError as e:
+            yield ValidationIssue(start, 1, str(e))
+
 
 # === SYN-VAL/42 Engine ===
+STRUCTURED_TYPES = {".json", ".ndjson", ".jsonl", ".yaml", ".yml"}
+MARKUP_TYPES = {".html", ".htm", ".xml"}
+SUPPORTED_TYPES = STRUCTURED_TYPES | MARKUP_TYPES
+TIDY_MESSAGE = re.compile(r"^(?P<file>.+?):(?P<line>\d+):(?P<column>\d+): (?P<message>.*)$")
+
+
+def run_tidy(paths: List[str], xml: bool = False) -> Dict[str, List[ValidationIssue]]:
+    """
+    Lints many files with a single `tidy` process. GNU-style messages carry the file name,
+    so the combined output is split back into per-file issues.
+    """
+    command = ["tidy", "-q", "-e", "--gnu-emacs", "yes"] + (["-xml"] if xml else []) + paths
+    result = shared_runner().run(command, timeout=120)
+    issues: Dict[str, List[ValidationIssue]] = {path: [] for path in paths}
+    for line in result.stderr.splitlines():
+        match = TIDY_MESSAGE.match(line)
+        if match and match["file"] in issues:
+            issues[match["file"]].append(
+                ValidationIssue(int(match["line"]), int(match["column"]), match["message"])
+            )
+    if result.timed_out:
+        for path in paths:
+            issues[path].append(ValidationIssue(1, 1, "tidy timed out"))
+    elif result.returncode not in (0, 1) and not any(issues.values()):
+        for path in paths:
+            issues[path].append(ValidationIssue(1, 1, result.stderr.strip() or f"tidy exited with {result.returncode}"))
+    return issues
+
+
+def format_issue(file, issue: ValidationIssue) -> str:
+    if issue.path is not None:
+        return f"{file}:{issue.line}: {issue.path or '/'}: {issue.message}"
+    return f"{file}:{issue.line}:{issue.column}: {issue.message}"
+
+
 class SchemaValidator:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_errors: int = 20, quiet: bool = False, schema: Optional[str] = None):
         self.file = Path(file_path)
         self.ext = self.file.suffix.lower()
+        self.max_errors = max_errors
+        self.quiet = quiet
+        self.schema = load_schema(schema) if schema else None
+        self.issues: List[ValidationIssue] = []
+        self.errored = False  # True when the check itself failed, so the result must not be cached
 
-    def validate(self):
+    def _print(self, message: str) -> None:
+        if not self.quiet:
+            print(message)
+
+    def validate(self) -> List[ValidationIssue]:
         if not self.file.exists():
-            print(f"[red]✖ File not found: {self.file}[/red]")
-            return
+            self._print(f"[red]✖ File not found: {self.file}[/red]")
+            self.issues.append(ValidationIssue(1, 1, "File not found"))
+            self.errored = True
+            return self.issues
 
         try:
             if self.ext in [".json"]:
                 self._validate_json()
+            elif self.ext in [".ndjson", ".jsonl"]:
+                self._validate_ndjson()
             elif self.ext in [".yaml", ".yml"]:
                 self._validate_yaml()
-            elif self.ext in [".html", ".xml"]:
+            elif self.ext in MARKUP_TYPES:
                 self._validate_lint()
             else:
-                print(f"[yellow]⚠ Unsupported file type for validation: {self.ext}[/yellow]")
+                self._print(f"[yellow]⚠ Unsupported file type for validation: {self.ext}[/yellow]")
         except Exception as e:
-            print(f"[red]✖ Validation error: {e}[/red]")
+            self._print(f"[red]✖ Validation error: {e}[/red]")
+            self.issues.append(ValidationIssue(1, 1, f"Validation error: {type(e).__name__}: {e}"))
+            self.errored = True
+        return self.issues
+
+    def _collect(self, issues: Iterator[ValidationIssue], kind: str) -> None:
+        for issue in issues:
+            self.issues.append(issue)
+            if len(self.issues) >= self.max_errors:
+                break
+        if not self.issues:
+            self._print(f"[green]✔ {kind} is valid.[/green]")
+            return
+        limit = " (stopped at --max-errors)" if len(self.issues) >= self.max_errors else ""
+        self._print(f"[red]✖ {len(self.issues)} {kind} error(s){limit}:[/red]")
+        for issue in self.issues:
+            self._print(f"  {format_issue(self.file, issue)}")
 
     def _validate_json(self):
-        print("[blue]🔍 Validating JSON structure...[/blue]")
+        self._print("[blue]🔍 Validating JSON structure...[/blue]")
         with self.file.open("r") as f:
-            json.load(f)
-        print("[green]✔ JSON is valid.[/green]")
+            # A schema applies to the whole document, so with one the file is loaded whatever
+            # its size; NDJSON and multi-document YAML are validated record by record instead.
+            if self.schema is None and self.file.stat().st_size > STREAM_THRESHOLD_BYTES:
+                issue = JsonStreamChecker().check(f)
+                # A single JSON document cannot be resynchronised after a syntax error.
+                self._collect(iter([issue] if issue else []), "JSON")
+                return
+            try:
+                document = json.load(f)
+            except json.JSONDecodeError as e:
+                self._collect(iter([ValidationIssue(e.lineno, e.colno, e.msg)]), "JSON")
+                return
+        self._collect(iter(schema_issues(self.schema, document, 1)), "JSON")
+
+    def _validate_ndjson(self):
+        self._print("[blue]🔍 Validating NDJSON records...[/blue]")
+        with self.file.open("r") as f:
+            self._collect(iter_ndjson_issues(f, self.schema), "NDJSON")
 
     def _validate_yaml(self):
-        print("[blue]🔍 Validating YAML structure...[/blue]")
+        self._print("[blue]🔍 Validating YAML structure...[/blue]")
         with self.file.open("r") as f:
-            yaml.safe_load(f)
-        print("[green]✔ YAML is valid.[/green]")
+            self._collect(iter_yaml_issues(f, self.schema), "YAML")
 
     def _validate_lint(self):
-        print("[blue]🔍 Running external linter...[/blue]")
-        result = subprocess.run(["tidy", "-q", str(self.file)], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("[green]✔ Markup is clean.[/green]")
+        self._print("[blue]🔍 Running external linter...[/blue]")
+        found = run_tidy([str(self.file)], xml=self.ext == ".xml")[str(self.file)]
+        self._collect(iter(found), "Markup")
+
+
+# === Bulk Validation ===
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "build", "dist"}
+CACHE_VERSION = 2
+TIDY_BATCH_SIZE = 64
+# Below this many parse misses, starting a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 32
+
+
+def iter_validation_targets(targets: List[str]) -> Iterator[Path]:
+    """Expands files, directories and globs into the supported files they contain, each once."""
+    seen = set()
+    for target in targets:
+        path = Path(target)
+        if path.is_file():
+            candidates: Iterator[Path] = iter([path])
+        elif path.is_dir():
+            def walk(root: Path = path) -> Iterator[Path]:
+                for dirpath, dirs, files in os.walk(root):
+                    dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS)
+                    for name in sorted(files):
+                        if Path(name).suffix.lower() in SUPPORTED_TYPES:
+                            yield Path(dirpath) / name
+            candidates = walk()
+        else:
+            candidates = (Path(p) for p in sorted(glob.iglob(target, recursive=True))
+                          if Path(p).is_file() and Path(p).suffix.lower() in SUPPORTED_TYPES)
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+
+
+def _validate_job(path: str, max_errors: int, schema: Optional[str] = None) -> Tuple[List[Dict], bool]:
+    """
+    Worker: parses one structured file and returns its issues as dicts, plus whether the
+    result may be cached (False when the check itself raised). Each worker compiles the schema once.
+    """
+    with span("validate.file", path=path) as timer:
+        validator = SchemaValidator(path, max_errors=max_errors, quiet=True, schema=schema)
+        issues = [issue.to_dict() for issue in validator.validate()]
+        timer.set(issues=len(issues))
+    return issues, not validator.errored
+
+
+def _tidy_job(paths: List[str], xml: bool, max_errors: int) -> Dict[str, List[Dict]]:
+    try:
+        found = run_tidy(paths, xml=xml)
+    except FileNotFoundError:
+        return {path: [ValidationIssue(1, 1, "tidy is not installed").to_dict()] for path in paths}
+    return {path: [issue.to_dict() for issue in issues[:max_errors]] for path, issues in found.items()}
+
+
+def validate_many(targets: List[str], workers: Optional[int] = None, max_errors: int = 20,
+                  use_cache: bool = True, schema: Optional[str] = None) -> Dict[str, List[ValidationIssue]]:
+    """
+    Validates every supported file under the given files, directories or globs. Results are
+    cached by content hash; JSON/YAML misses are parsed on a process pool and markup misses
+    are linted in batches of TIDY_BATCH_SIZE files per `tidy` process. With a `schema`, the
+    cache key also covers the schema's content hash.
+    """
+    schema_digest = load_schema(schema).digest if schema else None
+    cache = DiskCache("validate", max_entries=100_000) if use_cache else None
+    results: Dict[str, List[ValidationIssue]] = {}
+    keys: Dict[str, str] = {}
+    structured: List[str] = []
+    markup: Dict[bool, List[str]] = {False: [], True: []}
+    start = time.perf_counter()
+
+    for path in iter_validation_targets(targets):
+        name = str(path)
+        if cache is not None:
+            keys[name] = cache.make_key(CACHE_VERSION, path.suffix.lower(), file_digest(path), max_errors,
+                                        schema_digest)
+            cached = cache.get(keys[name])
+            if cached is not None:
+                results[name] = [ValidationIssue(**issue) for issue in cached]
+                continue
+        if path.suffix.lower() in STRUCTURED_TYPES:
+            structured.append(name)
         else:
-            print(f"[yellow]⚠ Markup issues found:[/yellow]\n{result.stderr.strip()}")
+            markup[path.suffix.lower() == ".xml"].append(name)
+    cached_count = len(results)
+    for target in targets:
+        if not glob.has_magic(target) and not Path(target).exists():
+            results[target] = [ValidationIssue(1, 1, "File not found")]
 
+    def record(name: str, issues: List[Dict], cacheable: bool = True) -> None:
+        results[name] = [ValidationIssue(**issue) for issue in issues]
+        if cache is not None and cacheable:
+            cache.put(keys[name], issues)
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as lint_pool:
+        lint_futures = [
+            lint_pool.submit(_tidy_job, files[i:i + TIDY_BATCH_SIZE], xml, max_errors)
+            for xml, files in markup.items()
+            for i in range(0, len(files), TIDY_BATCH_SIZE)
+        ]
+        if len(structured) >= PARALLEL_MIN_FILES and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(structured))) as pool:
+                chunksize = max(1, len(structured) // (workers * 4))
+                for name, (issues, cacheable) in zip(structured, map(collect, pool.map(
+                        worker_job(_validate_job), structured, [max_errors] * len(structured),
+                        [schema] * len(structured), chunksize=chunksize))):
+                    record(name, issues, cacheable)
+        else:
+            for name in structured:
+                record(name, *_validate_job(name, max_errors, schema))
+        for future in lint_futures:
+            for name, issues in future.result().items():
+                record(name, issues, cacheable=not any(i["message"] == "tidy is not installed" for i in issues))
+
+    elapsed = time.perf_counter() - start
+    failed = {name: found for name, found in sorted(results.items()) if found}
+    for name, found in failed.items():
+        for issue in found:
+            print(f"[red]✖[/red] {format_issue(name, issue)}")
+    total = len(results)
+    rate = total / elapsed if elapsed > 0 else float(total)
+    print(f"[{'red' if failed else 'green'}]{'✖' if failed else '✔'} {total} file(s) validated, "
+          f"{len(failed)} with errors, {cached_count} from cache in {elapsed:.2f}s ({rate:.0f} files/s)"
+          f"[/{'red' if failed else 'green'}]")
+    return results
+
+
+# === Schema Throughput Benchmark ===
+BENCH_SCHEMA = {
+    "type": "object",
+    "required": ["id", "user", "tags", "score"],
+    "additionalProperties": False,
+    "properties": {
+        "id": {"type": "integer", "minimum": 0},
+        "user": {"type": "object", "required": ["name"], "properties": {
+            "name": {"type": "string", "minLength": 1, "pattern": "^[a-z]+[0-9]*$"},
+            "email": {"type": ["string", "null"]},
+        }},
+        "tags": {"type": "array", "items": {"enum": ["alpha", "beta", "gamma"]}, "maxItems": 8},
+        "score": {"type": "number", "exclusiveMaximum": 100},
+    },
+}
 
-# === DX-Pipeline CLI Mode ===
-def run_ci_pipeline():
-    print("[bold cyan]🧪 Running test and validation pipeline (DX-Pipeline)...[/bold cyan]")
-    result = subprocess.run(["pytest", "tests/"], capture_output=True, text=True)
-    print(result.stdout if result.returncode == 0 else result.stderr)
-    print("[green]✔ Pipeline complete.[/green]" if result.returncode == 0 else "[red]✖ Pipeline failed.[/red]")
+
+def benchmark_schema(records: int = 200_000, invalid_every: int = 100) -> Dict[str, float]:
+    """Validates a synthetic NDJSON file against BENCH_SCHEMA and reports records/s, with and without the schema."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data, schema_path = Path(tmp) / "events.ndjson", Path(tmp) / "schema.json"
+        schema_path.write_text(json.dumps(BENCH_SCHEMA))
+        with data.open("w") as f:
+            for i in range(records):
+                record = {"id": i, "user": {"name": f"user{i % 97}", "email": None},
+                          "tags": ["alpha", "gamma"][: i % 3], "score": (i % 1000) / 10}
+                if invalid_every and i % invalid_every == 0:
+                    record["score"] = "high"
+                f.write(json.dumps(record) + "\n")
+
+        timings = {}
+        for label, schema in (("parse", None), ("schema", str(schema_path))):
+            start = time.perf_counter()
+            issues = SchemaValidator(str(data), max_errors=records, quiet=True, schema=schema).validate()
+            timings[label] = (time.perf_counter() - start, len(issues))
+
+    parse_s, _ = timings["parse"]
+    schema_s, errors = timings["schema"]
+    return {"records": records, "errors": errors, "seconds": round(schema_s, 4),
+            "records_per_s": round(records / schema_s, 1), "parse_only_records_per_s": round(records / parse_s, 1)}
 
 
 # === CLI Entry ===
-def validate_file(file: str, ci: bool = False):
+def validate_file(file: Union[str, List[str]], ci: bool = False, fail_fast: bool = False,
+                  report: Optional[str] = DEFAULT_REPORT, max_errors: int = 20, workers: Optional[int] = None,
+                  use_cache: bool = True, schema: Optional[str] = None) -> bool:
     if ci:
-        run_pipeline()
-    else:
-        validator = SchemaValidator(file)
-        validator.validate()
\ No newline at end of file
+        return run_pipeline(fail_fast=fail_fast, report_path=report)
+    if schema:
+        try:
+            load_schema(schema)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            print(f"[red]✖ Cannot load schema {schema}: {e}[/red]")
+            return False
+    targets = [file] if isinstance(file, str) else list(file)
+    if len(targets) == 1 and Path(targets[0]).is_file():
+        return not SchemaValidator(targets[0], max_errors=max_errors, schema=schema).validate()
+    results = validate_many(targets, workers=workers, max_errors=max_errors, use_cache=use_cache, schema=schema)
+    if not results:
+        print(f"[yellow]⚠ No supported files found in: {', '.join(targets)}[/yellow]")
+    return not any(results.values())
\ No newline at end of file
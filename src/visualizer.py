@@ -1,34 +1,329 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 from rich import print
+from typing import Dict, Iterator, List, Optional, Tuple
+from cache import DiskCache
+from telemetry import collect, count, span, worker_job
 import hashlib
-import random
+import json
+import math
+import os
+import shutil
+import struct
+import time
+import zlib
 
-# === LDM-VizCore (Simulated Visual Generator) ===
+try:  # NumPy (a declared dependency) vectorises pixel generation; the pure-Python path is a fallback.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+RENDERER_VERSION = 1
+DEFAULT_SIZE = (512, 512)
+# Bounds of the render cache; least recently used images are evicted beyond either.
+CACHE_MAX_ENTRIES = 1024
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+TAU = 2 * math.pi
+
+# Three-stop palettes plus the per-style post effects applied to the procedural field.
+STYLES: Dict[str, Dict] = {
+    "futuristic": {"palette": [(8, 10, 40), (120, 20, 200), (0, 240, 255)]},
+    "realistic": {"palette": [(34, 52, 30), (120, 140, 90), (225, 215, 190)]},
+    "sketch": {"palette": [(250, 250, 245), (160, 160, 160), (30, 30, 30)], "levels": 4},
+    "digital art": {"palette": [(255, 80, 120), (255, 200, 60), (40, 200, 160)], "levels": 6},
+    "3D render": {"palette": [(20, 20, 30), (90, 110, 160), (230, 235, 255)], "vignette": 0.6},
+    "blueprint": {"palette": [(10, 40, 110), (20, 70, 160), (40, 100, 190)], "grid": 32},
+}
+GRID_COLOR = (200, 220, 255)
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """"512" or "640x480" → (width, height)."""
+    width, _, height = size.lower().partition("x")
+    dims = (int(width), int(height or width))
+    if min(dims) < 1 or max(dims) > 8192:
+        raise ValueError(f"Image size must be between 1 and 8192 pixels per side, got {size!r}")
+    return dims
+
+
+def render_params(prompt: str, style: str) -> Dict[str, float]:
+    """Wave frequencies, phases and a focal point derived from the prompt/style hash."""
+    digest = hashlib.sha256(f"{style}\0{prompt}".encode()).digest()
+    unit = [b / 255 for b in digest]
+    return {
+        "fx": 1 + unit[0] * 5, "fy": 1 + unit[1] * 5, "fr": 2 + unit[2] * 8,
+        "p1": unit[3], "p2": unit[4], "p3": unit[5],
+        "cx": 0.2 + unit[6] * 0.6, "cy": 0.2 + unit[7] * 0.6,
+    }
+
+
+def _field(xp, u, v, p: Dict[str, float]):
+    """Procedural field in [0, 1]; `xp` is numpy for whole arrays or math for single pixels."""
+    waves = xp.sin(TAU * (p["fx"] * u + p["p1"])) * xp.cos(TAU * (p["fy"] * v + p["p2"]))
+    radius = xp.sqrt((u - p["cx"]) ** 2 + (v - p["cy"]) ** 2)
+    return 0.5 + 0.25 * waves + 0.25 * xp.sin(TAU * (p["fr"] * radius + p["p3"])), radius
+
+
+def _render_rows_numpy(width: int, height: int, p: Dict[str, float], spec: Dict) -> bytes:
+    y, x = np.mgrid[0:height, 0:width]
+    t, radius = _field(np, x / width, y / height, p)
+    levels = spec.get("levels")
+    if levels:
+        t = np.minimum(np.floor(t * levels) / (levels - 1), 1.0)
+
+    palette = np.asarray(spec["palette"], dtype=np.float64)
+    seg = np.clip(t, 0.0, 1.0) * (len(palette) - 1)
+    index = np.minimum(seg.astype(np.int64), len(palette) - 2)
+    frac = (seg - index)[..., None]
+    rgb = palette[index] + (palette[index + 1] - palette[index]) * frac
+
+    if spec.get("vignette"):
+        rgb *= (1 - spec["vignette"] * np.minimum(radius / 0.75, 1.0))[..., None]
+    if spec.get("grid"):
+        on_grid = (x % spec["grid"] == 0) | (y % spec["grid"] == 0)
+        rgb[on_grid] = (rgb[on_grid] + GRID_COLOR) / 2
+
+    rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)  # column 0 is the PNG "None" filter byte
+    rows[:, 1:] = np.clip(rgb + 0.5, 0, 255).astype(np.uint8).reshape(height, width * 3)
+    return rows.tobytes()
+
+
+def _render_rows_python(width: int, height: int, p: Dict[str, float], spec: Dict) -> bytes:
+    palette = spec["palette"]
+    levels, vignette, grid = spec.get("levels"), spec.get("vignette"), spec.get("grid")
+    raw = bytearray()
+    for y in range(height):
+        raw.append(0)
+        for x in range(width):
+            t, radius = _field(math, x / width, y / height, p)
+            if levels:
+                t = min(math.floor(t * levels) / (levels - 1), 1.0)
+            seg = min(max(t, 0.0), 1.0) * (len(palette) - 1)
+            index = min(int(seg), len(palette) - 2)
+            frac = seg - index
+            low, high = palette[index], palette[index + 1]
+            rgb = [low[c] + (high[c] - low[c]) * frac for c in range(3)]
+            if vignette:
+                rgb = [c * (1 - vignette * min(radius / 0.75, 1.0)) for c in rgb]
+            if grid and (x % grid == 0 or y % grid == 0):
+                rgb = [(c + g) / 2 for c, g in zip(rgb, GRID_COLOR)]
+            raw.extend(min(max(int(c + 0.5), 0), 255) for c in rgb)
+    return bytes(raw)
+
+
+def encode_png(width: int, height: int, raw_rows: bytes, level: int = 6) -> bytes:
+    """8-bit RGB PNG from filter-prefixed scanlines, deflated with zlib."""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw_rows, level))
+            + chunk(b"IEND", b""))
+
+
+def render_png(prompt: str, style: str, size: Tuple[int, int] = DEFAULT_SIZE) -> bytes:
+    width, height = size
+    params, spec = render_params(prompt, style), STYLES[style]
+    render = _render_rows_numpy if np is not None else _render_rows_python
+    return encode_png(width, height, render(width, height, params, spec))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+def _render_job(prompt: str, style: str, size: Tuple[int, int], target: str) -> float:
+    """Worker: renders one image straight to `target`; returns the render time in ms."""
+    start = time.perf_counter()
+    with span("visualizer.render", style=style, pixels=size[0] * size[1]):
+        _write_atomic(Path(target), render_png(prompt, style, size))
+    return (time.perf_counter() - start) * 1000
+
+
+# === LDM-VizCore (Procedural Visual Generator) ===
 class Visualizer:
-    def __init__(self):
-        self.styles = ["futuristic", "realistic", "sketch", "digital art", "3D render", "blueprint"]
+    """
+    Renders deterministic procedural PNGs from a prompt and style. Rendered images are kept
+    in a content-addressed cache keyed by (prompt, style, size), so repeats are a file copy.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, use_cache: bool = True,
+                 max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.styles = list(STYLES)
+        self.cache = DiskCache("visuals", root=cache_dir, max_entries=max_entries, max_bytes=max_bytes,
+                               suffix=".png") if use_cache else None
+        self.hits = 0
+        self.misses = 0
 
-    def generate(self, prompt: str, output_dir: str = "quill_visuals") -> Path:
-        print(f"[bold cyan]🖼️ LDM-VizCore generating image from:[/bold cyan] '{prompt}'")
+    def pick_style(self, prompt: str) -> str:
+        return self.styles[hashlib.md5(prompt.encode()).digest()[0] % len(self.styles)]
 
-        # Simulate style and image name
-        style = random.choice(self.styles)
+    def output_path(self, prompt: str, style: str, size: Tuple[int, int], output_dir: str) -> Path:
         slug = hashlib.md5(prompt.encode()).hexdigest()[:8]
-        image_name = f"viz_{slug}_{style.replace(' ', '_')}.png"
+        return Path(output_dir) / f"viz_{slug}_{style.replace(' ', '_')}_{size[0]}x{size[1]}.png"
 
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        file_path = output_path / image_name
+    def cache_key(self, prompt: str, style: str, size: Tuple[int, int]) -> str:
+        return DiskCache.make_key(RENDERER_VERSION, prompt, style, list(size))
 
-        # Simulate image generation
-        with open(file_path, "wb") as f:
-            f.write(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+    def generate(self, prompt: str, output_dir: str = "quill_visuals", style: Optional[str] = None,
+                 size: Tuple[int, int] = DEFAULT_SIZE, quiet: bool = False) -> Path:
+        style = self._resolve_style(prompt, style)
+        if not quiet:
+            print(f"[bold cyan]🖼️ LDM-VizCore generating image from:[/bold cyan] '{prompt}' ({style}, "
+                  f"{size[0]}x{size[1]})")
 
-        print(f"[green]✔ Visual artifact created at:[/green] {file_path.resolve()}")
+        file_path = self.output_path(prompt, style, size, output_dir)
+        key = self.cache_key(prompt, style, size)
+        with span("visualizer.generate", style=style, pixels=size[0] * size[1]) as timer:
+            cached = self.cache.get_file(key) if self.cache is not None else None
+            hit = cached is not None
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                _render_job(prompt, style, size, str(self.cache.path_for(key) if self.cache else file_path))
+                cached = self.cache.put_file(key) if self.cache is not None else None
+            if cached is not None:
+                _publish(cached, file_path)
+            timer.set(cache="hit" if hit else "miss")
+        count("visualizer_images", style=style, cache="hit" if hit else "miss")
+
+        if not quiet:
+            print(f"[green]✔ Visual artifact created at:[/green] {file_path.resolve()}")
         return file_path
 
+    def generate_batch(self, batch_file: str, output_dir: str = "quill_visuals", style: Optional[str] = None,
+                       size: Tuple[int, int] = DEFAULT_SIZE, workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        Renders every prompt in a JSONL/text batch file on a process pool. Cache hits and
+        duplicate prompts in the batch are served without rendering again. Lines without a
+        usable prompt or style are reported and skipped.
+        """
+        source = Path(batch_file)
+        if not source.exists():
+            raise FileNotFoundError(f"Batch file '{source}' not found.")
+        workers = workers or os.cpu_count() or 1
+        print(f"[bold cyan]🖼️ LDM-VizCore batch mode:[/bold cyan] {source} → {output_dir} ({workers} processes)")
+
+        images = rendered = skipped = 0
+        waiting: Dict[Path, List[Path]] = {}  # render target → output files that need it
+        keys: Dict[Path, str] = {}  # render target → cache key, when caching
+        start = time.perf_counter()
+        render = worker_job(_render_job)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Dict = {}
+            jobs = _read_jobs(source)
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < workers * 4:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    try:
+                        if "error" in job:
+                            raise ValueError(job["error"])
+                        job_style = self._resolve_style(job["prompt"], job.get("style") or style)
+                    except ValueError as e:
+                        print(f"[yellow]⚠ Skipping {source}, {e}[/yellow]")
+                        skipped += 1
+                        continue
+                    out = self.output_path(job["prompt"], job_style, size, output_dir)
+                    images += 1
+                    key = self.cache_key(job["prompt"], job_style, size)
+                    target = self.cache.path_for(key) if self.cache is not None else out
+                    if target in waiting:
+                        waiting[target].append(out)
+                    elif self.cache is not None and self.cache.get_file(key) is not None:
+                        self.hits += 1
+                        _publish(target, out)
+                    else:
+                        self.misses += 1
+                        waiting[target] = [out]
+                        keys[target] = key
+                        pending[pool.submit(render, job["prompt"], job_style, size, str(target))] = target
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target = pending.pop(future)
+                    collect(future.result())
+                    rendered += 1
+                    if self.cache is not None:
+                        self.cache.put_file(keys.pop(target))
+                    for out in waiting.pop(target):
+                        if out != target:
+                            _publish(target, out)
+
+        elapsed = time.perf_counter() - start
+        stats = {"images": images, "rendered": rendered, "cached": images - rendered, "skipped": skipped,
+                 "elapsed_s": round(elapsed, 3), "images_per_s": round(images / elapsed, 2) if elapsed > 0 else 0.0}
+        print(f"[green]✔ {images} images in {output_dir} ({rendered} rendered, {stats['cached']} from cache) "
+              f"at {stats['images_per_s']} images/s[/green]")
+        return stats
+
+    def _resolve_style(self, prompt: str, style: Optional[str]) -> str:
+        if style is None:
+            return self.pick_style(prompt)
+        if style not in STYLES:
+            raise ValueError(f"Unknown style '{style}'. Choose from: {', '.join(STYLES)}")
+        return style
+
+
+def _publish(source: Path, dest: Path) -> None:
+    """Places a cached image at `dest`, skipping the copy when an identical file is already there."""
+    try:
+        if dest.stat().st_size == source.stat().st_size and dest.read_bytes() == source.read_bytes():
+            return
+    except FileNotFoundError:
+        pass
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    partial = dest.with_name(f"{dest.name}.{os.getpid()}.part")
+    shutil.copyfile(source, partial)
+    os.replace(partial, dest)
+
+
+def _read_jobs(batch_file: Path) -> Iterator[Dict]:
+    """
+    Lazily yields jobs: JSON objects with `prompt` (and optional `style`), JSON strings or plain
+    text lines. Other JSON values count as plain text; an object without a string `prompt`
+    (or with a non-string `style`) yields an `error` job.
+    """
+    with batch_file.open("r") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = line
+            if not isinstance(entry, dict):
+                yield {"prompt": entry if isinstance(entry, str) else line}
+            elif not isinstance(entry.get("prompt"), str) or not isinstance(entry.get("style", ""), (str, type(None))):
+                yield {"error": f"line {lineno}: expected an object with a string 'prompt' (and optional 'style')"}
+            else:
+                yield entry
+
 
 # === CLI Entry ===
-def visualize(prompt: str):
-    engine = Visualizer()
-    engine.generate(prompt)
\ No newline at end of file
+@lru_cache(maxsize=1)
+def shared_visualizer() -> Visualizer:
+    return Visualizer()
+
+
+def visualize(prompt: Optional[str] = None, style: Optional[str] = None, size: str = "512",
+              batch: Optional[str] = None, output_dir: str = "quill_visuals", workers: Optional[int] = None,
+              use_cache: bool = True):
+    engine = shared_visualizer() if use_cache else Visualizer(use_cache=False)
+    dims = parse_size(size)
+    if batch:
+        return engine.generate_batch(batch, output_dir=output_dir, style=style, size=dims, workers=workers)
+    if not prompt:
+        raise ValueError("Provide a prompt or a batch file.")
+    return engine.generate(prompt, output_dir=output_dir, style=style, size=dims)
@@ -0,0 +1,75 @@
+from src.agents import AgentRuntime, AgentTask, BaseAgent, ChatAgent
+import asyncio
+
+
+class SleepyAgent(BaseAgent):
+    def __init__(self, name):
+        super().__init__(name)
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def arun(self, seconds):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(seconds)
+            return f"slept {seconds}"
+        finally:
+            self.active -= 1
+
+    def cache_key(self, seconds):
+        return f"sleep:{seconds}"
+
+
+def test_runtime_limits_concurrency_times_out_and_shares_results():
+    sleepy = SleepyAgent("sleepy")
+    runtime = AgentRuntime()
+    runtime.register(sleepy, max_concurrency=2, timeout=0.2)
+    runtime.register(ChatAgent(name="chat"), max_concurrency=4)
+
+    tasks = [AgentTask("sleepy", 0.01 * i) for i in range(1, 6)]
+    tasks += [AgentTask("sleepy", 0.05), AgentTask("sleepy", 0.05), AgentTask("sleepy", 5), AgentTask("nobody")]
+    results = runtime.run(tasks, follow_up=lambda r: [AgentTask("chat", r.output)]
+                          if r.status == "ok" and r.agent != "chat" else [])
+
+    by_status = {}
+    for result in results:
+        by_status.setdefault((result.agent, result.status), []).append(result)
+    assert sleepy.peak == 2
+    assert len(by_status[("sleepy", "timeout")]) == 1
+    assert len(by_status[("sleepy", "cached")]) == 2  # both duplicate 0.05s tasks waited for the first one
+    assert sleepy.calls == 6
+    assert len(by_status[("chat", "ok")]) == 5
+    assert by_status[("nobody", "error")][0].error == "Unknown agent 'nobody'"
+
+    report = runtime.report(1.0)
+    assert report["sleepy"]["tasks"] == 8 and report["chat"]["tasks_per_s"] == 5.0
+
+    again = runtime.run([AgentTask("sleepy", 0.01)])
+    assert again[0].status == "cached" and again[0].output == "slept 0.01"
+
+
+def test_review_workload_summarizes_files_with_findings(tmp_path):
+    from src.agents.runtime import review_workload, summarize_findings
+    from src.agents import CodeReviewAgent
+
+    (tmp_path / "clean.py").write_text("x = 1\n")
+    (tmp_path / "noisy.py").write_text("print('hi')\n")
+    runtime = AgentRuntime()
+    runtime.register(CodeReviewAgent(name="reviewer"))
+    runtime.register(ChatAgent(name="summarizer"))
+    results = runtime.run(review_workload(str(tmp_path)), follow_up=summarize_findings())
+    summaries = [r.output for r in results if r.agent == "summarizer"]
+    assert len(summaries) == 1 and "noisy.py" in summaries[0] and "print()" in summaries[0]
+
+
+def test_follow_up_chains_stop_at_max_depth():
+    runtime = AgentRuntime()
+    runtime.register(ChatAgent(name="ping"))
+    runtime.register(ChatAgent(name="pong"))
+    bounce = {"ping": "pong", "pong": "ping"}
+    results = runtime.run([AgentTask("ping", "hello")],
+                          follow_up=lambda r: [AgentTask(bounce[r.agent], r.output), AgentTask(r.agent, r.output)])
+    assert [r.agent for r in results] == ["ping", "pong", "ping", "pong", "ping"]
@@ -0,0 +1,40 @@
+from src.backends import MicroBatcher, StubBackend
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_microbatcher_merges_concurrent_requests():
+    stub = StubBackend(call_overhead=0.001, per_item=0.0)
+    batcher = MicroBatcher(stub, window_ms=20, max_batch_size=16)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        outputs = list(pool.map(lambda i: batcher.generate("prompt", i), range(16)))
+    assert outputs == [stub.generate("prompt", i) for i in range(16)]
+    assert batcher.batches < 16
+
+
+def test_microbatcher_fails_requests_the_backend_did_not_answer():
+    import pytest
+
+    class ShortBackend(StubBackend):
+        def generate_batch(self, requests):
+            return super().generate_batch(requests)[:-1]
+
+    batcher = MicroBatcher(ShortBackend(call_overhead=0.0, per_item=0.0), window_ms=50, max_batch_size=2)
+    futures = [batcher.submit("prompt", i) for i in range(2)]
+    assert futures[0].result(timeout=5)
+    with pytest.raises(RuntimeError, match="1 outputs for a batch of 2"):
+        futures[1].result(timeout=5)
+
+    stub = StubBackend(call_overhead=0.0, per_item=0.0)
+    batcher = MicroBatcher(stub, window_ms=50, max_batch_size=2)
+    cancelled = batcher.submit("prompt", 3)
+    assert cancelled.cancel()
+    assert batcher.generate("prompt", 4) == stub.generate("prompt", 4)  # the collector kept going
+
+
+def test_codegen_and_agents_share_the_micro_batched_backend():
+    from src.backends import shared_backend
+    from src.codegen import shared_sampler
+
+    assert isinstance(shared_backend(), MicroBatcher)
+    model = shared_sampler(None, None, None).model
+    assert type(model).__name__ == "MicroBatcher" and model.identity == "qwnt-local-v1"
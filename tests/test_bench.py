@@ -0,0 +1,31 @@
+from src.bench import BENCHMARKS, Benchmark, bench, compare, run_benchmark
+import json
+
+
+def test_run_benchmark_reports_timings_and_memory_peak():
+    def setup(workdir, scale):
+        return lambda: [bytearray(1 << 16) for _ in range(scale)]
+
+    result = run_benchmark(Benchmark("alloc", "micro", setup, "allocates"), scale=4, repeat=3)
+    assert result["repeat"] == 3 and result["min_ms"] <= result["mean_ms"] <= result["p95_ms"] + 1e-9
+    assert result["peak_kib"] >= 4 * 64
+
+
+def test_compare_flags_only_regressions_past_the_threshold():
+    baseline = {"scale": 1, "benchmarks": {"a": {"mean_ms": 10.0}, "b": {"mean_ms": 10.0}}}
+    results = {"scale": 1, "benchmarks": {"a": {"mean_ms": 12.0}, "b": {"mean_ms": 20.0}, "new": {"mean_ms": 1.0}}}
+    regressions = compare(results, baseline, threshold=0.25)
+    assert [r["name"] for r in regressions] == ["b"]
+    assert results["benchmarks"]["a"]["change"] == 0.2
+
+
+def test_bench_writes_results_and_fails_against_a_faster_baseline(tmp_path):
+    output, baseline = tmp_path / "bench.json", tmp_path / "baseline.json"
+    assert bench(["codegen.sample"], repeat=2, output=str(output), baseline=str(baseline), save_baseline=True)
+    saved = json.loads(baseline.read_text())
+    assert set(saved["benchmarks"]) == {"codegen.sample"} and "p95_ms" in saved["benchmarks"]["codegen.sample"]
+
+    saved["benchmarks"]["codegen.sample"]["mean_ms"] /= 100
+    baseline.write_text(json.dumps(saved))
+    assert not bench(["codegen.sample"], repeat=2, output=str(output), baseline=str(baseline))
+    assert "codegen.sample" in BENCHMARKS
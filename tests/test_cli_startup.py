@@ -0,0 +1,36 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+ENGINE_MODULES = {"codegen", "debugger", "uigen", "translate", "validate", "pipeline", "yaml",
+                  "mentor", "visualizer", "deploy", "backends", "cache"}
+BUDGET_MS = float(os.environ.get("QUILL_STARTUP_BUDGET_MS", "100"))
+
+
+def _import_times(*args):
+    """Cumulative ms per imported module, plus the total of top-level imports under "*"."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args],
+                            cwd=SRC, capture_output=True, text=True, check=True)
+    times = {"*": 0.0}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative) / 1000.0
+            if not name.startswith("  "):
+                times["*"] += int(cumulative) / 1000.0
+    return times
+
+
+def test_cli_startup_is_lazy_and_within_budget():
+    times = _import_times("-c", "import main")
+    assert not ENGINE_MODULES & set(times), "command modules must be imported on dispatch"
+    assert times["main"] < BUDGET_MS, f"CLI import took {times['main']:.1f} ms (budget {BUDGET_MS} ms)"
+
+
+def test_help_skips_rich_and_stays_within_budget():
+    runs = [_import_times("main.py", "--help") for _ in range(3)]  # best of three evens out a busy machine
+    assert not (ENGINE_MODULES | {"rich", "typer.rich_utils"}) & set(runs[0]), "--help must not load rich or engines"
+    best = min(times["*"] for times in runs)
+    assert best < BUDGET_MS, f"--help imports took {best:.1f} ms (budget {BUDGET_MS} ms)"
@@ -1,8 +1,104 @@
 from src.codegen import generate_code
 import os
+import pytest
 
-def test_generate_code_creates_output():
+def test_generate_code_creates_output(tmp_path):
     prompt = "Build a basic Flask API"
-    output_dir = "test_output"
-    generate_code(prompt, output_dir=output_dir)
+    output_dir = tmp_path / "test_output"
+    generate_code(prompt, output_dir=str(output_dir), use_cache=False)
     assert os.path.exists(f"{output_dir}/main.py")
+
+
+def test_generate_batch_streams_jsonl(tmp_path):
+    from src.codegen import generate_batch
+    import json
+
+    batch_file = tmp_path / "prompts.jsonl"
+    batch_file.write_text('{"id": "a", "prompt": "Flask API"}\n"FastAPI service"\n')
+    out_file = tmp_path / "results.jsonl"
+    stats = generate_batch(str(batch_file), output_file=str(out_file), workers=2, use_cache=False)
+    records = [json.loads(line) for line in out_file.read_text().splitlines()]
+    assert stats["prompts"] == 2
+    assert {r["id"] for r in records} == {"a", 2}
+    assert all(r["code"] for r in records)
+
+
+def test_generate_batch_reports_bad_lines_and_honours_the_budget(tmp_path):
+    from src.codegen import generate_batch
+    import json
+
+    batch_file = tmp_path / "prompts.jsonl"
+    batch_file.write_text('{"prompt": "ok"}\n{not json\n{"id": "x"}\n[1]\n"also ok"\n')
+    out_file = tmp_path / "results.jsonl"
+    stats = generate_batch(str(batch_file), output_file=str(out_file), workers=1, use_cache=False,
+                           score_threshold=0.0)
+    records = {r["id"]: r for r in map(json.loads, out_file.read_text().splitlines())}
+    assert stats["prompts"] == 2 and stats["failures"] == 3
+    assert records[1]["code"] and records[5]["code"]
+    assert "invalid JSON" in records[2]["error"] and "'prompt'" in records[3]["error"] and 4 in records
+
+
+def test_sampler_cache_hits_on_repeat(tmp_path):
+    from src.codegen import LocalModel, QuantumSampler
+    from src.cache import DiskCache
+
+    cache = DiskCache("codegen", root=str(tmp_path), max_entries=1)
+    sampler = QuantumSampler(LocalModel(), cache=cache)
+    first = sampler.sample("Build a Flask API")
+    assert sampler.sample("Build a Flask API") == first
+    sampler.sample("Another prompt")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["evictions"]) == (1, 2, 1, 1)
+
+
+def test_sampler_stops_early_on_score_threshold():
+    from src.codegen import LocalModel, QuantumSampler
+    import time
+
+    class SlowModel(LocalModel):
+        def generate(self, prompt, seed=None):
+            time.sleep(0.02)
+            return super().generate(prompt, seed)
+
+    full = QuantumSampler(LocalModel(), num_variants=8).sample_detailed("prompt")
+    assert not full.stopped_early and full.variants_scored == 8
+
+    sampler = QuantumSampler(SlowModel(), num_variants=8, max_workers=1, score_threshold=0.0)
+    result = sampler.sample_detailed("prompt")
+    assert result.stopped_early
+    assert result.variants_scored < 8
+
+    class StuckModel(LocalModel):
+        def generate(self, prompt, seed=None):
+            time.sleep(1)
+            return super().generate(prompt, seed)
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        QuantumSampler(StuckModel(), num_variants=2, time_budget=0.05).sample_detailed("prompt")
+    assert time.perf_counter() - start < 0.5
+
+
+def test_generate_project_writes_a_consistent_tree_and_reuses_scaffolds(tmp_path):
+    from src.cache import DiskCache
+    from src.codegen import LocalModel, QuantumSampler, ScaffoldIndex, generate_project
+
+    scaffolds = ScaffoldIndex(DiskCache("scaffolds", root=str(tmp_path / "cache")))
+    sampler = QuantumSampler(LocalModel())
+    stats = generate_project("todo service", "Todo-API", output_dir=str(tmp_path), sampler=sampler,
+                             scaffolds=scaffolds)
+    root = tmp_path / "Todo-API"
+    files = sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+    assert stats["files"] == len(files) == 10 and "todo_api/app.py" in files and "tests/test_app.py" in files
+    assert stats["bytes"] == sum((root / f).stat().st_size for f in files)
+    assert not list(root.rglob("*.part"))
+    assert stats["kind"] in (root / "requirements.txt").read_text()
+    assert "from todo_api.app import app" in (root / "tests/test_app.py").read_text()
+
+    forced = generate_project("dashboard", "dash", output_dir=str(tmp_path), kind="streamlit", sampler=sampler,
+                              scaffolds=ScaffoldIndex(scaffolds.cache))
+    assert forced["scaffolds_built"] == (0 if stats["kind"] == "streamlit" else 1)
+    assert "import streamlit" in (tmp_path / "dash" / "dash" / "app.py").read_text()
+    again = generate_project("dashboard", "dash", output_dir=str(tmp_path), kind="streamlit", sampler=sampler,
+                             scaffolds=ScaffoldIndex(scaffolds.cache))
+    assert again["scaffolds_built"] == 0  # loaded from the on-disk index
@@ -1,11 +1,25 @@
 from src.agents.codereview import CodeReviewAgent
 import os
+from pathlib import Path
 
-def test_codereview_flags_issues():
-    test_file = "test_script.py"
+def test_codereview_flags_issues(tmp_path):
+    test_file = str(tmp_path / "test_script.py")
     with open(test_file, "w") as f:
-        f.write("print('This is a test')\\n" + "a = 'x' * 120\\n")
+        f.write("print('This is a test')\n" + "a = '" + "x" * 120 + "'\n")
     agent = CodeReviewAgent(name="QA")
     result = agent.run(test_file)
     assert "Line 1 uses print()" in result
     assert "Line 2 too long" in result
+
+
+def test_codereview_structured_findings_for_directory(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("x = 1\n    print(x)\n")
+    (pkg / "b.py").write_text("# " + "é" * 98 + "\n" + "y = '" + "z" * 100 + "'\n")
+    (pkg / "empty.py").write_text("")
+    findings = CodeReviewAgent(name="QA", workers=2).review(str(pkg))
+    assert sorted((Path(f.file).name, f.line, f.rule_id) for f in findings) == [
+        ("a.py", 2, "QR002"),
+        ("b.py", 2, "QR001"),
+    ]
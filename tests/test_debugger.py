@@ -0,0 +1,65 @@
+from src.debugger import _parse_black, _parse_flake8, _parse_mypy
+
+
+def test_tool_output_is_parsed_into_findings():
+    flake8 = _parse_flake8("src/app.py:3:80: E501 line too long (88 > 79 characters)\n", "")
+    assert (flake8[0].file, flake8[0].line, flake8[0].column, flake8[0].code) == ("src/app.py", 3, 80, "E501")
+
+    mypy = _parse_mypy('src/app.py:7:5: error: Incompatible return value type  [return-value]\n'
+                       'src/app.py:7:5: note: See docs\n', "")
+    assert len(mypy) == 1 and mypy[0].code == "return-value" and mypy[0].line == 7
+
+    black = _parse_black("", "would reformat src/app.py\nOh no! 1 file would be reformatted.\n")
+    assert [f.file for f in black] == ["src/app.py"]
+
+
+def test_unchanged_files_are_served_from_cache_but_mypy_always_runs(tmp_path, monkeypatch):
+    from src.debugger import CodeDebugger
+    from src.toolrunner import FakeTool, fake_tools
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    a, b = tmp_path / "a.py", tmp_path / "b.py"
+    a.write_text("x=1\n")
+    b.write_text("y = 2\n")
+    tools = {
+        "flake8": FakeTool(stdout=f"{a}:1:2: E225 missing whitespace around operator\n", returncode=1),
+        "black": FakeTool(),
+        "mypy": FakeTool(),
+    }
+
+    def run():
+        calls.write_text("")
+        findings = CodeDebugger(str(tmp_path)).run_all()
+        runs = [json.loads(line) for line in calls.read_text().splitlines()]
+        return [(f.tool, f.code) for f in findings], [args for args in runs if args != ["--version"]]
+
+    with fake_tools(tmp_path / "bin", tools) as calls:
+        first, _ = run()
+        second, rerun = run()
+        b.write_text("y = 3\n")
+        _, after_edit = run()
+        (tmp_path / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+        _, after_config = run()
+    assert first == second == [("flake8", "E225")]
+    assert [args[0] for args in rerun] == ["--show-column-numbers"]  # only mypy ran again
+    assert sorted(args for args in after_edit if args[0] != "--show-column-numbers") == [["--check", str(b)], [str(b)]]
+    assert sorted(args for args in after_config if args[0] != "--show-column-numbers") == [[str(a), str(b)]]
+
+
+def test_changed_files_lists_modified_and_untracked_python_files(tmp_path, monkeypatch):
+    from pathlib import Path
+    from src.debugger import changed_files
+    import subprocess
+
+    monkeypatch.chdir(tmp_path)
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "-c", "commit.gpgsign=false"]
+    subprocess.run(git + ["init", "-q"], check=True)
+    for name in ("kept.py", "edited.py", "notes.txt"):
+        (tmp_path / name).write_text("x = 1\n")
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], check=True)
+    (tmp_path / "edited.py").write_text("x = 2\n")
+    (tmp_path / "new.py").write_text("")
+    (tmp_path / "notes.txt").write_text("changed\n")
+    assert changed_files(".") == [Path("edited.py"), Path("new.py")]
@@ -0,0 +1,54 @@
+from src.deploy import DeployEngine
+
+
+def test_directory_deploy_only_uploads_changed_assets(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "index.html").write_text("<html>" + "hello " * 200 + "</html>")
+    (site / "app.js").write_text("console.log('v1');")
+    engine = DeployEngine(str(site), state_dir=str(tmp_path / "state"))
+    dest = tmp_path / "public"
+
+    first = engine.deploy("dir", dest=str(dest))
+    assert sorted(first["changed"]) == ["app.js", "index.html"]
+    assert (dest / "index.html.gz").exists()
+
+    (site / "app.js").write_text("console.log('v2');")
+    second = engine.deploy("dir", dest=str(dest))
+    assert second["changed"] == ["app.js"]
+    assert second["bytes_skipped"] == (site / "index.html").stat().st_size
+    assert (dest / "app.js").read_text() == "console.log('v2');"
+
+    (site / "app.js").unlink()
+    third = engine.deploy("dir", dest=str(dest))
+    assert third["removed"] == ["app.js"] and not (dest / "app.js").exists()
+
+
+def test_manifest_is_kept_per_destination(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "index.html").write_text("<html></html>")
+    engine = DeployEngine(str(site), state_dir=str(tmp_path / "state"))
+
+    assert engine.deploy("dir", dest=str(tmp_path / "a"))["changed"] == ["index.html"]
+    assert engine.deploy("dir", dest=str(tmp_path / "b"))["changed"] == ["index.html"]
+    assert (tmp_path / "b" / "index.html").exists()
+    assert engine.deploy("dir", dest=str(tmp_path / "a"))["changed"] == []
+
+
+def test_hosting_targets_get_the_full_tree_including_hidden_config(tmp_path):
+    from src.toolrunner import FakeTool, fake_tools
+
+    site = tmp_path / "site"
+    (site / ".vercel").mkdir(parents=True)
+    (site / "firebase.json").write_text("{}")
+    (site / ".firebaserc").write_text("{}")
+    (site / ".vercel" / "project.json").write_text("{}")
+    (site / "index.html").write_text("<html></html>")
+    engine = DeployEngine(str(site), state_dir=str(tmp_path / "state"))
+
+    with fake_tools(tmp_path / "bin", {"firebase": FakeTool(stdout="Deploy complete!\n")}):
+        plan = engine.deploy("firebase")
+    assert plan["uploaded"] and plan["staging"] == site
+    assert set(plan["manifest"]) == {".firebaserc", ".vercel/project.json", "firebase.json", "index.html"}
+    assert engine.stage("firebase")["changed"] == []
@@ -0,0 +1,25 @@
+from src.mentor import KnowledgeIndex, MentorAI, knowledge_documents, load_index
+
+
+def test_index_ranks_by_relevance_and_round_trips(tmp_path):
+    (tmp_path / "index-0123456789abcdef.bin").write_bytes(b"outdated")
+    index = load_index(str(tmp_path))
+    assert [path.name for path in tmp_path.glob("index-*.bin")] == [f"index-{index.digest[:16]}.bin"]
+    assert load_index(str(tmp_path)).postings == index.postings
+
+    hits = index.search("how do python generators work?", lang="python", kind="example")
+    assert hits[0][1]["text"].startswith("Generators")
+    assert index.search("lifetimes", lang="python") == []
+    assert KnowledgeIndex.from_bytes(index.to_bytes()).docs == knowledge_documents()
+
+
+def test_mentor_answers_from_the_question_and_caches_responses(tmp_path):
+    mentor = MentorAI(load_index(str(tmp_path)))
+    answer = mentor.ask("What is a generator?", "python", "expert")
+    assert answer.startswith("[4] Expert") and "Generators allow lazy iteration" in answer
+    assert mentor.ask("what are generators", "python", "expert") == answer
+    assert mentor.cache_info().hits == 1
+
+    # Questions with no matching terms fall back to the level's example.
+    assert "dynamically typed" in mentor.ask("hmm?", "python", "beginner")
+    assert "not available" in mentor.ask("anything", "cobol")
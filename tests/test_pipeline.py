@@ -0,0 +1,25 @@
+from src.pipeline import PipelineScheduler, Stage
+from src.toolrunner import ToolRunner
+import sys
+
+
+def _stage(name, code, deps=None):
+    return Stage(name, [sys.executable, "-c", code], f"running {name}", deps)
+
+
+def test_scheduler_skips_dependents_and_fails_fast():
+    results = PipelineScheduler([
+        _stage("ok", "print('fine')"),
+        _stage("bad", "import sys; sys.exit(3)"),
+        _stage("after_bad", "print('never')", deps=["bad"]),
+    ]).run()
+    assert results["ok"].status == "passed"
+    assert results["bad"].status == "failed" and results["bad"].returncode == 3
+    assert results["after_bad"].status == "skipped"
+
+    results = PipelineScheduler([
+        _stage("bad", "import sys; sys.exit(1)"),
+        _stage("slow", "import time; time.sleep(30)"),
+    ], fail_fast=True, runner=ToolRunner(max_processes=2)).run()  # both start, whatever the CPU count
+    assert results["slow"].status == "cancelled"
+    assert results["slow"].wall_s < 10
@@ -0,0 +1,55 @@
+from src.schema import CompiledSchema, load_schema
+import json
+
+
+def test_compiled_schema_reports_pointer_paths_and_resolves_refs():
+    schema = CompiledSchema({
+        "$defs": {"node": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer", "minimum": 1},
+                           "children": {"type": "array", "items": {"$ref": "#/$defs/node"}}},
+            "additionalProperties": False,
+        }},
+        "$ref": "#/$defs/node",
+    })
+    assert schema.is_valid({"id": 1, "children": [{"id": 2, "children": []}]})
+    assert schema.errors({"id": True, "children": [{"id": 0}, {"x": 1}]}) == [
+        ("/id", "expected integer, got boolean"),
+        ("/children/0/id", "minimum: expected at least 1, got 0"),
+        ("/children/1", "missing required property 'id'"),
+        ("/children/1", "unexpected property 'x'"),
+    ]
+    assert CompiledSchema({"enum": ["a", 1]}).errors(1.0) == []
+    assert len(CompiledSchema({"oneOf": [{"type": "number"}, {"type": "integer"}]}).errors(3)) == 1
+
+
+def test_load_schema_compiles_once_until_the_file_changes(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"type": "string"}))
+    first = load_schema(str(path))
+    assert load_schema(str(path)) is first
+    path.write_text(json.dumps({"type": "integer", "maximum": 10}))
+    assert load_schema(str(path)) is not first and not load_schema(str(path)).is_valid(11)
+
+
+def test_unsupported_keywords_are_rejected_not_ignored():
+    import pytest
+    from src.schema import SchemaError
+
+    with pytest.raises(SchemaError, match="if, then"):
+        CompiledSchema({"properties": {"a": {"if": {"type": "string"}, "then": {"minLength": 2}}}})
+    with pytest.raises(SchemaError, match="contains"):
+        CompiledSchema({"type": "array", "contains": {"const": 1}})
+    with pytest.warns(UserWarning, match="format"):
+        assert CompiledSchema({"type": "string", "format": "email"}).is_valid("not an email")
+    assert CompiledSchema({"properties": {"if": {"type": "string"}}}).is_valid({"if": "x"})
+
+
+def test_multiple_of_handles_values_beyond_float_range():
+    cents = CompiledSchema({"multipleOf": 0.01})
+    assert cents.is_valid(0.3) and not cents.is_valid(0.305)
+    assert not cents.is_valid(1e308)  # no OverflowError; 0.01 has no exact binary form
+    assert CompiledSchema({"multipleOf": 0.5}).is_valid(1e308)
+    assert CompiledSchema({"multipleOf": 0.5}).is_valid(10 ** 400)
+    assert CompiledSchema({"multipleOf": 3}).errors(10 ** 400 + 1) == [("", f"{10 ** 400 + 1} is not a multiple of 3")]
@@ -0,0 +1,78 @@
+from src.server import QwntServer, forward
+import threading
+
+
+def test_server_runs_forwarded_commands(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the mentor's cache lands in the caller's working directory
+    address = str(tmp_path / "qwnt.sock")
+    server = QwntServer(address, max_concurrency=2)
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = forward(["mentor", "What is a generator?"], address=address, timeout=30)
+        assert response["exit_code"] == 0
+        assert "Mentor AI Activated" in response["output"]
+        assert forward(["no-such-command"], address=address, timeout=30)["exit_code"] == 2
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+    assert forward(["mentor", "x"], address=address) is None
+
+
+def test_output_from_threads_started_by_a_request_is_captured():
+    import io
+    import sys
+    from src.server import _RequestSinks, _ThreadLocalStream
+
+    sinks = _RequestSinks()
+    stream = _ThreadLocalStream(io.StringIO(), sinks)
+    buffer = io.StringIO()
+    sinks.install()
+    try:
+        sinks.capture(buffer)
+        worker = threading.Thread(target=lambda: print("from a pool thread", file=stream))
+        worker.start()
+        worker.join()
+        sinks.capture(None)
+        late = threading.Thread(target=lambda: print("after the request", file=stream))
+        late.start()
+        late.join()
+    finally:
+        sinks.uninstall()
+    assert buffer.getvalue() == "from a pool thread\n"
+    assert stream._fallback.getvalue() == "after the request\n"
+    assert threading.Thread.start.__name__ == "start" and sys.stdout is not stream
+
+
+def test_tcp_requests_need_the_token(tmp_path, monkeypatch):
+    import json
+    import socket
+    import src.server as server_module
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(server_module, "TOKEN_FILE", tmp_path / "cache" / "server-token")
+    server = QwntServer(("127.0.0.1", 0), max_concurrency=1)
+    server.start()
+    address = server._server.server_address
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert (tmp_path / "cache" / "server-token").stat().st_mode & 0o777 == 0o600
+        assert forward(["mentor", "What is a generator?"], address=address, timeout=30)["exit_code"] == 0
+        with socket.create_connection(address, timeout=30) as sock:
+            sock.sendall((json.dumps({"argv": ["mentor", "x"], "token": "guess"}) + "\n").encode())
+            reply = json.loads(sock.makefile("rb").readline())
+        assert reply["exit_code"] == 77
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def test_client_falls_back_to_running_in_process(tmp_path, monkeypatch):
+    import src.client as client
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(client, "forward", lambda argv: None)
+    assert client.main(["mentor", "What is a generator?"]) == 0
+    assert client.main(["no-such-command"]) == 2
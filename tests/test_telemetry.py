@@ -0,0 +1,62 @@
+from src.telemetry import Telemetry
+import json
+import os
+import threading
+
+
+def test_disabled_recorder_is_a_no_op():
+    telemetry = Telemetry()
+    with telemetry.span("idle") as timer:
+        timer.set(ignored=True)
+    telemetry.count("idle")
+    assert telemetry.summary() == [] and "idle" not in telemetry.to_prometheus()
+
+
+def test_spans_and_counters_export_to_prometheus_and_chrome_trace(tmp_path):
+    telemetry = Telemetry()
+    assert telemetry.start(profile=True) and not telemetry.start()
+
+    def work(i):
+        with telemetry.span("engine.step", item=i):
+            bytearray(1 << 12)
+        telemetry.count("engine_items", kind="even" if i % 2 == 0 else "odd")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    telemetry.stop()
+    written = telemetry.export(str(tmp_path))
+
+    metrics = written["prometheus"].read_text()
+    assert 'qwnt_span_seconds_count{span="engine.step"} 4' in metrics
+    assert 'qwnt_engine_items_total{kind="even"} 2' in metrics
+    assert "# TYPE qwnt_memory_peak_bytes gauge" in metrics
+
+    trace = json.loads(written["trace"].read_text())["traceEvents"]
+    spans = [event for event in trace if event["ph"] == "X"]
+    assert len(spans) == 4 and {event["args"]["item"] for event in spans} == {0, 1, 2, 3}
+    assert all("alloc_bytes" in event["args"] for event in spans)
+    assert written["profile"].stat().st_size > 0
+
+
+def test_worker_process_spans_are_merged_into_the_parent(tmp_path):
+    from src.validate import PARALLEL_MIN_FILES, validate_many
+    import telemetry  # the instance the engines record into (they import it by bare name)
+
+    files = PARALLEL_MIN_FILES + 4
+    for i in range(files):
+        (tmp_path / f"doc{i}.json").write_text(json.dumps({"id": i}))
+    recorder = telemetry.TELEMETRY
+    assert recorder.start()
+    try:
+        results = validate_many([str(tmp_path)], workers=2, use_cache=False)
+        spans = {name: calls for name, calls, _, _ in recorder.summary()}
+        events = list(recorder._events)
+    finally:
+        recorder.stop()
+        recorder.reset()
+    assert len(results) == files and spans["validate.file"] == files
+    pids = {event["pid"] for event in events if event["name"] == "validate.file"}
+    assert pids and os.getpid() not in pids
@@ -0,0 +1,52 @@
+from src.toolrunner import READ_CHUNK, FakeTool, ToolNotFoundError, ToolRunner, fake_tools, tool_version
+import json
+import sys
+import time
+
+import pytest
+
+
+def test_fake_tools_drive_the_debugger_offline(tmp_path):
+    from src.debugger import CodeDebugger
+
+    source = tmp_path / "app.py"
+    source.write_text("x=1\n")
+    tools = {
+        "flake8": FakeTool(stdout=f"{source}:1:2: E225 missing whitespace around operator\n", returncode=1),
+        "black": FakeTool(stderr=f"would reformat {source}\n", returncode=1),
+        "mypy": FakeTool(),
+    }
+    with fake_tools(tmp_path / "bin", tools) as calls:
+        findings = CodeDebugger(str(source), use_cache=False).run_all()
+        CodeDebugger(str(source), use_cache=False).run_all()
+        logged = [json.loads(line) for line in calls.read_text().splitlines()]
+        assert tool_version("flake8") == "fake 1.0"
+    assert sorted((f.tool, f.code) for f in findings) == [("black", ""), ("flake8", "E225")]
+    assert logged.count(["--version"]) == 3  # probed once per tool, then served from the cache
+
+
+def test_timeouts_kill_the_command_and_missing_tools_raise(tmp_path):
+    with fake_tools(tmp_path / "bin", {"slowtool": FakeTool(sleep=30)}):
+        start = time.perf_counter()
+        result = ToolRunner().run(["slowtool"], timeout=0.3)
+    assert result.timed_out and not result.ok and time.perf_counter() - start < 10
+    with pytest.raises(ToolNotFoundError):
+        ToolRunner().run(["definitely-not-installed-tool"])
+
+
+def test_output_is_capped_and_processes_are_bounded():
+    runner = ToolRunner(max_processes=2, max_output_bytes=100)
+    lines = []
+    result = runner.run([sys.executable, "-c", "print('x' * 10_000); print('tail')"], on_line=lines.append)
+    assert result.truncated and len(result.stdout) == 100 and lines[-1] == "tail"
+
+    lines.clear()
+    flood = "import sys; sys.stdout.write('y' * (1 << 22)); sys.stdout.write('\\nend')"
+    result = runner.run([sys.executable, "-c", flood], on_line=lines.append)
+    assert result.truncated and len(result.stdout) == 100
+    assert [len(line) for line in lines] == [READ_CHUNK, 3] and lines[-1] == "end"
+
+    start = time.perf_counter()
+    futures = [runner.submit([sys.executable, "-c", "import time; time.sleep(0.3)"]) for _ in range(4)]
+    assert all(future.result().ok for future in futures)
+    assert time.perf_counter() - start >= 0.55
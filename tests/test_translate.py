@@ -1,9 +1,94 @@
 from src.translate import XLangTranslator
 import os
 
-def test_translation_creates_output():
-    with open("sample.js", "w") as f:
+def test_translation_creates_output(tmp_path):
+    source, output_dir = tmp_path / "sample.js", tmp_path / "translated"
+    with open(source, "w") as f:
         f.write("console.log('Hello');")
     translator = XLangTranslator("js", "py")
-    translator.translate_file("sample.js", output_dir="translated")
-    assert os.path.exists("translated/translated_sample.py")
+    translator.translate_file(str(source), output_dir=str(output_dir))
+    assert os.path.exists(output_dir / "translated_sample.py")
+
+
+def test_streaming_translation_matches_in_memory(tmp_path):
+    from src.translate import iter_chunks
+
+    source = tmp_path / "big.js"
+    body = "".join(f"function f{i}() {{\n  return {i};\n}}\n\n" for i in range(500))
+    source.write_text("const x = 1;\n" + body)
+    translator = XLangTranslator("js", "py")
+    streamed = translator.translate_file(str(source), output_dir=str(tmp_path / "s"), stream=True)
+    buffered = translator.translate_file(str(source), output_dir=str(tmp_path / "b"), stream=False)
+    assert streamed.read_text() == buffered.read_text()
+    chunks = list(iter_chunks(source.open()))
+    assert len(chunks) == 501 and chunks[1].startswith("function f0()")
+
+
+def test_directory_translation_is_incremental(tmp_path):
+    from src.translate import translate_many
+
+    src_dir = tmp_path / "src" / "pkg"
+    src_dir.mkdir(parents=True)
+    for name in ("a.js", "b.js", "notes.txt"):
+        (src_dir / name).write_text(f"// {name}\n")
+    out = tmp_path / "out"
+    assert translate_many("js", "py", str(tmp_path / "src"), output_dir=str(out), workers=2)["translated"] == 2
+    (src_dir / "a.js").write_text("// changed\n")
+    counts = translate_many("js", "py", str(tmp_path / "src"), output_dir=str(out), workers=2)
+    assert (counts["translated"], counts["skipped"]) == (1, 1)
+    assert (out / "pkg").is_dir()
+
+
+def test_language_index_and_detection(tmp_path):
+    from src.translate import detect_language, extension_for, resolve_language
+    from pathlib import Path
+
+    assert resolve_language("PY") == resolve_language(".py") == resolve_language("Python") == "python"
+    assert extension_for("golang") == "go" and extension_for("c++") == "cpp"
+    script = tmp_path / "tool"
+    script.write_text("#!/usr/bin/env python3\nprint('hi')\n")
+    snippet = tmp_path / "snippet"
+    snippet.write_text("package main\n\nfunc main() {\n}\n")
+    assert detect_language(Path(script)) == "python"
+    assert detect_language(Path(snippet)) == "golang"
+
+
+def test_extension_for_round_trips_for_every_language():
+    from src.translate import LANGUAGE_ALIASES, extension_for, resolve_language
+
+    for language in set(LANGUAGE_ALIASES.values()):
+        assert resolve_language(extension_for(language)) == language, language
+    assert extension_for("perl") == "pm" and resolve_language("nimrod") == "nim"
+
+
+def test_auto_mode_skips_data_files_and_refuses_colliding_outputs(tmp_path):
+    from src.translate import translate_many
+
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "app.js").write_text("function main() {}\n")
+    (src_dir / "app.ts").write_text("function main(): void {}\n")
+    (src_dir / "package.json").write_text('{"name": "app"}\n')
+    (src_dir / "config.yaml").write_text("debug: true\n")
+    out = tmp_path / "out"
+    counts = translate_many("auto", "py", str(src_dir), output_dir=str(out), workers=1)
+    assert (counts["translated"], counts["error"]) == (1, 1)
+    assert [p.name for p in out.glob("translated_*")] == ["translated_app.py"]
+    assert "function main() {}" in (out / "translated_app.py").read_text()  # the first claim wins
+
+
+def test_chunks_are_capped_and_failed_streams_leave_no_part_file(tmp_path, monkeypatch):
+    import pytest
+    from src.translate import iter_chunks
+
+    minified = "var a=1;" * 5000 + "\nfunction g() {}\n"
+    chunks = list(iter_chunks(iter([minified[:16000], minified[16000:]]), max_chunk_chars=1000))
+    assert "".join(chunks) == minified and max(len(c) for c in chunks) <= 1000
+
+    source = tmp_path / "app.js"
+    source.write_text(minified)
+    translator = XLangTranslator("js", "py")
+    monkeypatch.setattr(translator, "_translate_chunk", lambda chunk: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        translator.translate_file(str(source), output_dir=str(tmp_path / "out"), stream=True)
+    assert list((tmp_path / "out").iterdir()) == []
@@ -0,0 +1,39 @@
+from src.uigen import COMPONENT_SOURCES, TEMPLATES, generate_ui_matrix
+
+
+def test_compiled_templates_match_source_formatting():
+    for name, source in COMPONENT_SOURCES.items():
+        assert TEMPLATES[name].render(theme="indigo", year="2030") == source.format(theme="indigo", year="2030")
+
+
+def test_matrix_renders_every_theme_layout_pair(tmp_path):
+    pages = generate_ui_matrix(["slate", "rose"], {"landing": ["hero", "footer"], "full": ["hero", "pricing"]},
+                               output_dir=str(tmp_path))
+    assert len(pages) == 4
+    html = (tmp_path / "rose" / "full" / "index.html").read_text()
+    assert "bg-rose-900" in html and "Pricing Plans" in html and html.rstrip().endswith("</html>")
+
+
+def test_generate_ui_is_reproducible_and_skips_unchanged_writes(tmp_path):
+    from src.uigen import generate_ui
+    import os
+
+    first = generate_ui("slate", ["hero", "features", "pricing", "footer"], output_dir=str(tmp_path))
+    mtime = os.stat(first["path"]).st_mtime_ns
+    second = generate_ui("slate", ["hero", "features", "pricing", "footer"], output_dir=str(tmp_path))
+    assert first["sha256"] == second["sha256"]
+    assert first["written"] and not second["written"]
+    assert os.stat(first["path"]).st_mtime_ns == mtime
+
+
+def test_concurrent_page_writes_use_separate_temp_files(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.uigen import _write_page_file
+    import hashlib
+
+    target = tmp_path / "index.html"
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pages = list(pool.map(lambda year: _write_page_file(target, "slate", ["hero", "footer"], year),
+                              [2030, 2031] * 4))
+    assert not list(tmp_path.glob("*.part"))
+    assert hashlib.sha256(target.read_bytes()).hexdigest() in {page["sha256"] for page in pages}
@@ -0,0 +1,152 @@
+from src.validate import JsonStreamChecker, SchemaValidator
+import io
+import json
+from pathlib import Path
+
+
+def test_streaming_json_checker_matches_json_module():
+    doc = json.dumps({"items": [{"id": i, "name": f"né{i}", "tags": [True, None, -1.5e3]} for i in range(2000)]},
+                     indent=2)
+    checker = JsonStreamChecker(chunk_size=64)
+    assert checker.check(io.StringIO(doc)) is None
+
+    issue = checker.check(io.StringIO('{\n  "a": [1, 2,\n  ]\n}'))
+    assert (issue.line, issue.column) == (3, 3)
+    assert checker.check(io.StringIO('{"a": 1} 2')).message.startswith("Extra data")
+    assert checker.check(io.StringIO('[1, 2')).message == "Unexpected end of input"
+    assert checker.check(io.StringIO('{"a" 1}')) is not None
+
+
+def test_streaming_json_checker_handles_chunk_edges_and_fails_early():
+    tiny = JsonStreamChecker(chunk_size=3)
+    assert tiny.check(io.StringIO('[-2500.0, 1e+10, "a\\u00e9", true]')) is None
+    assert tiny.check(io.StringIO('[NaN]')) is not None and tiny.check(io.StringIO('[1, 2]  \n')) is None
+
+    class CountingReader(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            CountingReader.reads += 1
+            return super().read(size)
+
+    # A control character inside a huge string is reported without buffering the rest of it.
+    issue = JsonStreamChecker(chunk_size=1024).check(CountingReader('["' + "x" * 10 + "\n" + "y" * 1_000_000 + '"]'))
+    assert issue.message.startswith("Invalid token") and CountingReader.reads <= 2
+    issue = JsonStreamChecker(chunk_size=1024, max_token=4096).check(io.StringIO('["' + "x" * 100_000))
+    assert issue.message.startswith("Token longer than")
+
+
+def test_ndjson_and_multi_document_yaml_report_every_error(tmp_path):
+    records = tmp_path / "events.ndjson"
+    records.write_text('{"ok": 1}\n{"bad": }\n\n[1, 2]\n{oops}\n')
+    issues = SchemaValidator(str(records)).validate()
+    assert [i.line for i in issues] == [2, 5]
+
+    docs = tmp_path / "stack.yaml"
+    docs.write_text("a: 1\n---\nb: [1, 2\n---\nc: 3\n---\nd: {e\n")
+    issues = SchemaValidator(str(docs), max_errors=1).validate()
+    assert len(issues) == 1 and issues[0].line >= 3
+    assert len(SchemaValidator(str(docs)).validate()) == 2
+
+
+def test_large_json_takes_the_streaming_path(tmp_path, monkeypatch):
+    import src.validate as validate
+
+    monkeypatch.setattr(validate, "STREAM_THRESHOLD_BYTES", 0)
+    path = tmp_path / "big.json"
+    path.write_text('[\n  {"a": 1},\n  {"a": tru}\n]')
+    issues = validate.SchemaValidator(str(path)).validate()
+    assert [(i.line, i.column) for i in issues] == [(3, 9)]
+
+
+def test_bulk_validation_caches_by_content_and_batches_tidy(tmp_path, monkeypatch):
+    import os
+    import stat
+    import sys
+    import src.validate as validate
+
+    calls = tmp_path / "tidy_calls"
+    tidy = tmp_path / "bin" / "tidy"
+    tidy.parent.mkdir()
+    tidy.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"open({str(calls)!r}, 'a').write('call\\n')\n"
+        "for path in [a for a in sys.argv[1:] if not a.startswith('-') and a != 'yes']:\n"
+        "    if '<bad>' in open(path).read():\n"
+        "        sys.stderr.write(f'{path}:1:1: Warning: <bad> is not recognized!\\n')\n"
+    )
+    tidy.chmod(tidy.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tidy.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.chdir(tmp_path)
+
+    tree = tmp_path / "configs"
+    (tree / "nested").mkdir(parents=True)
+    for i in range(6):
+        (tree / f"page{i}.html").write_text("<bad></bad>" if i == 0 else "<p>ok</p>")
+        (tree / "nested" / f"c{i}.json").write_text('{"a": }' if i == 0 else '{"a": 1}')
+    (tree / "notes.txt").write_text("ignored")
+
+    monkeypatch.setattr(validate, "PARALLEL_MIN_FILES", 2)
+    results = validate.validate_many([str(tree)], workers=2)
+    assert len(results) == 12
+    assert sorted(Path(p).name for p, issues in results.items() if issues) == ["c0.json", "page0.html"]
+    assert calls.read_text().count("call") == 1
+
+    (tree / "nested" / "c0.json").write_text('{"a": 2}')
+    results = validate.validate_many([str(tree / "**" / "*.json"), str(tree)], workers=2)
+    assert len(results) == 12 and not results[str(tree / "nested" / "c0.json")]
+    assert calls.read_text().count("call") == 1  # markup unchanged, served from cache
+
+
+def test_schema_errors_are_reported_per_record(tmp_path):
+    from src.validate import benchmark_schema
+
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}}))
+    records = tmp_path / "events.jsonl"
+    records.write_text('{"id": 1}\n{"id": "two"}\n{"name": 3}\n{broken\n')
+    issues = SchemaValidator(str(records), schema=str(schema)).validate()
+    assert [(i.line, i.path) for i in issues] == [(2, "/id"), (3, ""), (4, None)]
+
+    docs = tmp_path / "docs.yaml"
+    docs.write_text("id: 1\n---\nid: x\n")
+    assert [(i.line, i.path) for i in SchemaValidator(str(docs), schema=str(schema)).validate()] == [(2, "/id")]
+
+    result = benchmark_schema(records=500, invalid_every=10)
+    assert result["errors"] == 50 and result["records_per_s"] > 0
+
+
+def test_crashing_checks_and_missing_paths_fail_and_are_not_cached(tmp_path, monkeypatch):
+    import src.validate as validate
+
+    monkeypatch.chdir(tmp_path)
+    broken = tmp_path / "broken.json"
+    broken.write_bytes(b'{"a": "\xff\xfe"}')
+    for _ in range(2):
+        results = validate.validate_many([str(broken)])
+        assert results[str(broken)][0].message.startswith("Validation error: UnicodeDecodeError")
+    assert not list((tmp_path / ".quill_cache" / "validate").rglob("*.json"))
+
+    assert not validate.validate_file(str(tmp_path / "missing.yaml"))
+    assert not validate.validate_file([str(tmp_path / "missing"), str(broken)], use_cache=False)
+
+
+def test_yaml_documents_are_read_line_by_line(tmp_path):
+    from src.validate import iter_yaml_documents
+
+    consumed = []
+
+    def lines():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"- {i}\n"
+        yield "---\n"
+        yield "x: 1\n"
+
+    documents = iter_yaml_documents(lines())
+    start, first = next(documents)
+    assert first.read() == "- 0\n" and len(consumed) == 2  # one line of lookahead, not the whole document
+    second_start, second = next(documents)  # the unread rest of the first document is skipped
+    assert (start, second_start) == (1, 1001)
+    assert second.read() + second.read() + second.read() == "---\nx: 1\n"
@@ -0,0 +1,77 @@
+from src.visualizer import STYLES, Visualizer, render_png
+import json
+import struct
+import zlib
+
+
+def _decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        tag, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(tag + body) & 0xFFFFFFFF
+        chunks[tag] = body
+        pos += 12 + length
+    width, height, depth, color = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    return width, height, depth, color, zlib.decompress(chunks[b"IDAT"])
+
+
+def test_png_is_valid_and_deterministic_for_every_style():
+    for style in STYLES:
+        data = render_png("a lighthouse at dusk", style, (24, 16))
+        width, height, depth, color, raw = _decode_png(data)
+        assert (width, height, depth, color) == (24, 16, 8, 2)
+        assert len(raw) == height * (1 + width * 3)
+        assert data == render_png("a lighthouse at dusk", style, (24, 16))
+    assert render_png("one", "sketch", (8, 8)) != render_png("two", "sketch", (8, 8))
+
+
+def test_pure_python_fallback_matches(monkeypatch):
+    import src.visualizer as visualizer
+
+    if visualizer.np is None:
+        return
+    expected = render_png("fallback", "blueprint", (40, 40))
+    monkeypatch.setattr(visualizer, "np", None)
+    assert render_png("fallback", "blueprint", (40, 40)) == expected
+
+
+def test_cache_and_batch_skip_repeated_work(tmp_path):
+    engine = Visualizer(cache_dir=str(tmp_path / "cache"))
+    first = engine.generate("a red fox", output_dir=str(tmp_path / "out"), size=(16, 16), quiet=True)
+    again = engine.generate("a red fox", output_dir=str(tmp_path / "other"), size=(16, 16), quiet=True)
+    assert (engine.hits, engine.misses) == (1, 1)
+    assert first.read_bytes() == again.read_bytes()
+
+    batch = tmp_path / "prompts.jsonl"
+    batch.write_text("\n".join([
+        json.dumps({"prompt": "a red fox"}),
+        json.dumps({"prompt": "blue whale", "style": "blueprint"}),
+        "blue whale",
+        json.dumps({"prompt": "blue whale", "style": "blueprint"}),
+    ]))
+    stats = engine.generate_batch(str(batch), output_dir=str(tmp_path / "batch"), size=(16, 16), workers=2)
+    assert stats["images"] == 4
+    assert stats["rendered"] == 2  # fox is cached, the repeated blueprint whale renders once
+    assert len(list((tmp_path / "batch").glob("*.png"))) == 3
+
+
+def test_render_cache_is_bounded_and_bad_batch_lines_are_skipped(tmp_path):
+    engine = Visualizer(cache_dir=str(tmp_path / "cache"), max_entries=2)
+    for prompt in ("one", "two", "three"):
+        engine.generate(prompt, output_dir=str(tmp_path / "out"), size=(8, 8), quiet=True)
+    assert len(list((tmp_path / "cache" / "visuals").glob("*.png"))) == 2
+    assert engine.cache.stats()["evictions"] == 1
+
+    batch = tmp_path / "prompts.jsonl"
+    batch.write_text("\n".join([
+        "42",
+        json.dumps({"style": "sketch"}),
+        json.dumps({"prompt": "fox", "style": "no-such-style"}),
+        json.dumps({"prompt": "fox", "style": "sketch"}),
+    ]))
+    stats = engine.generate_batch(str(batch), output_dir=str(tmp_path / "batch"), size=(8, 8), workers=1)
+    assert (stats["images"], stats["skipped"]) == (2, 2)
+    assert len(list((tmp_path / "cache" / "visuals").glob("*.png"))) == 2